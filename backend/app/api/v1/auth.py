@@ -2,22 +2,47 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.config import get_settings
+from app.core.security import (
+    PasswordHashingBusyError,
+    create_access_token,
+    hash_password,
+    hashing_stats,
+    verify_and_update_password,
+)
 from app.db.session import get_db
 from app.models.entities import Organization, Role, User
 from app.schemas.auth import TokenResponse, UserLogin, UserRegister
 from app.schemas.users import UserOut
-from app.services.dependencies import get_current_user
+from app.services.dependencies import (
+    ensure_manager_or_admin,
+    get_current_user,
+    get_stored_user,
+    user_claims,
+)
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail='Authentication is busy, retry shortly',
+        headers={'Retry-After': '1'},
+    )
+
+
 @router.post('/register', response_model=UserOut, status_code=status.HTTP_201_CREATED)
 async def register(payload: UserRegister, db: AsyncSession = Depends(get_db)) -> UserOut:
     existing = await db.execute(select(User).where(User.email == payload.email))
     if existing.scalar_one_or_none():
         raise HTTPException(status_code=400, detail='Email already registered')
 
+    try:
+        hashed_password = await hash_password(payload.password)
+    except PasswordHashingBusyError as exc:
+        raise _hashing_busy() from exc
+
     org = Organization(name=payload.organization_name)
     db.add(org)
     await db.flush()
@@ -27,7 +52,7 @@ async def register(payload: UserRegister, db: AsyncSession = Depends(get_db)) ->
         email=payload.email,
         full_name=payload.full_name,
         role=Role.ADMIN,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=hashed_password,
     )
     db.add(user)
     await db.commit()
@@ -39,12 +64,31 @@ async def register(payload: UserRegister, db: AsyncSession = Depends(get_db)) ->
 async def login(payload: UserLogin, db: AsyncSession = Depends(get_db)) -> TokenResponse:
     result = await db.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user:
         raise HTTPException(status_code=401, detail='Invalid credentials')
-    token = create_access_token(user.email)
+    try:
+        verified, new_hash = await verify_and_update_password(
+            payload.password, user.hashed_password
+        )
+    except PasswordHashingBusyError as exc:
+        raise _hashing_busy() from exc
+    if not verified:
+        raise HTTPException(status_code=401, detail='Invalid credentials')
+    if new_hash is not None:
+        # The configured rounds changed since this hash was stored; upgrade it in place.
+        user.hashed_password = new_hash
+        await db.commit()
+    claims = user_claims(user) if get_settings().auth_token_claims else None
+    token = create_access_token(user.email, claims=claims)
     return TokenResponse(access_token=token)
 
 
 @router.get('/me', response_model=UserOut)
-async def me(user: User = Depends(get_current_user)) -> UserOut:
+async def me(user: User = Depends(get_stored_user)) -> UserOut:
     return UserOut.model_validate(user)
+
+
+@router.get('/hashing/stats')
+async def password_hashing_stats(user: User = Depends(get_current_user)) -> dict:
+    ensure_manager_or_admin(user)
+    return hashing_stats.snapshot()
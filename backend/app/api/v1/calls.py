@@ -1,89 +1,606 @@
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from sqlalchemy import select
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import delete, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from starlette.concurrency import run_in_threadpool
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.responses import (
+    ORJSONResponse,
+    cache_headers,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
 from app.db.session import get_db
-from app.models.entities import Call, CallStatus, User
-from app.schemas.calls import CallOut
+from app.models.entities import (
+    CALL_CONTENT,
+    Call,
+    CallAnalysisSection,
+    CallStatus,
+    Organization,
+    UploadSession,
+    User,
+)
+from app.schemas.calls import (
+    AnalyzeBatchOut,
+    AnalyzeBatchRequest,
+    CallAnalyticsOut,
+    CallListItem,
+    CallOut,
+    CallSearchResult,
+    CrmBulkSyncOut,
+    CrmBulkSyncRequest,
+    CrmSyncCounts,
+    UploadSessionCreate,
+    UploadSessionOut,
+)
 from app.services.analysis import AnalysisService
-from app.services.dependencies import get_current_user
-from app.services.transcription import TranscriptionService
+from app.services.analytics import AnalyticsGroupBy, CallAnalyticsService
+from app.services.blob_store import BLOB_URI_PREFIX, BlobStore
+from app.services.call_content import CallContentService
+from app.services.call_filters import AnalysisFilters, BantStatus, analysis_conditions
+from app.services.content_cache import ContentCacheService
+from app.services.crm_sync import CrmSyncService, run_crm_drain
+from app.services.dependencies import ensure_manager_or_admin, get_current_user
+from app.services.events import CallEventService
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.services.processing import CallProcessingService, load_call_content
+from app.services.reanalysis import current_template
+from app.services.resource_versions import CALL, ResourceVersionCache
+from app.services.search import CallSearchService
+from app.services.uploads import UploadStorageService, UploadTooLargeError
+from app.workers.celery_app import drain_crm_outbox, process_call
 
-router = APIRouter(prefix='/calls', tags=['calls'])
+DEFAULT_PAGE_SIZE = 100
+# Multipart boundaries and part headers on top of the file itself.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
 
 
-def _safe_file_name(original_name: str) -> str:
-    path = Path(original_name)
-    stem = ''.join(ch if ch.isalnum() or ch in {'-', '_'} else '_' for ch in path.stem)
-    ext = path.suffix.lower()
-    normalized_stem = stem.strip('_')[:100] or 'upload'
-    return f'{normalized_stem}{ext}'
+class UploadLimitRoute(APIRoute):
+    """Rejects a body whose declared ``Content-Length`` is over the upload limit.
 
+    FastAPI parses (and Starlette spools) the whole multipart form before any dependency
+    or handler runs, so this has to happen in the route itself. Bodies sent without a
+    length are still capped while they are written.
+    """
 
-@router.get('', response_model=list[CallOut])
-async def list_calls(
-    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
-) -> list[CallOut]:
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            declared = request.headers.get('content-length')
+            limit = get_settings().max_upload_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+            if declared and declared.isdigit() and int(declared) > limit:
+                return ORJSONResponse(
+                    {'detail': 'File exceeds maximum upload size'},
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                )
+            return await handler(request)
+
+        return limited_handler
+
+
+router = APIRouter(prefix='/calls', tags=['calls'], route_class=UploadLimitRoute)
+
+CALL_LIST_FIELDS = ('id', 'file_name', 'status', 'transcript', 'analysis', 'created_at')
+# Stored outside the calls row and read for the whole page at once.
+CALL_CONTENT_FIELDS = ('transcript', 'analysis')
+
+
+async def _process_new_call(
+    call: Call, settings: Settings, response: Response, db: AsyncSession
+) -> CallOut:
+    if settings.async_processing:
+        await db.commit()
+        await db.refresh(call)
+        await load_call_content(db, call)
+        await run_in_threadpool(process_call.delay, call.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return CallOut.model_validate(call)
+
+    await db.flush()
+    try:
+        await CallProcessingService.process(db, call)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail='Call analysis failed') from exc
+
+    await db.refresh(call)
+    await load_call_content(db, call)
+    return CallOut.model_validate(call)
+
+
+def _upload_session_out(upload: UploadSession, settings: Settings) -> UploadSessionOut:
+    return UploadSessionOut(
+        upload_id=upload.id,
+        file_name=upload.file_name,
+        total_size=upload.total_size,
+        received_bytes=upload.received_bytes,
+        max_part_bytes=settings.upload_part_max_mb * 1024 * 1024,
+    )
+
+
+async def _get_upload_session(
+    upload_id: str, current_user: User, db: AsyncSession
+) -> UploadSession:
     result = await db.execute(
+        select(UploadSession).where(
+            UploadSession.id == upload_id,
+            UploadSession.organization_id == current_user.organization_id,
+        )
+    )
+    upload = result.scalar_one_or_none()
+    if not upload:
+        raise HTTPException(status_code=404, detail='Upload not found')
+    return upload
+
+
+@router.get('', response_model=list[CallListItem], response_model_exclude_unset=True)
+async def list_calls(
+    fields: str | None = Query(default=None, description='Comma-separated CallOut fields'),
+    cursor: str | None = None,
+    limit: int | None = Query(
+        default=None, ge=1, le=500, description='Page size; omit (without cursor) for all calls'
+    ),
+    status_filter: CallStatus | None = Query(default=None, alias='status'),
+    user_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    conversation_state: str | None = None,
+    bant_budget: BantStatus | None = None,
+    bant_authority: BantStatus | None = None,
+    bant_need: BantStatus | None = None,
+    bant_timeline: BantStatus | None = None,
+    objection: list[str] = Query(default=[], description='Repeat to require several'),
+    pain_point: list[str] = Query(default=[]),
+    key_moment: list[str] = Query(default=[]),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> ORJSONResponse:
+    requested = [item.strip() for item in fields.split(',') if item.strip()] if fields else []
+    unknown = set(requested) - set(CALL_LIST_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    selected = ['id', *(name for name in requested if name != 'id')] if requested else list(
+        CALL_LIST_FIELDS
+    )
+
+    columns = {'id', 'created_at', *selected} - set(CALL_CONTENT_FIELDS)
+    if 'analysis' in selected:
+        columns.add('analysis_revision')
+    query = (
         select(Call)
+        .options(load_only(*(getattr(Call, name) for name in columns)))
         .where(Call.organization_id == current_user.organization_id)
-        .order_by(Call.created_at.desc())
     )
-    return [CallOut.model_validate(item) for item in result.scalars().all()]
+    if status_filter is not None:
+        query = query.where(Call.status == status_filter)
+    if user_id is not None:
+        query = query.where(Call.user_id == user_id)
+    if created_from is not None:
+        query = query.where(Call.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Call.created_at < created_to)
+    if conversation_state is not None:
+        query = query.where(Call.conversation_state == conversation_state)
+    bant = {
+        name: value
+        for name, value in (
+            ('budget', bant_budget),
+            ('authority', bant_authority),
+            ('need', bant_need),
+            ('timeline', bant_timeline),
+        )
+        if value is not None
+    }
+    filters = AnalysisFilters(bant, objection, pain_point, key_moment)
+    query = query.where(*analysis_conditions(filters, db.get_bind().dialect.name))
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail='Invalid cursor') from exc
+        query = query.where(tuple_(Call.created_at, Call.id) < (cursor_created_at, cursor_id))
+
+    # Clients that never asked for pages keep getting every call; a cursor alone
+    # continues with the default page size.
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+    query = query.order_by(Call.created_at.desc(), Call.id.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+    calls = (await db.execute(query)).scalars().all()
+    headers = {}
+    if limit is not None and len(calls) > limit:
+        calls = calls[:limit]
+        headers['X-Next-Cursor'] = encode_cursor(calls[-1].created_at, calls[-1].id)
+
+    transcripts = (
+        await CallContentService.transcripts(db, [call.id for call in calls])
+        if 'transcript' in selected
+        else {}
+    )
+    analyses = (
+        await CallContentService.analysis_json(
+            db, {call.id: call.analysis_revision for call in calls}
+        )
+        if 'analysis' in selected
+        else {}
+    )
+    names = [name for name in CALL_LIST_FIELDS if name in selected]
+    items = []
+    for call in calls:
+        values = {}
+        for name in names:
+            if name == 'transcript':
+                values[name] = transcripts.get(call.id, '')
+            elif name == 'analysis':
+                values[name] = orjson.Fragment(analyses[call.id])
+            else:
+                values[name] = getattr(call, name)
+        items.append(values)
+    # Built here rather than through CallListItem: validating and re-encoding every
+    # analysis dict dominated the CPU cost of large pages.
+    return ORJSONResponse(items, headers=headers)
+
+
+@router.get('/analytics', response_model=CallAnalyticsOut)
+async def call_analytics(
+    group_by: AnalyticsGroupBy = AnalyticsGroupBy.REP,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    return await CallAnalyticsService.summarize(
+        db, current_user.organization_id, group_by, created_from, created_to
+    )
+
+
+@router.get('/search', response_model=list[CallSearchResult])
+async def search_calls(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[dict]:
+    return await CallSearchService.search(db, current_user.organization_id, q, limit, offset)
+
+
+@router.get('/cache/stats')
+async def content_cache_stats(current_user: User = Depends(get_current_user)) -> dict:
+    return ContentCacheService.stats(current_user.organization_id)
+
+
+@router.post('/analyze-batch', response_model=AnalyzeBatchOut)
+async def analyze_batch(
+    payload: AnalyzeBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AnalyzeBatchOut:
+    ensure_manager_or_admin(current_user)
+    settings = get_settings()
+    if len(payload.transcripts) + len(payload.call_ids) > settings.analysis_batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f'Batch exceeds {settings.analysis_batch_max_items} items',
+        )
+
+    result = await db.execute(
+        select(Organization).where(Organization.id == current_user.organization_id)
+    )
+    template, version = current_template(result.scalar_one())
+
+    calls: list[Call] = []
+    if payload.call_ids:
+        result = await db.execute(
+            select(Call)
+            .options(*CALL_CONTENT)
+            .where(
+                Call.id.in_(payload.call_ids),
+                Call.organization_id == current_user.organization_id,
+                Call.status == CallStatus.ANALYZED,
+            )
+        )
+        calls = list(result.scalars().all())
+
+    transcripts = payload.transcripts + [call.transcript for call in calls]
+    analyses = [
+        AnalysisService.apply_template(analysis, template, transcript)
+        for analysis, transcript in zip(
+            await AnalysisService.analyze_many_async(transcripts), transcripts
+        )
+    ]
+    rescored = analyses[len(payload.transcripts) :]
+    for call, analysis in zip(calls, rescored):
+        structured = (call.analysis or {}).get('structured_payload') or {}
+        if 'crm_sync' in structured:
+            analysis['structured_payload']['crm_sync'] = structured['crm_sync']
+        call.analysis = analysis
+        call.analysis_template_version = version
+    await db.commit()
+
+    return AnalyzeBatchOut(
+        analyses=analyses[: len(payload.transcripts)],
+        rescored_call_ids=[call.id for call in calls],
+    )
 
 
 @router.post('/upload', response_model=CallOut)
 async def upload_call(
+    response: Response,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> CallOut:
     settings = get_settings()
-    content = await file.read()
-    max_size = settings.max_upload_mb * 1024 * 1024
-    if len(content) > max_size:
-        raise HTTPException(status_code=413, detail='File exceeds maximum upload size')
-
     original_name = file.filename or 'upload.txt'
-    safe_name = _safe_file_name(original_name)
-
-    storage_dir = Path(settings.storage_path)
-    storage_dir.mkdir(parents=True, exist_ok=True)
-    file_path = storage_dir / f'{current_user.organization_id}_{uuid4().hex}_{safe_name}'
-    with file_path.open('wb') as handle:
-        handle.write(content)
+    try:
+        stored = await UploadStorageService.save(
+            file,
+            BlobStore.incoming_path(),
+            max_bytes=settings.max_upload_mb * 1024 * 1024,
+            chunk_size=settings.upload_chunk_kb * 1024,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail='File exceeds maximum upload size') from exc
 
+    blob = await BlobStore.ingest(
+        db,
+        stored.path,
+        current_user.organization_id,
+        stored.content_hash,
+        Path(original_name).suffix,
+    )
     call = Call(
         organization_id=current_user.organization_id,
         user_id=current_user.id,
         file_name=original_name,
-        file_path=str(file_path),
+        file_path=f'{BLOB_URI_PREFIX}{blob.key}',
+        blob_key=blob.key,
+        file_size=stored.size,
+        content_hash=stored.content_hash,
         status=CallStatus.UPLOADED,
     )
     db.add(call)
-    await db.flush()
+    return await _process_new_call(call, settings, response, db)
+
+
+@router.post('/uploads', response_model=UploadSessionOut, status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+    payload: UploadSessionCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> UploadSessionOut:
+    settings = get_settings()
+    if payload.total_size > settings.max_upload_mb * 1024 * 1024:
+        raise HTTPException(status_code=413, detail='File exceeds maximum upload size')
+
+    upload_id = uuid4().hex
+    upload = UploadSession(
+        id=upload_id,
+        organization_id=current_user.organization_id,
+        user_id=current_user.id,
+        file_name=payload.file_name,
+        part_path=str(Path(settings.storage_path) / 'uploads' / f'{upload_id}.part'),
+        total_size=payload.total_size,
+        received_bytes=0,
+    )
+    db.add(upload)
+    await db.commit()
+    return _upload_session_out(upload, settings)
+
+
+@router.get('/uploads/{upload_id}', response_model=UploadSessionOut)
+async def get_upload_session(
+    upload_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> UploadSessionOut:
+    upload = await _get_upload_session(upload_id, current_user, db)
+    return _upload_session_out(upload, get_settings())
+
+
+@router.put('/uploads/{upload_id}', response_model=UploadSessionOut)
+async def upload_part(
+    upload_id: str,
+    offset: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> UploadSessionOut:
+    settings = get_settings()
+    upload = await _get_upload_session(upload_id, current_user, db)
+    if offset != upload.received_bytes:
+        raise HTTPException(
+            status_code=409, detail=f'Expected offset {upload.received_bytes}'
+        )
+
+    # Compare-and-set claim on the offset: only one writer at a time may append, and
+    # only while the offset is still the one it was told to resume from.
+    writer_id = uuid4().hex
+    now = datetime.now(timezone.utc)
+    claimed = await db.execute(
+        update(UploadSession)
+        .where(
+            UploadSession.id == upload.id,
+            UploadSession.received_bytes == offset,
+            or_(UploadSession.writer_id.is_(None), UploadSession.writer_expires_at < now),
+        )
+        .values(
+            writer_id=writer_id,
+            writer_expires_at=now + timedelta(seconds=settings.upload_part_lease_seconds),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if claimed.rowcount != 1:
+        raise HTTPException(status_code=409, detail='Another part is being written')
 
+    max_part_bytes = settings.upload_part_max_mb * 1024 * 1024
+    received = None
     try:
-        transcript = await TranscriptionService.transcribe(str(file_path))
-        call.status = CallStatus.TRANSCRIBED
+        received = await UploadStorageService.append(
+            request.stream(),
+            Path(upload.part_path),
+            offset=offset,
+            max_bytes=min(upload.total_size, offset + max_part_bytes),
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail='Part exceeds upload or part size') from exc
+    finally:
+        values = {'writer_id': None, 'writer_expires_at': None}
+        if received is not None:
+            values['received_bytes'] = received
+        await db.execute(
+            update(UploadSession)
+            .where(UploadSession.id == upload.id, UploadSession.writer_id == writer_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
 
-        analysis = AnalysisService.analyze(transcript)
-        call.transcript = transcript
-        call.analysis = analysis
-        call.status = CallStatus.ANALYZED
-    except Exception as exc:
-        call.status = CallStatus.FAILED
-        call.analysis = {'error': 'Analysis failed'}
+    await db.refresh(upload)
+    return _upload_session_out(upload, settings)
+
+
+@router.post('/uploads/{upload_id}/complete', response_model=CallOut)
+async def complete_upload_session(
+    upload_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> CallOut:
+    settings = get_settings()
+    upload = await _get_upload_session(upload_id, current_user, db)
+    if upload.received_bytes != upload.total_size:
+        raise HTTPException(
+            status_code=409,
+            detail=f'Upload incomplete: {upload.received_bytes}/{upload.total_size} bytes',
+        )
+
+    # Claimed like a part, so no part is written and no second complete ingests the file
+    # while this one does.
+    writer_id = uuid4().hex
+    now = datetime.now(timezone.utc)
+    claimed = await db.execute(
+        update(UploadSession)
+        .where(
+            UploadSession.id == upload.id,
+            UploadSession.received_bytes == UploadSession.total_size,
+            or_(UploadSession.writer_id.is_(None), UploadSession.writer_expires_at < now),
+        )
+        .values(
+            writer_id=writer_id,
+            writer_expires_at=now + timedelta(seconds=settings.upload_part_lease_seconds),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if claimed.rowcount != 1:
+        raise HTTPException(status_code=409, detail='The upload is being written or completed')
+
+    part_path = Path(upload.part_path)
+    try:
+        content_hash = await run_in_threadpool(
+            UploadStorageService.hash_file, part_path, settings.upload_chunk_kb * 1024
+        )
+        blob = await BlobStore.ingest(
+            db,
+            part_path,
+            current_user.organization_id,
+            content_hash,
+            Path(upload.file_name).suffix,
+        )
+        call = Call(
+            organization_id=current_user.organization_id,
+            user_id=current_user.id,
+            file_name=upload.file_name,
+            file_path=f'{BLOB_URI_PREFIX}{blob.key}',
+            blob_key=blob.key,
+            file_size=upload.total_size,
+            content_hash=content_hash,
+            status=CallStatus.UPLOADED,
+        )
+        db.add(call)
+        await db.delete(upload)
+        await db.flush()
+    except BaseException:
+        await db.rollback()
+        # The client may retry while the part file is there; once ingest has consumed it,
+        # the session can never complete.
+        claim = UploadSession.id == upload_id, UploadSession.writer_id == writer_id
+        if part_path.exists():
+            cleanup = update(UploadSession).where(*claim).values(
+                writer_id=None, writer_expires_at=None
+            )
+        else:
+            cleanup = delete(UploadSession).where(*claim)
+        await db.execute(cleanup.execution_options(synchronize_session=False))
         await db.commit()
-        raise HTTPException(status_code=500, detail='Call analysis failed') from exc
+        raise
+    return await _process_new_call(call, settings, response, db)
 
+
+@router.post(
+    '/sync-crm', response_model=CrmBulkSyncOut, status_code=status.HTTP_202_ACCEPTED
+)
+async def bulk_sync_to_crm(
+    payload: CrmBulkSyncRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> CrmBulkSyncOut:
+    ensure_manager_or_admin(current_user)
+
+    queued = await CrmSyncService.enqueue(
+        db,
+        current_user.organization_id,
+        current_user.id,
+        payload.call_ids,
+        status=payload.status,
+        conversation_state=payload.conversation_state,
+        created_from=payload.created_from,
+        created_to=payload.created_to,
+    )
     await db.commit()
-    await db.refresh(call)
-    return CallOut.model_validate(call)
+    counts = await CrmSyncService.counts(db, current_user.organization_id)
+
+    if queued:
+        if get_settings().async_processing:
+            await run_in_threadpool(drain_crm_outbox.delay)
+        else:
+            background_tasks.add_task(run_crm_drain)
+    return CrmBulkSyncOut(queued=queued, outbox=CrmSyncCounts(**counts))
+
+
+@router.get('/sync-crm/status', response_model=CrmSyncCounts)
+async def crm_sync_status(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> CrmSyncCounts:
+    ensure_manager_or_admin(current_user)
+    return CrmSyncCounts(**await CrmSyncService.counts(db, current_user.organization_id))
 
 
 @router.post('/{call_id}/sync-crm')
@@ -92,17 +609,22 @@ async def sync_call_to_crm(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
+    # Only the section being rewritten is loaded, not the transcript or the rest.
     result = await db.execute(
-        select(Call).where(
-            Call.id == call_id, Call.organization_id == current_user.organization_id
+        select(Call)
+        .options(
+            selectinload(
+                Call.analysis_sections.and_(CallAnalysisSection.section == 'structured_payload')
+            )
         )
+        .where(Call.id == call_id, Call.organization_id == current_user.organization_id)
     )
     call = result.scalar_one_or_none()
     if not call:
         raise HTTPException(status_code=404, detail='Call not found')
 
-    analysis = dict(call.analysis or {})
-    structured = dict(analysis.get('structured_payload') or {})
+    section = call.analysis_sections.get('structured_payload')
+    structured = dict(section.payload or {}) if section else {}
     crm_sync = {
         'status': 'synced',
         'provider': 'mock-crm',
@@ -110,27 +632,76 @@ async def sync_call_to_crm(
         'contact_email': f"{current_user.email}",
     }
     structured['crm_sync'] = crm_sync
-    analysis['structured_payload'] = structured
-    call.analysis = analysis
-
+    call.set_analysis_section('structured_payload', structured)
+    await CrmSyncService.mark_synced(db, [call.id], datetime.now(timezone.utc))
     await db.commit()
-    await db.refresh(call)
+    ResourceVersionCache.invalidate(CALL, [call.id])
 
     return {'call_id': call.id, 'crm_sync': crm_sync}
 
 
-@router.get('/{call_id}', response_model=CallOut)
-async def get_call(
+@router.get('/{call_id}/events')
+async def call_events(
     call_id: int,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> CallOut:
+) -> StreamingResponse:
     result = await db.execute(
-        select(Call).where(
+        select(Call.id).where(
             Call.id == call_id, Call.organization_id == current_user.organization_id
         )
     )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail='Call not found')
+    return StreamingResponse(
+        CallEventService.stream(call_id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@router.get('/{call_id}', response_model=CallOut)
+async def get_call(
+    call_id: int,
+    if_none_match: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    org_id = current_user.organization_id
+    if if_none_match:
+        # Revalidation by a poller: answered from the version alone, cached or read by
+        # itself, so an unchanged call costs no row load and no serialization.
+        version = ResourceVersionCache.get(CALL, call_id, org_id)
+        if version is None:
+            version = await db.scalar(
+                select(Call.version).where(Call.id == call_id, Call.organization_id == org_id)
+            )
+            if version is None:
+                raise HTTPException(status_code=404, detail='Call not found')
+            ResourceVersionCache.put(CALL, call_id, org_id, version)
+        etag = make_etag(CALL, call_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    result = await db.execute(
+        select(Call)
+        .options(selectinload(Call.transcript_record))
+        .where(Call.id == call_id, Call.organization_id == org_id)
+    )
     call = result.scalar_one_or_none()
     if not call:
         raise HTTPException(status_code=404, detail='Call not found')
-    return CallOut.model_validate(call)
+    ResourceVersionCache.put(CALL, call.id, org_id, call.version)
+    analyses = await CallContentService.analysis_json(db, {call.id: call.analysis_revision})
+    return ORJSONResponse(
+        {
+            'id': call.id,
+            'file_name': call.file_name,
+            'status': call.status,
+            'transcript': call.transcript,
+            'analysis': orjson.Fragment(analyses[call.id]),
+            'crm_synced_at': call.crm_synced_at,
+            'created_at': call.created_at,
+        },
+        headers=cache_headers(make_etag(CALL, call.id, call.version)),
+    )
@@ -1,45 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import get_settings
+from app.core.responses import (
+    ORJSONResponse,
+    cache_headers,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
 from app.db.session import get_db
-from app.models.entities import Organization, Role, User
-from app.schemas.settings import TemplatesOut, TemplatesUpdate
-from app.services.dependencies import get_current_user
+from app.models.entities import Organization, ReanalysisJob, User
+from app.schemas.settings import ReanalysisJobOut, TemplatesOut, TemplatesUpdate
+from app.services.dependencies import ensure_manager_or_admin, get_current_user
+from app.services.reanalysis import ReanalysisService, current_template, run_reanalysis_job
+from app.services.resource_versions import TEMPLATES, ResourceVersionCache
+from app.workers.celery_app import reanalyze_calls
 
 router = APIRouter(prefix='/settings', tags=['settings'])
 
 
-def _ensure_manager_or_admin(user: User) -> None:
-    if user.role not in {Role.MANAGER, Role.ADMIN}:
-        raise HTTPException(status_code=403, detail='Manager or admin role required')
+def _templates_out(org: Organization, job: ReanalysisJob | None = None) -> TemplatesOut:
+    template, version = current_template(org)
+    return TemplatesOut(
+        crm_field_mapping=(org.settings or {}).get('crm_field_mapping', {}),
+        call_analysis_template=template,
+        call_analysis_template_version=version,
+        reanalysis_job_id=job.id if job else None,
+    )
 
 
 @router.get('/templates', response_model=TemplatesOut)
 async def get_templates(
-    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
-) -> TemplatesOut:
-    _ensure_manager_or_admin(current_user)
+    if_none_match: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    ensure_manager_or_admin(current_user)
 
-    result = await db.execute(
-        select(Organization).where(Organization.id == current_user.organization_id)
-    )
-    org = result.scalar_one()
-    settings = org.settings or {}
+    org_id = current_user.organization_id
+    if if_none_match:
+        version = ResourceVersionCache.get(TEMPLATES, org_id, org_id)
+        if version is None:
+            version = await db.scalar(
+                select(Organization.settings_version).where(Organization.id == org_id)
+            )
+            ResourceVersionCache.put(TEMPLATES, org_id, org_id, version)
+        etag = make_etag(TEMPLATES, org_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
 
-    return TemplatesOut(
-        crm_field_mapping=settings.get('crm_field_mapping', {}),
-        call_analysis_template=settings.get('call_analysis_template', {}),
+    result = await db.execute(select(Organization).where(Organization.id == org_id))
+    org = result.scalar_one()
+    ResourceVersionCache.put(TEMPLATES, org_id, org_id, org.settings_version)
+    return ORJSONResponse(
+        _templates_out(org).model_dump(mode='json'),
+        headers=cache_headers(make_etag(TEMPLATES, org_id, org.settings_version)),
     )
 
 
 @router.put('/templates', response_model=TemplatesOut)
 async def update_templates(
     payload: TemplatesUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> TemplatesOut:
-    _ensure_manager_or_admin(current_user)
+) -> Response:
+    ensure_manager_or_admin(current_user)
 
     result = await db.execute(
         select(Organization).where(Organization.id == current_user.organization_id)
@@ -48,13 +77,52 @@ async def update_templates(
 
     settings = dict(org.settings or {})
     settings['crm_field_mapping'] = payload.crm_field_mapping
-    settings['call_analysis_template'] = payload.call_analysis_template
     org.settings = settings
+    job = await ReanalysisService.publish_template(db, org, payload.call_analysis_template)
 
     await db.commit()
     await db.refresh(org)
 
-    return TemplatesOut(
-        crm_field_mapping=org.settings.get('crm_field_mapping', {}),
-        call_analysis_template=org.settings.get('call_analysis_template', {}),
+    if job is not None:
+        if get_settings().async_processing:
+            await run_in_threadpool(reanalyze_calls.delay, job.id)
+        else:
+            background_tasks.add_task(run_reanalysis_job, job.id)
+
+    # The new ETag, so the editor's next poll revalidates instead of refetching.
+    ResourceVersionCache.put(TEMPLATES, org.id, org.id, org.settings_version)
+    return ORJSONResponse(
+        _templates_out(org, job).model_dump(mode='json'),
+        headers=cache_headers(make_etag(TEMPLATES, org.id, org.settings_version)),
+    )
+
+
+@router.get('/reanalysis-jobs/{job_id}', response_model=ReanalysisJobOut)
+async def get_reanalysis_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> ReanalysisJobOut:
+    ensure_manager_or_admin(current_user)
+
+    result = await db.execute(
+        select(ReanalysisJob).where(
+            ReanalysisJob.id == job_id,
+            ReanalysisJob.organization_id == current_user.organization_id,
+        )
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail='Reanalysis job not found')
+
+    return ReanalysisJobOut(
+        id=job.id,
+        template_version=job.template_version,
+        status=job.status,
+        recomputed_calls=job.recomputed_calls,
+        bumped_calls=job.bumped_calls,
+        last_call_id=job.last_call_id,
+        pending_calls=await ReanalysisService.pending_calls(
+            db, job.organization_id, job.template_version
+        ),
     )
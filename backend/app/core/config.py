@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -12,16 +13,107 @@ class Settings(BaseSettings):
     secret_key: str = 'change-me-in-production'
     algorithm: str = 'HS256'
     access_token_expire_minutes: int = 60
+    auth_token_claims: bool = False
+    password_hash_rounds: int = 0
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 0
+    user_cache_entries: int = 4096
+    user_cache_ttl_seconds: float = 60
+    http_version_cache_entries: int = 8192
+    http_version_cache_ttl_seconds: float = 5
     database_url: str = 'sqlite+aiosqlite:///./salesops.db'
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_query_warn_threshold: int = 50
+    server_timing_enabled: bool = False
+    metrics_enabled: bool = True
+    metrics_token: str = ''
+    profile_slow_request_ms: float = 0
+    profile_sample_interval_ms: float = 5
+    profile_path: str = './profiles'
     cors_origins: str = 'http://localhost:3000'
     max_upload_mb: int = 500
+    upload_chunk_kb: int = 1024
+    upload_part_max_mb: int = 16
+    upload_part_lease_seconds: float = 600
+    upload_session_ttl_hours: float = 24
+    upload_session_sweep_interval_seconds: float = 3600
     storage_path: str = './storage'
+    blob_backend: Literal['local', 's3'] = 'local'
+    blob_cold_backend: Literal['', 'local', 's3'] = ''
+    blob_cold_path: str = './storage/cold'
+    blob_gzip_level: int = 6
+    # Per ``subscription_tier``; 0 days disables the step, unknown tiers keep everything hot.
+    blob_retention_policy: dict[str, dict[str, int]] = {
+        'starter': {'cold_after_days': 30, 'delete_after_days': 0},
+        'professional': {'cold_after_days': 90, 'delete_after_days': 0},
+        'enterprise': {'cold_after_days': 180, 'delete_after_days': 0},
+    }
+    blob_gc_grace_hours: float = 24
+    blob_retention_batch_size: int = 500
+    blob_retention_interval_seconds: float = 3600
+    s3_endpoint_url: str = 'http://127.0.0.1:9000'
+    s3_region: str = 'us-east-1'
+    s3_bucket: str = 'salesops-uploads'
+    s3_access_key: str = ''
+    s3_secret_key: str = ''
+    s3_cold_storage_class: str = 'STANDARD_IA'
+    s3_timeout_seconds: float = 60
+    async_processing: bool = False
+    analysis_pool_workers: int = 0
+    analysis_batch_chunksize: int = 16
+    analysis_batch_max_items: int = 1000
+    analysis_stream_threshold_mb: int = 64
+    analysis_stream_chunk_kb: int = 1024
+    search_index_max_kb: int = 1024
+    reanalysis_batch_size: int = 500
+    content_cache_entries: int = 1024
+    content_cache_max_mb: int = 256
+    content_cache_max_transcript_kb: int = 1024
+    content_cache_persistent: bool = False
+    content_cache_persistent_max_mb: int = 2048
+    content_cache_trim_interval_seconds: float = 3600
+    analysis_json_cache_entries: int = 4096
+
+    celery_broker_url: str = 'redis://localhost:6379/0'
+    celery_result_backend: str = 'redis://localhost:6379/1'
+    celery_task_always_eager: bool = False
+    event_broker: Literal['memory', 'redis'] = 'memory'
+    event_redis_url: str = 'redis://localhost:6379/2'
+    event_queue_size: int = 256
+    event_keepalive_seconds: float = 15
 
     google_api_key: str = ''
     gemini_model_fast: str = 'gemini-2.5-flash'
     gemini_model_deep: str = 'gemini-2.5-pro'
     deepgram_api_key: str = ''
     assemblyai_api_key: str = ''
+    transcription_provider: Literal['local', 'deepgram', 'assemblyai', 'fake'] = 'local'
+    deepgram_base_url: str = 'https://api.deepgram.com'
+    deepgram_model: str = 'nova-2'
+    assemblyai_base_url: str = 'https://api.assemblyai.com'
+    fake_transcriber_url: str = 'http://127.0.0.1:8081'
+    transcription_max_concurrency: int = 8
+    transcription_http_max_connections: int = 32
+    transcription_timeout_seconds: float = 300
+    transcription_max_retries: int = 3
+    transcription_backoff_seconds: float = 0.5
+    transcription_hedge_after_seconds: float = 0
+    transcription_poll_interval_seconds: float = 2
+    transcription_poll_timeout_seconds: float = 3600
+    transcription_chunk_seconds: float = 300
+    transcription_chunk_overlap_seconds: float = 2
+    transcription_silence_search_seconds: float = 10
+    crm_base_url: str = 'http://127.0.0.1:8082'
+    crm_api_key: str = ''
+    crm_batch_size: int = 100
+    crm_max_attempts: int = 5
+    crm_timeout_seconds: float = 30
+    crm_sync_max_calls: int = 10000
+    crm_drain_interval_seconds: float = 60
     sendgrid_api_key: str = ''
 
     @field_validator('max_upload_mb')
@@ -31,6 +123,20 @@ class Settings(BaseSettings):
             raise ValueError('MAX_UPLOAD_MB must be greater than 0')
         return value
 
+    @field_validator('upload_chunk_kb', 'upload_part_max_mb')
+    @classmethod
+    def validate_upload_sizes(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError('Upload chunk and part sizes must be greater than 0')
+        return value
+
+    @field_validator('blob_cold_backend')
+    @classmethod
+    def validate_blob_cold_backend(cls, value: str, info) -> str:
+        if value == 's3' and info.data.get('blob_backend') == 's3':
+            raise ValueError('BLOB_COLD_BACKEND must differ from BLOB_BACKEND when both use S3')
+        return value
+
     @field_validator('secret_key')
     @classmethod
     def validate_secret_key(cls, value: str, info) -> str:
@@ -0,0 +1,182 @@
+import bisect
+import inspect
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Any, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# The ASGI scope of the request being served. Routing fills in ``scope['route']`` on
+# this same dict, so stages timed inside an endpoint can label by route template.
+request_scope: ContextVar[dict[str, Any] | None] = ContextVar('request_scope', default=None)
+
+
+def route_label(scope: dict[str, Any] | None) -> str:
+    if scope is None:
+        return 'background'
+    route = scope.get('route')
+    return getattr(route, 'path', None) or 'unmatched'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in Prometheus text format."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # Per-bucket counts, then +Inf count and sum.
+            series = self._series.setdefault(labelvalues, [0.0] * (len(self.buckets) + 2))
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for labelvalues, values in sorted(series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = _labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f'{self.name}_bucket{le} {cumulative:g}')
+            inf = _labels(self.labelnames, labelvalues, 'le="+Inf"')
+            lines.append(f'{self.name}_bucket{inf} {values[-2]:g}')
+            plain = _labels(self.labelnames, labelvalues)
+            lines.append(f'{self.name}_count{plain} {values[-2]:g}')
+            lines.append(f'{self.name}_sum{plain} {values[-1]:.6f}')
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Gauge:
+    """Gauge whose samples are read from a callback at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], dict[tuple[str, ...], float]],
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        for labelvalues, value in sorted(self._collect().items()):
+            lines.append(f'{self.name}{_labels(self.labelnames, labelvalues)} {value:g}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[Histogram | Gauge] = []
+
+    def register(self, metric: Histogram | Gauge) -> Histogram | Gauge:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        'salesops_http_request_duration_seconds',
+        'HTTP request latency by route template.',
+        ('method', 'route', 'status'),
+    )
+)
+REQUEST_DB_TIME = registry.register(
+    Histogram(
+        'salesops_http_request_db_seconds',
+        'Time a request spent executing SQL.',
+        ('method', 'route'),
+    )
+)
+STAGE_LATENCY = registry.register(
+    Histogram(
+        'salesops_stage_duration_seconds',
+        'Latency of instrumented processing stages, by the route that ran them.',
+        ('route', 'stage'),
+    )
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    STAGE_LATENCY.observe(seconds, route_label(request_scope.get()), stage)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, perf_counter() - started)
+
+
+def timed_stage(stage: str) -> Callable[[F], F]:
+    """Decorator recording a stage duration for sync or async callables."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with stage_timer(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
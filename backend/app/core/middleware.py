@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from time import perf_counter
+
+from app.core.config import get_settings
+from app.core.metrics import REQUEST_DB_TIME, REQUEST_LATENCY, request_scope, route_label
+from app.core.profiling import SamplingProfiler, write_profile
+from app.db.instrumentation import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+_profiler: SamplingProfiler | None = None
+
+
+def _get_profiler() -> SamplingProfiler | None:
+    global _profiler
+    settings = get_settings()
+    if settings.profile_slow_request_ms <= 0:
+        return None
+    if _profiler is None:
+        _profiler = SamplingProfiler(settings.profile_sample_interval_ms / 1000)
+    return _profiler
+
+
+class RequestMetricsMiddleware:
+    """Records per-route latency and DB time, and profiles slow requests when enabled.
+
+    Server-sent event streams stay open for as long as the client listens, so they are
+    left out of both the latency histogram and the slow-request profiler.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        event_stream = False
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code, event_stream
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                event_stream = any(
+                    name == b'content-type' and value.startswith(b'text/event-stream')
+                    for name, value in message.get('headers', [])
+                )
+            await send(message)
+
+        profiler = _get_profiler()
+        if profiler is not None:
+            profiler.start(id(scope))
+        token = request_scope.set(scope)
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started
+            request_scope.reset(token)
+            route = route_label(scope)
+            if not event_stream:
+                REQUEST_LATENCY.observe(elapsed, scope['method'], route, str(status_code))
+            stats = current_query_stats()
+            if stats is not None:
+                REQUEST_DB_TIME.observe(stats.db_seconds, scope['method'], route)
+            if profiler is not None:
+                samples = profiler.stop(id(scope))
+                slow = elapsed * 1000 >= get_settings().profile_slow_request_ms
+                if slow and samples and not event_stream:
+                    path = await asyncio.to_thread(
+                        write_profile,
+                        get_settings().profile_path,
+                        scope['method'],
+                        scope['path'],
+                        elapsed,
+                        samples,
+                    )
+                    logger.warning(
+                        'Slow request %s %s profiled to %s', scope['method'], scope['path'], path
+                    )
@@ -0,0 +1,80 @@
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+
+
+def _folded_stack(frame: FrameType | None, thread_name: str) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})')
+        frame = frame.f_back
+    return ';'.join([thread_name, *reversed(names)])
+
+
+class SamplingProfiler:
+    """Background sampler of every thread's Python stack while requests are in flight.
+
+    Each in-flight request collects the samples taken during its lifetime. The event
+    loop interleaves concurrent requests, so a request's profile also contains work done
+    for its neighbours; under low concurrency, or for one dominating slow request, it is
+    close to exact. Samples are kept as folded stacks, ready for flamegraph tooling.
+    """
+
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self._active: set[int] = set()
+        self._samples: dict[int, Counter[str]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, request_id: int) -> None:
+        with self._lock:
+            self._active.add(request_id)
+            self._samples[request_id] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='request-profiler', daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, request_id: int) -> Counter[str]:
+        with self._lock:
+            self._active.discard(request_id)
+            return self._samples.pop(request_id, Counter())
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while True:
+            if not self._active:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = [
+                _folded_stack(frame, names.get(ident, str(ident)))
+                for ident, frame in sys._current_frames().items()
+                if ident != me
+            ]
+            with self._lock:
+                for request_id in self._active:
+                    self._samples[request_id].update(stacks)
+            time.sleep(self.interval_seconds)
+
+
+def write_profile(
+    directory: str, method: str, path: str, elapsed: float, samples: Counter[str]
+) -> Path:
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    slug = ''.join(ch if ch.isalnum() else '_' for ch in path.strip('/'))[:80] or 'root'
+    output = target / f'{stamp}_{method}_{slug}_{int(elapsed * 1000)}ms.folded'
+    output.write_text(''.join(f'{stack} {count}\n' for stack, count in samples.most_common()))
+    return output
@@ -0,0 +1,51 @@
+"""JSON responses rendered with orjson.
+
+``ORJSONResponse`` is the application's default response class. Endpoints on hot paths
+build their payload themselves and return the response directly, which skips
+response-model validation; JSON that is already serialized, such as cached call
+analyses, is embedded as ``orjson.Fragment`` without being parsed again.
+
+Polled reads carry a strong ``ETag`` built from a version column; ``not_modified``
+answers a matching ``If-None-Match`` with an empty 304.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+# Matches pydantic's JSON output: UTC datetimes end in 'Z'.
+JSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+# Per-organization data: browsers may keep a copy but must revalidate it on every use.
+REVALIDATE = 'private, no-cache'
+
+
+def make_etag(kind: str, resource_id: int, version: int) -> str:
+    return f'"{kind}-{resource_id}-{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` uses the weak comparison, so ``W/`` prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(
+        candidate.strip().removeprefix('W/') == etag for candidate in if_none_match.split(',')
+    )
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {'ETag': etag, 'Cache-Control': REVALIDATE, 'Vary': 'Authorization'}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
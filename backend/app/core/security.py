@@ -1,26 +1,161 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from functools import lru_cache
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
 
-pwd_context = CryptContext(schemes=['pbkdf2_sha256'], deprecated='auto')
+T = TypeVar('T')
+
+_hash_executor: ThreadPoolExecutor | None = None
+
+
+class PasswordHashingBusyError(RuntimeError):
+    """Raised when more hashing jobs are queued than ``password_hash_max_queue`` allows."""
+
+
+@lru_cache
+def _password_context(rounds: int) -> CryptContext:
+    if rounds:
+        return CryptContext(
+            schemes=['pbkdf2_sha256'], deprecated='auto', pbkdf2_sha256__rounds=rounds
+        )
+    return CryptContext(schemes=['pbkdf2_sha256'], deprecated='auto')
+
+
+def password_context() -> CryptContext:
+    return _password_context(get_settings().password_hash_rounds)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
+
+
+class _HashingStats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                'queued': self.queued,
+                'running': self.running,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'rehashed': self.rehashed,
+                'avg_wait_ms': round(1000 * self.wait_seconds / (self.completed or 1), 3),
+                'max_wait_ms': round(1000 * self.max_wait_seconds, 3),
+            }
+
+
+hashing_stats = _HashingStats()
+
+
+def get_hash_executor() -> ThreadPoolExecutor:
+    """Bounded pool for password hashing, created on first use.
+
+    pbkdf2 runs in ``hashlib`` with the GIL released, so threads give real parallelism
+    while keeping the event loop free; the worker count caps concurrent hashes.
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=get_settings().password_hash_workers, thread_name_prefix='password-hash'
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+async def _run_hashing(func: Callable[..., T], *args: Any) -> T:
+    max_queue = get_settings().password_hash_max_queue
+    with hashing_stats._lock:
+        if max_queue and hashing_stats.queued >= max_queue:
+            hashing_stats.rejected += 1
+            raise PasswordHashingBusyError('Password hashing queue is full')
+        hashing_stats.queued += 1
+    submitted = perf_counter()
+    dequeued = False
+
+    def dequeue() -> bool:
+        # Exactly once per job: by the worker starting it, or by a waiter that gave up
+        # before it started (its executor future is then cancelled and never runs).
+        nonlocal dequeued
+        with hashing_stats._lock:
+            if dequeued:
+                return False
+            dequeued = True
+            hashing_stats.queued -= 1
+            return True
+
+    def job() -> T:
+        if not dequeue():
+            raise asyncio.CancelledError('The waiter was cancelled before hashing started')
+        waited = perf_counter() - submitted
+        with hashing_stats._lock:
+            hashing_stats.running += 1
+            hashing_stats.wait_seconds += waited
+            hashing_stats.max_wait_seconds = max(hashing_stats.max_wait_seconds, waited)
+        try:
+            return func(*args)
+        finally:
+            with hashing_stats._lock:
+                hashing_stats.running -= 1
+                hashing_stats.completed += 1
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_hash_executor(), job)
+    finally:
+        dequeue()
+
+
+async def hash_password(password: str) -> str:
+    return await _run_hashing(get_password_hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify off the event loop; also return a new hash when the stored one uses stale rounds."""
+    verified, new_hash = await _run_hashing(
+        password_context().verify_and_update, plain_password, hashed_password
+    )
+    if new_hash is not None:
+        with hashing_stats._lock:
+            hashing_stats.rehashed += 1
+    return verified, new_hash
 
 
-def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
+def create_access_token(
+    subject: str,
+    expires_delta: timedelta | None = None,
+    claims: dict[str, Any] | None = None,
+) -> str:
     settings = get_settings()
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
     )
-    to_encode: dict[str, Any] = {'sub': subject, 'exp': expire}
+    to_encode: dict[str, Any] = {**(claims or {}), 'sub': subject, 'exp': expire}
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
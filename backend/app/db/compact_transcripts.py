@@ -0,0 +1,69 @@
+"""Compress transcripts stored uncompressed, e.g. by migration 011::
+
+    python -m app.db.compact_transcripts --batch-size 500
+
+Rows are rewritten in call id order, one transaction per batch, so the command can be
+stopped and rerun at any time. The search index is left alone: the text is unchanged.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import select, update
+
+from app.db.compression import IDENTITY, compress_text, decompress_text
+from app.db.session import AsyncSessionLocal, engine
+from app.models.entities import CallTranscript
+
+
+async def compact(batch_size: int) -> tuple[int, int, int]:
+    """Returns (rows compressed, bytes before, bytes after)."""
+    compacted = before = after = 0
+    last_id = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(CallTranscript.call_id, CallTranscript.content)
+                .where(CallTranscript.codec == IDENTITY, CallTranscript.call_id > last_id)
+                .order_by(CallTranscript.call_id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            updates = []
+            for call_id, content in rows:
+                codec, compressed = compress_text(decompress_text(IDENTITY, content))
+                if codec != IDENTITY:
+                    updates.append({'call_id': call_id, 'codec': codec, 'content': compressed})
+                    before += len(content)
+                    after += len(compressed)
+            if updates:
+                await db.execute(update(CallTranscript), updates)
+            await db.commit()
+            compacted += len(updates)
+            last_id = rows[-1].call_id
+    return compacted, before, after
+
+
+async def _main(batch_size: int) -> None:
+    try:
+        compacted, before, after = await compact(batch_size)
+    finally:
+        await engine.dispose()
+    print(f'compressed {compacted} transcripts: {before} -> {after} bytes')
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args(argv)
+    asyncio.run(_main(args.batch_size))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
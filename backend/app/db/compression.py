@@ -0,0 +1,49 @@
+"""Codecs for large text kept in the database.
+
+Every compressed value is stored next to the name of its codec, so rows written by an
+older release (or migrated as ``identity``) stay readable when the default changes.
+"""
+
+import zlib
+
+IDENTITY = 'identity'
+ZLIB = 'zlib'
+
+# Below this size the zlib header and dictionary warm-up cost more than they save.
+MIN_COMPRESS_BYTES = 256
+ZLIB_LEVEL = 6
+
+
+def compress_text(text: str) -> tuple[str, bytes]:
+    data = text.encode('utf-8')
+    if len(data) >= MIN_COMPRESS_BYTES:
+        compressed = zlib.compress(data, ZLIB_LEVEL)
+        if len(compressed) < len(data):
+            return ZLIB, compressed
+    return IDENTITY, data
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == ZLIB:
+        return zlib.decompress(data).decode('utf-8')
+    if codec == IDENTITY:
+        return bytes(data).decode('utf-8')
+    raise ValueError(f'Unknown codec: {codec}')
+
+
+class TextCompressor:
+    """Builds a ``zlib`` value from text fed in pieces, so the text is never held whole."""
+
+    def __init__(self) -> None:
+        self._zlib = zlib.compressobj(ZLIB_LEVEL)
+        self._parts: list[bytes] = []
+        self.text_bytes = 0
+
+    def feed(self, text: str) -> None:
+        data = text.encode('utf-8')
+        self.text_bytes += len(data)
+        self._parts.append(self._zlib.compress(data))
+
+    def finish(self) -> tuple[str, bytes]:
+        self._parts.append(self._zlib.flush())
+        return ZLIB, b''.join(self._parts)
@@ -0,0 +1,135 @@
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.core.config import get_settings
+from app.core.metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    checkouts: int = 0
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries", '
+            f'db-pool;dur={self.pool_wait_seconds * 1000:.2f};desc="{self.checkouts} checkouts"'
+        )
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar('db_query_stats', default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+class _TimedCheckoutMixin:
+    # Pool._do_get is where a checkout blocks on a free slot (or opens a connection),
+    # so timing it gives the wait a request spends before its first query can run.
+    def _do_get(self) -> Any:
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += perf_counter() - started
+                stats.checkouts += 1
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckoutMixin, NullPool):
+    pass
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute every cursor execution on ``engine`` to the current request's stats."""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+        conn.info.setdefault('query_started', []).append(perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+        started = conn.info['query_started'].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += perf_counter() - started
+
+    @event.listens_for(engine, 'handle_error')
+    def _error(context) -> None:
+        if context.connection is not None and context.connection.info.get('query_started'):
+            context.connection.info['query_started'].pop()
+
+
+@event.listens_for(Session, 'before_commit')
+def _commit_started(session: Session) -> None:
+    session.info['commit_started'] = perf_counter()
+
+
+@event.listens_for(Session, 'after_commit')
+def _commit_finished(session: Session) -> None:
+    started = session.info.pop('commit_started', None)
+    if started is not None:
+        observe_stage('db_commit', perf_counter() - started)
+
+
+class QueryStatsMiddleware:
+    """Collects per-request DB stats and, with ``server_timing_enabled``, reports them in a
+    ``Server-Timing`` header. The header is off by default because it exposes internals
+    to any client.
+
+    Requests issuing more than ``db_query_warn_threshold`` statements are logged, which
+    is usually the first sign of an N+1 loop.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        report = get_settings().server_timing_enabled
+
+        async def send_with_timing(message) -> None:
+            if report and message['type'] == 'http.response.start':
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', stats.server_timing().encode('latin-1')))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            threshold = get_settings().db_query_warn_threshold
+            if threshold and stats.queries > threshold:
+                logger.warning(
+                    '%s %s issued %d queries (%.1f ms in DB, %.1f ms pool wait)',
+                    scope['method'],
+                    scope['path'],
+                    stats.queries,
+                    stats.db_seconds * 1000,
+                    stats.pool_wait_seconds * 1000,
+                )
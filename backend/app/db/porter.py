@@ -0,0 +1,163 @@
+"""The Porter stemmer, as run by the SQLite FTS5 ``porter`` tokenizer.
+
+Snippets are highlighted in Python, so they have to stem words exactly the way the index
+did or a hit is found but not marked. This follows Martin Porter's reference
+implementation as ``fts5_porter.c`` transcribes it: tokens shorter than three or longer
+than 64 characters are left alone, ``y`` is a vowel only after a consonant, and a suffix
+only matches when something is left in front of it.
+"""
+
+from functools import lru_cache
+
+MIN_STEM_CHARS = 3
+MAX_STEM_CHARS = 64
+
+_VOWELS = frozenset('aeiou')
+
+_STEP2 = (
+    ('ational', 'ate'),
+    ('tional', 'tion'),
+    ('enci', 'ence'),
+    ('anci', 'ance'),
+    ('izer', 'ize'),
+    ('bli', 'ble'),
+    ('alli', 'al'),
+    ('entli', 'ent'),
+    ('eli', 'e'),
+    ('ousli', 'ous'),
+    ('ization', 'ize'),
+    ('ation', 'ate'),
+    ('ator', 'ate'),
+    ('alism', 'al'),
+    ('iveness', 'ive'),
+    ('fulness', 'ful'),
+    ('ousness', 'ous'),
+    ('aliti', 'al'),
+    ('iviti', 'ive'),
+    ('biliti', 'ble'),
+    ('logi', 'log'),
+)
+_STEP3 = (
+    ('icate', 'ic'),
+    ('ative', ''),
+    ('alize', 'al'),
+    ('iciti', 'ic'),
+    ('ical', 'ic'),
+    ('ful', ''),
+    ('ness', ''),
+)
+# Longest first, so 'ement' is tried before 'ment' and 'ent'.
+_STEP4 = (
+    'ement', 'ance', 'ence', 'able', 'ible', 'ment', 'al', 'er', 'ic', 'ant', 'ent', 'ion',
+    'ou', 'ism', 'ate', 'iti', 'ous', 'ive', 'ize',
+)
+
+
+def _consonant(word: str, index: int) -> bool:
+    char = word[index]
+    if char in _VOWELS:
+        return False
+    if char == 'y':
+        return index == 0 or not _consonant(word, index - 1)
+    return True
+
+
+def _measure(stem: str) -> int:
+    """The number of vowel-consonant sequences, Porter's *m*."""
+    count, vowel = 0, False
+    for index in range(len(stem)):
+        if _consonant(stem, index):
+            if vowel:
+                count += 1
+            vowel = False
+        else:
+            vowel = True
+    return count
+
+
+def _has_vowel(stem: str) -> bool:
+    return any(not _consonant(stem, index) for index in range(len(stem)))
+
+
+def _double_consonant(word: str) -> bool:
+    return len(word) > 1 and word[-1] == word[-2] and _consonant(word, len(word) - 1)
+
+
+def _cvc(word: str) -> bool:
+    """Ends consonant-vowel-consonant, the last not ``w``, ``x`` or ``y``."""
+    return (
+        len(word) > 2
+        and _consonant(word, len(word) - 3)
+        and not _consonant(word, len(word) - 2)
+        and _consonant(word, len(word) - 1)
+        and word[-1] not in 'wxy'
+    )
+
+
+def _replace(word: str, rules: tuple[tuple[str, str], ...], min_measure: int) -> str:
+    # The first suffix that matches decides, whether or not its condition holds.
+    for suffix, replacement in rules:
+        if word.endswith(suffix):
+            stem = word[: -len(suffix)]
+            return stem + replacement if _measure(stem) > min_measure else word
+    return word
+
+
+def _step1(word: str) -> str:
+    # A suffix must leave at least one character in front of it: 'ies' becomes 'ie'.
+    if (word.endswith('sses') and len(word) > 4) or (word.endswith('ies') and len(word) > 3):
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+
+    if word.endswith('eed') and len(word) > 3:
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ('ed', 'ing'):
+            if word.endswith(suffix) and _has_vowel(word[: -len(suffix)]):
+                word = word[: -len(suffix)]
+                if word.endswith(('at', 'bl', 'iz')):
+                    word += 'e'
+                elif _double_consonant(word) and word[-1] not in 'lsz':
+                    word = word[:-1]
+                elif _measure(word) == 1 and _cvc(word):
+                    word += 'e'
+                break
+
+    if word.endswith('y') and _has_vowel(word[:-1]):
+        word = word[:-1] + 'i'
+    return word
+
+
+def _step4(word: str) -> str:
+    for suffix in _STEP4:
+        if word.endswith(suffix):
+            stem = word[: -len(suffix)]
+            if suffix == 'ion' and not stem.endswith(('s', 't')):
+                return word
+            return stem if _measure(stem) > 1 else word
+    return word
+
+
+def _step5(word: str) -> str:
+    if word.endswith('e'):
+        stem = word[:-1]
+        measure = _measure(stem)
+        if measure > 1 or (measure == 1 and not _cvc(stem)):
+            word = stem
+    if word.endswith('ll') and _measure(word) > 1:
+        word = word[:-1]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def porter_stem(word: str) -> str:
+    """Stem one token; the caller lowercases it, as the ``unicode61`` tokenizer does."""
+    if not MIN_STEM_CHARS <= len(word) <= MAX_STEM_CHARS:
+        return word
+    word = _step1(word)
+    word = _replace(word, _STEP2, 0)
+    word = _replace(word, _STEP3, 0)
+    word = _step4(word)
+    return _step5(word)
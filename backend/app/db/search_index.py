@@ -0,0 +1,163 @@
+"""Full-text index over call transcripts.
+
+Transcripts are stored compressed in ``call_transcripts``, so the database cannot index
+them on its own. Whoever writes a transcript passes the plain text to
+``index_transcripts`` in the same transaction: the ORM does this from ``CallTranscript``
+mapper events, bulk loaders call it directly.
+
+Postgres keeps a ``tsvector`` column with a GIN index next to the compressed text;
+SQLite keeps an FTS5 table keyed by call id. Only the first ``SEARCH_INDEX_MAX_KB`` of
+each transcript are indexed, cut at a word boundary.
+"""
+
+import re
+from collections.abc import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import get_settings
+from app.db.compression import decompress_text
+
+SEARCH_CONFIG = 'english'
+
+POSTGRES_DDL = (
+    'ALTER TABLE call_transcripts ADD COLUMN IF NOT EXISTS search_vector tsvector',
+    'CREATE INDEX IF NOT EXISTS idx_call_transcripts_search '
+    'ON call_transcripts USING GIN (search_vector)',
+)
+# Contentless: the index keeps only its token lists, not a second copy of every transcript.
+SQLITE_DDL = (
+    'CREATE VIRTUAL TABLE calls_fts USING fts5('
+    "transcript, content='', contentless_delete=1, tokenize='porter unicode61')"
+)
+# Before 3.43 rows of a contentless table cannot be deleted, so the table stores its text.
+SQLITE_LEGACY_DDL = (
+    "CREATE VIRTUAL TABLE calls_fts USING fts5(transcript, tokenize='porter unicode61')"
+)
+SQLITE_CONTENTLESS_DELETE = (3, 43, 0)
+BACKFILL_BATCH_SIZE = 200
+
+POSTGRES_INDEX = text(
+    f"UPDATE call_transcripts SET search_vector = to_tsvector('{SEARCH_CONFIG}', :transcript) "
+    'WHERE call_id = :call_id'
+)
+SQLITE_UNINDEX = text('DELETE FROM calls_fts WHERE rowid = :call_id')
+SQLITE_INDEX = text('INSERT INTO calls_fts(rowid, transcript) VALUES (:call_id, :transcript)')
+TRAILING_WORD = re.compile(r'\S*\Z')
+# A tsvector is limited to 1 MB; an over-long one fails with program_limit_exceeded.
+PROGRAM_LIMIT_EXCEEDED = '54000'
+
+
+def index_limit() -> int:
+    """How many characters of a transcript are indexed."""
+    return get_settings().search_index_max_kb * 1024
+
+
+def _prefix(body: str, limit: int) -> str:
+    """``body`` up to ``limit`` characters, without a word cut in half."""
+    if len(body) <= limit:
+        return body
+    head = body[:limit]
+    if not body[limit].isspace():
+        head = head[: TRAILING_WORD.search(head).start()]
+    return head
+
+
+def install_search_index(connection: Connection) -> None:
+    """Create the transcript index if it is missing; safe to run on every startup."""
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+    elif dialect == 'sqlite':
+        version = connection.execute(text('SELECT sqlite_version()')).scalar_one()
+        contentless = tuple(map(int, version.split('.'))) >= SQLITE_CONTENTLESS_DELETE
+        existing = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'calls_fts'")
+        ).scalar()
+        if existing is not None:
+            if not contentless or "content=''" in existing:
+                return
+            # Built by an older SQLite with its own copy of the text; rebuilt without it.
+            connection.execute(text('DROP TABLE calls_fts'))
+        connection.execute(text(SQLITE_DDL if contentless else SQLITE_LEGACY_DDL))
+        # Index whatever the table already holds, for databases created before the index,
+        # a batch at a time so the corpus is never decompressed whole.
+        rows = connection.execute(
+            text('SELECT call_id, codec, content FROM call_transcripts'),
+            execution_options={'stream_results': True},
+        )
+        while batch := rows.fetchmany(BACKFILL_BATCH_SIZE):
+            index_transcripts(
+                connection,
+                [(call_id, decompress_text(codec, content)) for call_id, codec, content in batch],
+            )
+
+
+def drop_search_index(connection: Connection) -> None:
+    # The FTS5 table outlives ``DROP TABLE call_transcripts`` and would keep old rowids.
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text('DROP TABLE IF EXISTS calls_fts'))
+
+
+def index_transcripts(connection: Connection, transcripts: Iterable[tuple[int, str]]) -> None:
+    """(Re)index ``(call_id, transcript)`` pairs whose ``call_transcripts`` rows exist."""
+    limit = index_limit()
+    params = [
+        {'call_id': call_id, 'transcript': _prefix(body, limit)} for call_id, body in transcripts
+    ]
+    if not params:
+        return
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        for row in params:
+            _index_postgres(connection, row['call_id'], row['transcript'])
+    elif dialect == 'sqlite':
+        connection.execute(SQLITE_UNINDEX, params)
+        connection.execute(SQLITE_INDEX, params)
+
+
+def unindex_transcript(connection: Connection, call_id: int) -> None:
+    # Postgres drops the vector with its row.
+    if connection.dialect.name == 'sqlite':
+        connection.execute(SQLITE_UNINDEX, {'call_id': call_id})
+
+
+def _index_postgres(connection: Connection, call_id: int, body: str) -> None:
+    # Text with unusually many distinct words can still overflow the tsvector: index
+    # ever shorter prefixes until it fits, rather than failing the whole write.
+    while True:
+        try:
+            with connection.begin_nested():
+                connection.execute(POSTGRES_INDEX, {'call_id': call_id, 'transcript': body})
+            return
+        except DBAPIError as exc:
+            if getattr(exc.orig, 'sqlstate', None) != PROGRAM_LIMIT_EXCEEDED or not body:
+                raise
+            body = _prefix(body, len(body) // 2)
+
+
+class TranscriptIndexer:
+    """Indexes one transcript fed in pieces, in ``close``; its ``call_transcripts`` row must exist.
+
+    Neither index can be extended cheaply (FTS5 rows are immutable, and appending to a
+    ``tsvector`` rewrites it), so the text is indexed once. Only the part that will be
+    indexed is kept, so a streamed transcript holds at most ``SEARCH_INDEX_MAX_KB`` here.
+    """
+
+    def __init__(self, call_id: int) -> None:
+        self.call_id = call_id
+        # One character past the limit tells ``_prefix`` whether the last word was cut.
+        self._room = index_limit() + 1
+        self._pieces: list[str] = []
+
+    def feed(self, piece: str) -> None:
+        if self._room > 0:
+            self._pieces.append(piece[: self._room])
+            self._room -= len(self._pieces[-1])
+
+    def close(self, connection: Connection) -> None:
+        index_transcripts(connection, [(self.call_id, ''.join(self._pieces))])
+        self._pieces = []
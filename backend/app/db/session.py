@@ -1,14 +1,37 @@
 from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.db.instrumentation import InstrumentedNullPool, InstrumentedQueuePool, instrument_engine
+
+
+def engine_options(settings: Settings) -> dict[str, Any]:
+    if make_url(settings.database_url).get_backend_name() == 'sqlite':
+        # SQLite files open cheaply per checkout; a sized pool buys nothing there.
+        return {'poolclass': InstrumentedNullPool}
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+        'pool_timeout': settings.db_pool_timeout,
+        'pool_recycle': settings.db_pool_recycle,
+        'pool_pre_ping': settings.db_pool_pre_ping,
+    }
+
 
 settings = get_settings()
-engine = create_async_engine(settings.database_url, future=True, echo=False)
+engine = create_async_engine(
+    settings.database_url, future=True, echo=False, **engine_options(settings)
+)
+instrument_engine(engine.sync_engine)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    # AsyncSession checks out a connection on its first statement, so requests that
+    # fail before querying (e.g. bad tokens, claims auth) never touch the pool.
     async with AsyncSessionLocal() as session:
         yield session
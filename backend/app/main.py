@@ -1,26 +1,54 @@
+import asyncio
+import hmac
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 
 from app.api.v1.auth import router as auth_router
 from app.api.v1.calls import router as calls_router
 from app.api.v1.settings import router as settings_router
 from app.core.config import get_settings
+from app.core.metrics import registry
+from app.core.middleware import RequestMetricsMiddleware
+from app.core.responses import ORJSONResponse
+from app.core.security import shutdown_hash_executor
 from app.db.base import Base
+from app.db.instrumentation import QueryStatsMiddleware
+from app.db.search_index import install_search_index
 from app.db.session import engine
+from app.services.analysis import shutdown_analysis_executor
+from app.services.events import close_event_broker
+from app.services.resource_versions import ResourceVersionCache
+from app.services.transcription_providers import close_http_client
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(install_search_index)
+    invalidations = None
+    if ResourceVersionCache.enabled() and ResourceVersionCache.shared():
+        invalidations = asyncio.create_task(ResourceVersionCache.listen())
     yield
+    if invalidations is not None:
+        invalidations.cancel()
+    shutdown_analysis_executor()
+    shutdown_hash_executor()
+    await close_http_client()
+    await close_event_broker()
 
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name, version='1.0.0', lifespan=lifespan)
+app = FastAPI(
+    title=settings.app_name,
+    version='1.0.0',
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,7 +56,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=['*'],
     allow_headers=['*'],
+    expose_headers=['X-Next-Cursor', 'Server-Timing', 'ETag'],
 )
+if settings.metrics_enabled:
+    app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
 
 @app.get('/health')
@@ -43,6 +75,27 @@ async def readiness() -> dict[str, str]:
     return {'status': 'ready'}
 
 
+if settings.metrics_enabled:
+
+    @app.get('/metrics', include_in_schema=False)
+    async def metrics(authorization: str | None = Header(default=None)) -> PlainTextResponse:
+        # Latency histograms describe every route; only the scraper holding the token may read them.
+        token = get_settings().metrics_token
+        if not token:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail='Metrics token not set'
+            )
+        if not authorization or not hmac.compare_digest(
+            authorization.encode(), f'Bearer {token}'.encode()
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Invalid metrics token',
+                headers={'WWW-Authenticate': 'Bearer'},
+            )
+        return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4')
+
+
 app.include_router(auth_router, prefix='/api/v1')
 app.include_router(calls_router, prefix='/api/v1')
 app.include_router(settings_router, prefix='/api/v1')
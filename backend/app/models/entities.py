@@ -1,10 +1,83 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+from typing import Any
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, JSON, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum as SAEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    LargeBinary,
+    String,
+    Text,
+    TypeDecorator,
+    event,
+    func,
+    inspect,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm import (
+    Mapped,
+    attribute_keyed_dict,
+    mapped_column,
+    relationship,
+    selectinload,
+)
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.types import TypeEngine
 
 from app.db.base import Base
+from app.db.compression import compress_text, decompress_text
+from app.db.search_index import (
+    drop_search_index,
+    index_transcripts,
+    install_search_index,
+    unindex_transcript,
+)
+
+
+class UTCDateTime(TypeDecorator):
+    """``TIMESTAMPTZ`` on Postgres; on SQLite, UTC wall time in the text format of its
+    second-resolution ``CURRENT_TIMESTAMP`` default.
+
+    SQLite has no time zones, so aware datetimes are converted to UTC before they are
+    bound (naive ones are taken as UTC) and values read back are UTC-aware, keeping
+    range and keyset comparisons right whatever zone callers filter with.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine:
+        if dialect.name == 'sqlite':
+            return dialect.type_descriptor(
+                sqlite.DATETIME(
+                    storage_format=(
+                        '%(year)04d-%(month)02d-%(day)02d '
+                        '%(hour)02d:%(minute)02d:%(second)02d'
+                    )
+                )
+            )
+        return dialect.type_descriptor(self.impl)
+
+    def process_bind_param(self, value: datetime | None, dialect: Dialect) -> datetime | None:
+        if value is not None and dialect.name == 'sqlite' and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value: datetime | None, dialect: Dialect) -> datetime | None:
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+
+Timestamp = UTCDateTime()
+# JSONB on Postgres, matching database/schema.sql, so containment queries can use GIN.
+AnalysisJSON = JSON().with_variant(postgresql.JSONB(), 'postgresql')
 
 
 class Role(str, Enum):
@@ -20,6 +93,25 @@ class CallStatus(str, Enum):
     FAILED = 'failed'
 
 
+class ReanalysisStatus(str, Enum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    SUPERSEDED = 'superseded'
+    FAILED = 'failed'
+
+
+class CrmSyncStatus(str, Enum):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+
+class BlobTier(str, Enum):
+    HOT = 'hot'
+    COLD = 'cold'
+
+
 class Organization(Base):
     __tablename__ = 'organizations'
 
@@ -27,7 +119,9 @@ class Organization(Base):
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     subscription_tier: Mapped[str] = mapped_column(String(50), default='professional', nullable=False)
     settings: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Bumped whenever ``settings`` changes; the ETag of ``GET /settings/templates``.
+    settings_version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
 
     users: Mapped[list['User']] = relationship(back_populates='organization')
 
@@ -42,13 +136,21 @@ class User(Base):
     role: Mapped[Role] = mapped_column(SAEnum(Role), nullable=False, default=Role.REP)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
 
     organization: Mapped['Organization'] = relationship(back_populates='users')
     calls: Mapped[list['Call']] = relationship(back_populates='owner')
 
 
 class Call(Base):
+    """Call metadata; the transcript and analysis live in their own tables.
+
+    ``transcript`` and ``analysis`` read and write through ``transcript_record`` and
+    ``analysis_sections``, which are never loaded implicitly: queries that need them
+    ask for ``CALL_CONTENT`` (or one of its loaders), everything else reads only the
+    small ``calls`` row.
+    """
+
     __tablename__ = 'calls'
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -56,9 +158,336 @@ class Call(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), nullable=False)
     file_name: Mapped[str] = mapped_column(String(255), nullable=False)
     file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
-    transcript: Mapped[str] = mapped_column(Text, default='', nullable=False)
+    file_size: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Set while the call holds a reference on its upload; cleared when retention releases it.
+    blob_key: Mapped[str | None] = mapped_column(ForeignKey('blobs.key'), nullable=True)
     status: Mapped[CallStatus] = mapped_column(SAEnum(CallStatus), default=CallStatus.UPLOADED, nullable=False)
-    analysis: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    analysis_template_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Bumped by every analysis write; serialized analyses are cached per revision.
+    analysis_revision: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Bumped by every write to the call, its transcript or its analysis; the ETag of
+    # ``GET /calls/{call_id}``.
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    sentiment_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    buying_intent_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    closing_probability: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    engagement_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    conversation_state: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    call_type: Mapped[str | None] = mapped_column(String(30), nullable=True)
+    crm_synced_at: Mapped[datetime | None] = mapped_column(Timestamp, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
 
     owner: Mapped['User'] = relationship(back_populates='calls')
+    transcript_record: Mapped['CallTranscript | None'] = relationship(
+        cascade='all, delete-orphan', passive_deletes=True, lazy='raise'
+    )
+    analysis_sections: Mapped[dict[str, 'CallAnalysisSection']] = relationship(
+        collection_class=attribute_keyed_dict('section'),
+        cascade='all, delete-orphan',
+        passive_deletes=True,
+        order_by='CallAnalysisSection.position',
+        lazy='raise',
+    )
+
+    __table_args__ = (
+        Index('idx_calls_org_created', 'organization_id', created_at.desc(), id.desc()),
+        Index('idx_calls_org_template_version', 'organization_id', 'analysis_template_version'),
+        Index('idx_calls_org_state', 'organization_id', 'conversation_state'),
+        Index('idx_calls_org_call_type', 'organization_id', 'call_type'),
+        # Analytics filters on these three and only aggregates the included columns, so
+        # Postgres answers it from the index without visiting the table.
+        Index(
+            'idx_calls_org_analytics',
+            'organization_id',
+            'status',
+            'created_at',
+            postgresql_include=[
+                'user_id',
+                'call_type',
+                'conversation_state',
+                'sentiment_score',
+                'buying_intent_score',
+                'closing_probability',
+                'engagement_score',
+            ],
+        ),
+        Index('idx_calls_blob_key', 'blob_key'),
+    )
+
+    @property
+    def transcript(self) -> str:
+        record = self.transcript_record
+        return record.text if record is not None else ''
+
+    @transcript.setter
+    def transcript(self, transcript: str) -> None:
+        record = self.transcript_record
+        if record is not None:
+            record.text = transcript
+            # The calls row itself is unchanged, so nothing else would bump the version.
+            if inspect(self).has_identity:
+                self.version = Call.version + 1
+        elif transcript:
+            self.transcript_record = CallTranscript(text=transcript)
+        else:
+            # Marks the (absent) transcript as loaded, so reading it back needs no query.
+            self.transcript_record = None
+
+    @property
+    def analysis(self) -> dict:
+        """The analysis assembled from its sections; assign a new dict to change it."""
+        sections = sorted(self.analysis_sections.values(), key=lambda item: item.position)
+        return {item.section: item.payload for item in sections}
+
+    @analysis.setter
+    def analysis(self, analysis: dict) -> None:
+        analysis = analysis or {}
+        for name in self.analysis_sections.keys() - analysis.keys():
+            del self.analysis_sections[name]
+        for position, (name, payload) in enumerate(analysis.items()):
+            self._write_section(name, payload, position)
+        for name in MATERIALIZED_SECTIONS:
+            self._materialize_section(name, analysis.get(name))
+        self._bump_analysis_revision()
+
+    def set_analysis_section(self, name: str, payload: Any) -> None:
+        """Replace one section; only that section has to be loaded."""
+        section = self.analysis_sections.get(name)
+        if section is not None:
+            position = section.position
+        else:
+            positions = [item.position for item in self.analysis_sections.values()]
+            position = max(positions, default=-1) + 1
+        self._write_section(name, payload, position)
+        self._materialize_section(name, payload)
+        self._bump_analysis_revision()
+
+    def _bump_analysis_revision(self) -> None:
+        # Incremented in SQL, so callers that loaded only some columns need not load it;
+        # rows not inserted yet keep the default.
+        if inspect(self).has_identity:
+            self.analysis_revision = Call.analysis_revision + 1
+
+    def _write_section(self, name: str, payload: Any, position: int) -> None:
+        section = self.analysis_sections.get(name)
+        if section is None:
+            self.analysis_sections[name] = CallAnalysisSection(
+                section=name, position=position, payload=payload
+            )
+            return
+        if section.position != position:
+            section.position = position
+        # The same object may have been changed in place, so it is always rewritten.
+        if section.payload is payload or section.payload != payload:
+            section.payload = payload
+            flag_modified(section, 'payload')
+
+    def _materialize_section(self, name: str, payload: Any) -> None:
+        # Keep the queryable columns in step with every write of the section they come from.
+        payload = payload if isinstance(payload, dict) else {}
+        if name == 'scores':
+            self.sentiment_score = payload.get('sentiment_score')
+            self.buying_intent_score = payload.get('buying_intent_score')
+            self.closing_probability = payload.get('closing_probability')
+            self.engagement_score = payload.get('engagement_score')
+        elif name == 'structured_payload':
+            self.conversation_state = payload.get('conversation_state')
+        elif name == 'executive_summary':
+            self.call_type = payload.get('call_type')
+
+
+MATERIALIZED_SECTIONS = ('scores', 'structured_payload', 'executive_summary')
+
+
+class CallTranscript(Base):
+    """A call's transcript, compressed; ``content`` is decoded by ``codec``."""
+
+    __tablename__ = 'call_transcripts'
+
+    call_id: Mapped[int] = mapped_column(
+        ForeignKey('calls.id', ondelete='CASCADE'), primary_key=True
+    )
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    content: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    text_bytes: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+    @property
+    def text(self) -> str:
+        return decompress_text(self.codec, self.content)
+
+    @text.setter
+    def text(self, transcript: str) -> None:
+        self.codec, self.content = compress_text(transcript)
+        self.text_bytes = len(transcript.encode('utf-8'))
+        # Indexed on flush from the plain text rather than by decompressing ``content``.
+        self._unindexed_text = transcript
+
+
+class CallAnalysisSection(Base):
+    """One top-level analysis key (``scores``, ``bant``, ...) of one call."""
+
+    __tablename__ = 'call_analysis_sections'
+
+    call_id: Mapped[int] = mapped_column(
+        ForeignKey('calls.id', ondelete='CASCADE'), primary_key=True
+    )
+    section: Mapped[str] = mapped_column(String(64), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    payload: Mapped[Any] = mapped_column(AnalysisJSON, nullable=True)
+
+    __table_args__ = (
+        Index(
+            'idx_call_analysis_sections_payload',
+            'payload',
+            postgresql_using='gin',
+            postgresql_ops={'payload': 'jsonb_path_ops'},
+        ).ddl_if(dialect='postgresql'),
+    )
+
+
+@event.listens_for(Call, 'before_update')
+def _bump_call_version(_, __, call: Call) -> None:
+    # Incremented in SQL like ``analysis_revision``; bulk updates that change what
+    # ``GET /calls/{call_id}`` returns bump it themselves.
+    call.version = Call.version + 1
+
+
+@event.listens_for(Organization, 'before_update')
+def _bump_settings_version(_, __, org: Organization) -> None:
+    if inspect(org).attrs.settings.history.has_changes():
+        org.settings_version = Organization.settings_version + 1
+
+
+# Loader options for handlers that read or rewrite a call's transcript and analysis.
+CALL_CONTENT = (selectinload(Call.transcript_record), selectinload(Call.analysis_sections))
+
+
+def _index_transcript(_, connection, record: CallTranscript) -> None:
+    # Only writes through ``text`` reindex; transcripts streamed into ``content`` are
+    # indexed piece by piece by whoever streams them.
+    transcript = record.__dict__.pop('_unindexed_text', None)
+    if transcript is not None:
+        index_transcripts(connection, [(record.call_id, transcript)])
+
+
+event.listen(CallTranscript, 'after_insert', _index_transcript)
+event.listen(CallTranscript, 'after_update', _index_transcript)
+event.listen(
+    CallTranscript,
+    'after_delete',
+    lambda _, connection, record: unindex_transcript(connection, record.call_id),
+)
+event.listen(
+    CallTranscript.__table__,
+    'after_create',
+    lambda _, connection, **kw: install_search_index(connection),
+)
+event.listen(
+    CallTranscript.__table__,
+    'before_drop',
+    lambda _, connection, **kw: drop_search_index(connection),
+)
+
+
+class Blob(Base):
+    """One stored upload, shared by every call with the same content and suffix."""
+
+    __tablename__ = 'blobs'
+
+    key: Mapped[str] = mapped_column(String(96), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    tier: Mapped[BlobTier] = mapped_column(SAEnum(BlobTier), default=BlobTier.HOT, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    stored_size: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_referenced_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
+    released_at: Mapped[datetime | None] = mapped_column(Timestamp, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_blobs_tier_referenced', 'tier', 'last_referenced_at'),
+        Index(
+            'idx_blobs_released',
+            'released_at',
+            postgresql_where=ref_count <= 0,
+            sqlite_where=ref_count <= 0,
+        ),
+    )
+
+
+class UploadSession(Base):
+    __tablename__ = 'upload_sessions'
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    organization_id: Mapped[int] = mapped_column(ForeignKey('organizations.id'), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), nullable=False)
+    file_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    part_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    total_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    received_bytes: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    # Claimed by the ``PUT`` writing the next part, so concurrent parts cannot interleave.
+    writer_id: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    writer_expires_at: Mapped[datetime | None] = mapped_column(Timestamp, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
+
+
+class ContentCacheEntry(Base):
+    __tablename__ = 'content_cache'
+
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    cache_key: Mapped[str] = mapped_column(String(80), primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    last_hit_at: Mapped[datetime | None] = mapped_column(Timestamp, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
+
+    __table_args__ = (Index('idx_content_cache_last_hit', 'last_hit_at', 'created_at'),)
+
+
+class AnalysisTemplate(Base):
+    __tablename__ = 'analysis_templates'
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey('organizations.id'), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    template: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
+
+
+class ReanalysisJob(Base):
+    __tablename__ = 'reanalysis_jobs'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    organization_id: Mapped[int] = mapped_column(ForeignKey('organizations.id'), nullable=False)
+    template_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[ReanalysisStatus] = mapped_column(
+        SAEnum(ReanalysisStatus), default=ReanalysisStatus.PENDING, nullable=False
+    )
+    last_call_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    recomputed_calls: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    bumped_calls: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
+
+
+class CrmOutboxEntry(Base):
+    """A pending CRM write, recorded in the same transaction as the request for it."""
+
+    __tablename__ = 'crm_outbox'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    organization_id: Mapped[int] = mapped_column(ForeignKey('organizations.id'), nullable=False)
+    call_id: Mapped[int] = mapped_column(ForeignKey('calls.id'), nullable=False)
+    requested_by_user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), nullable=False)
+    status: Mapped[CrmSyncStatus] = mapped_column(
+        SAEnum(CrmSyncStatus), default=CrmSyncStatus.PENDING, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    external_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
+    sent_at: Mapped[datetime | None] = mapped_column(Timestamp, nullable=True)
+
+    __table_args__ = (
+        Index('idx_crm_outbox_status_id', 'status', 'id'),
+        Index('idx_crm_outbox_org_call', 'organization_id', 'call_id'),
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models.entities import CallStatus
 
@@ -10,6 +10,90 @@ class CallOut(BaseModel):
     status: CallStatus
     transcript: str
     analysis: dict
+    crm_synced_at: datetime | None = None
     created_at: datetime
 
     model_config = {'from_attributes': True}
+
+
+class CallListItem(BaseModel):
+    """A projected ``CallOut``; only the requested fields are serialized."""
+
+    id: int
+    file_name: str | None = None
+    status: CallStatus | None = None
+    transcript: str | None = None
+    analysis: dict | None = None
+    created_at: datetime | None = None
+
+
+class CallSearchResult(BaseModel):
+    id: int
+    file_name: str
+    status: CallStatus
+    created_at: datetime
+    rank: float
+    snippet: str
+
+
+class UploadSessionCreate(BaseModel):
+    file_name: str = Field(min_length=1, max_length=255)
+    total_size: int = Field(gt=0)
+
+
+class UploadSessionOut(BaseModel):
+    upload_id: str
+    file_name: str
+    total_size: int
+    received_bytes: int
+    max_part_bytes: int
+
+
+class AnalyzeBatchRequest(BaseModel):
+    transcripts: list[str] = Field(default_factory=list)
+    call_ids: list[int] = Field(default_factory=list)
+
+
+class AnalyzeBatchOut(BaseModel):
+    analyses: list[dict]
+    rescored_call_ids: list[int]
+
+
+class CrmBulkSyncRequest(BaseModel):
+    """Calls to sync: explicit ``call_ids``, or every call matching the filters."""
+
+    call_ids: list[int] = Field(default_factory=list, max_length=10000)
+    status: CallStatus | None = CallStatus.ANALYZED
+    conversation_state: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+class CrmSyncCounts(BaseModel):
+    pending: int
+    sent: int
+    failed: int
+
+
+class CrmBulkSyncOut(BaseModel):
+    queued: int
+    outbox: CrmSyncCounts
+
+
+class CallAnalyticsGroup(BaseModel):
+    key: str | None = None
+    label: str | None = None
+    calls: int
+    avg_sentiment: float | None = None
+    avg_buying_intent: float | None = None
+    avg_closing_probability: float | None = None
+    avg_engagement: float | None = None
+    hot: int
+    warm: int
+    nurture: int
+
+
+class CallAnalyticsOut(BaseModel):
+    group_by: str
+    totals: CallAnalyticsGroup
+    groups: list[CallAnalyticsGroup]
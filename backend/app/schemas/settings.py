@@ -1,11 +1,25 @@
 from pydantic import BaseModel, Field
 
+from app.models.entities import ReanalysisStatus
+
 
 class TemplatesOut(BaseModel):
     crm_field_mapping: dict[str, str] = Field(default_factory=dict)
     call_analysis_template: dict = Field(default_factory=dict)
+    call_analysis_template_version: int = 0
+    reanalysis_job_id: int | None = None
 
 
 class TemplatesUpdate(BaseModel):
     crm_field_mapping: dict[str, str] = Field(default_factory=dict)
     call_analysis_template: dict = Field(default_factory=dict)
+
+
+class ReanalysisJobOut(BaseModel):
+    id: int
+    template_version: int
+    status: ReanalysisStatus
+    recomputed_calls: int
+    bumped_calls: int
+    last_call_id: int
+    pending_calls: int
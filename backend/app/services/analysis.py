@@ -1,9 +1,19 @@
 from __future__ import annotations
 
-from collections import Counter
+import asyncio
+from collections.abc import Container, Iterable, Iterator, Mapping
+import copy
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
 import re
 from typing import Any
 
+from app.core.config import get_settings
+from app.core.metrics import timed_stage
+from app.services.keyword_matcher import KeywordMatcher, KeywordScan
+from app.services.transcription import TranscriptionService
+
 POSITIVE_TERMS = {
     'great',
     'excellent',
@@ -23,6 +33,83 @@ NEGATIVE_TERMS = {
     'slow',
     'risk',
 }
+INTENT_TERMS = ('budget', 'timeline', 'decision', 'next')
+OBJECTION_TERMS = ('expensive', 'concern', 'risk')
+NEXT_STEP_TRIGGERS = ('will', 'next', 'send', 'schedule', 'follow')
+BANT_TERMS = {
+    'budget': {'budget', 'cost', 'price'},
+    'authority': {'decision maker', 'vp', 'director', 'cfo'},
+    'need': {'problem', 'need', 'challenge', 'pain'},
+    'timeline': {'timeline', 'quarter', 'month', 'deadline'},
+}
+KEY_MOMENT_TERMS = {
+    'budget_discussion': 'budget',
+    'timeline_mention': 'timeline',
+    'decision_maker': 'decision maker',
+    'pricing_conversation': 'price',
+    'demo_request': 'demo',
+    'contract_discussion': 'contract',
+}
+PHRASE_TERMS = {
+    'demo',
+    'proposal',
+    'pricing',
+    'next week',
+    'schedule',
+    'follow up',
+    'urgent',
+    'expensive',
+    'competitor',
+    'alternative',
+    *KEY_MOMENT_TERMS.values(),
+    *(term for terms in BANT_TERMS.values() for term in terms),
+}
+
+DEFAULT_FOLLOW_UP_SUBJECT = 'Next steps from our sales strategy call'
+DEFAULT_FRAMEWORK = 'BANT'
+# Organization template keys and the analysis section each one feeds.
+TEMPLATE_SECTIONS = {
+    'follow_up_subject': 'follow_up',
+    'objection_terms': 'objections',
+    'framework': 'structured_payload',
+}
+# Sections that cannot be rebuilt from the stored analysis alone.
+TRANSCRIPT_SECTIONS = {'objections'}
+SUMMARY_WORDS = 48
+# Longest sentence (or summary word) ``StreamingAnalyzer`` buffers; the rest of it is left
+# out of preview lines and next steps, never out of keyword counts.
+STREAM_BUFFER_CHARS = 64 * 1024
+WORD = re.compile(r'\S+')
+
+MATCHER = KeywordMatcher(
+    tokens=POSITIVE_TERMS | NEGATIVE_TERMS | set(INTENT_TERMS),
+    phrases=PHRASE_TERMS,
+    triggers=NEXT_STEP_TRIGGERS,
+)
+
+_executor: Executor | None = None
+
+
+def get_analysis_executor() -> Executor:
+    """Shared process pool for CPU-bound analysis, created on first use."""
+    global _executor
+    if _executor is None:
+        workers = get_settings().analysis_pool_workers or os.cpu_count() or 1
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes (e.g. pool-managed workers) cannot fork children.
+            _executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            _executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+            )
+    return _executor
+
+
+def shutdown_analysis_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
 
 
 class AnalysisService:
@@ -31,29 +118,53 @@ class AnalysisService:
     @staticmethod
     def analyze(transcript: str) -> dict[str, Any]:
         normalized = transcript.lower()
-        words = re.findall(r"[a-z']+", normalized)
-        counts = Counter(words)
+        scan = MATCHER.scan(normalized)
+        summary = ' '.join(transcript.split(None, SUMMARY_WORDS)[:SUMMARY_WORDS])
+        preview_points = [line for _, line in zip(range(2), AnalysisService._sentences(transcript))]
+        return AnalysisService._assemble(
+            scan.token_counts,
+            scan.phrases,
+            summary,
+            AnalysisService._next_steps(transcript, normalized, scan.trigger_positions),
+            preview_points,
+        )
 
+    @staticmethod
+    def analyze_stream(chunks: Iterable[str]) -> dict[str, Any]:
+        """Same result as ``analyze(''.join(chunks))`` without holding the whole text."""
+        analyzer = StreamingAnalyzer()
+        for chunk in chunks:
+            analyzer.feed(chunk)
+        return analyzer.result()
+
+    @staticmethod
+    def analyze_file(file_path: str, chunk_size: int | None = None) -> dict[str, Any]:
+        chunk_size = chunk_size or get_settings().analysis_stream_chunk_kb * 1024
+        return AnalysisService.analyze_stream(
+            TranscriptionService.read_chunks(file_path, chunk_size)
+        )
+
+    @staticmethod
+    def _assemble(
+        counts: Mapping[str, int],
+        phrases: Container[str],
+        summary: str,
+        next_steps: list[dict[str, str]],
+        preview_points: list[str],
+    ) -> dict[str, Any]:
         positive = sum(counts[t] for t in POSITIVE_TERMS)
         negative = sum(counts[t] for t in NEGATIVE_TERMS)
         sentiment = max(1, min(10, 5 + positive - negative))
-        buying_intent = max(
-            1,
-            min(
-                10,
-                counts['budget'] + counts['timeline'] + counts['decision'] + counts['next'] + 2,
-            ),
-        )
+        buying_intent = max(1, min(10, sum(counts[t] for t in INTENT_TERMS) + 2))
 
         closing_probability = max(1, min(100, 42 + positive * 8 - negative * 9 + buying_intent * 4))
-        summary = ' '.join(transcript.split()[:48])
-        pain_points = [term for term in sorted(NEGATIVE_TERMS) if term in counts]
+        pain_points = [term for term in sorted(NEGATIVE_TERMS) if counts[term]]
 
         return {
             'executive_summary': {
                 'overview': summary,
-                'call_type': AnalysisService._infer_call_type(normalized),
-                'outcome': AnalysisService._infer_outcome(normalized),
+                'call_type': AnalysisService._infer_call_type(phrases),
+                'outcome': AnalysisService._infer_outcome(phrases),
             },
             'scores': {
                 'sentiment_score': sentiment,
@@ -61,16 +172,16 @@ class AnalysisService:
                 'closing_probability': closing_probability,
                 'engagement_score': max(1, min(10, sentiment + 1)),
             },
-            'bant': AnalysisService._extract_bant(normalized),
+            'bant': AnalysisService._extract_bant(phrases),
             'pain_points': pain_points,
-            'objections': [term for term in ('expensive', 'concern', 'risk') if term in counts],
-            'key_moments': AnalysisService._key_moments(normalized),
+            'objections': [term for term in OBJECTION_TERMS if counts[term]],
+            'key_moments': AnalysisService._key_moments(phrases),
             'methodology_insights': {
-                'mugica_keuilian': AnalysisService._detect_framework_cues(normalized),
-                'bill_walsh': AnalysisService._detect_competitive_cues(normalized),
+                'mugica_keuilian': AnalysisService._detect_framework_cues(phrases),
+                'bill_walsh': AnalysisService._detect_competitive_cues(phrases),
             },
-            'next_steps': AnalysisService.extract_next_steps(transcript),
-            'follow_up': AnalysisService._generate_follow_up(transcript, summary),
+            'next_steps': next_steps,
+            'follow_up': AnalysisService._generate_follow_up(summary, preview_points),
             'structured_payload': {
                 'schema_version': 'v1',
                 'crm_ready': True,
@@ -78,67 +189,165 @@ class AnalysisService:
             },
         }
 
+    @staticmethod
+    def analyze_many(
+        transcripts: Iterable[str], executor: Executor | None = None, chunksize: int | None = None
+    ) -> list[dict[str, Any]]:
+        executor = executor or get_analysis_executor()
+        chunksize = chunksize or get_settings().analysis_batch_chunksize
+        return list(executor.map(AnalysisService.analyze, transcripts, chunksize=chunksize))
+
+    @staticmethod
+    @timed_stage('analysis')
+    async def analyze_async(transcript: str) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_analysis_executor(), AnalysisService.analyze, transcript
+        )
+
+    @staticmethod
+    @timed_stage('analysis_batch')
+    async def analyze_many_async(
+        transcripts: list[str], chunksize: int | None = None
+    ) -> list[dict[str, Any]]:
+        # ``Executor.map`` blocks while collecting results, so drive it from a thread.
+        return await asyncio.to_thread(
+            AnalysisService.analyze_many, transcripts, None, chunksize
+        )
+
+    @staticmethod
+    def template_sections(previous: dict[str, Any], current: dict[str, Any]) -> set[str]:
+        """Analysis sections whose output differs between two organization templates."""
+        changed = {
+            key for key in previous.keys() | current.keys() if previous.get(key) != current.get(key)
+        }
+        return {TEMPLATE_SECTIONS[key] for key in changed if key in TEMPLATE_SECTIONS}
+
+    @staticmethod
+    def apply_template(
+        analysis: dict[str, Any],
+        template: dict[str, Any],
+        transcript: str | None = None,
+        sections: Iterable[str] | None = None,
+        found_terms: Container[str] | None = None,
+    ) -> dict[str, Any]:
+        """Return a copy of a base analysis with the template-driven sections rebuilt.
+
+        ``transcript`` is only read when one of ``TRANSCRIPT_SECTIONS`` is rebuilt. Callers
+        that streamed it pass ``found_terms`` instead: the template's objection terms it
+        contains, as found by ``TermSearch``.
+        """
+        analysis = copy.deepcopy(analysis)
+        sections = set(TEMPLATE_SECTIONS.values()) if sections is None else set(sections)
+
+        if 'follow_up' in sections:
+            subject = template.get('follow_up_subject') or DEFAULT_FOLLOW_UP_SUBJECT
+            analysis['follow_up']['subject'] = str(subject)
+        if 'objections' in sections:
+            # Built-in objections are a subset of the negative terms kept in pain_points.
+            objections = [term for term in OBJECTION_TERMS if term in analysis['pain_points']]
+            if found_terms is None:
+                found_terms = (transcript or '').lower()
+            for term in template.get('objection_terms') or []:
+                term = str(term).lower()
+                if term and term not in objections and term in found_terms:
+                    objections.append(term)
+            analysis['objections'] = objections
+        if 'structured_payload' in sections:
+            framework = template.get('framework') or DEFAULT_FRAMEWORK
+            analysis['structured_payload']['framework'] = str(framework)
+        return analysis
+
     @staticmethod
     def extract_next_steps(transcript: str) -> list[dict[str, str]]:
-        lines = [line.strip() for line in transcript.split('.') if line.strip()]
+        normalized = transcript.lower()
+        return AnalysisService._next_steps(
+            transcript, normalized, MATCHER.scan(normalized).trigger_positions
+        )
+
+    @staticmethod
+    def _next_steps(
+        transcript: str, normalized: str, trigger_positions: list[int]
+    ) -> list[dict[str, str]]:
+        if len(normalized) != len(transcript):
+            # Lowercasing expanded some characters, so match offsets no longer line up
+            # with the original text; fall back to checking sentence by sentence.
+            triggered = filter(AnalysisService._has_trigger, AnalysisService._sentences(transcript))
+            return [AnalysisService._next_step(line) for _, line in zip(range(10), triggered)]
+
         tasks: list[dict[str, str]] = []
-        for line in lines:
-            lowered = line.lower()
-            if any(trigger in lowered for trigger in ('will', 'next', 'send', 'schedule', 'follow')):
-                owner = 'prospect' if 'you will' in lowered else 'rep'
-                tasks.append({'description': line, 'owner': owner, 'status': 'open'})
-        return tasks[:10]
+        sentence_end = -1
+        for position in trigger_positions:
+            if position < sentence_end:
+                continue
+            sentence_start = normalized.rfind('.', 0, position) + 1
+            sentence_end = normalized.find('.', position)
+            if sentence_end == -1:
+                sentence_end = len(normalized)
+            tasks.append(AnalysisService._next_step(transcript[sentence_start:sentence_end].strip()))
+            if len(tasks) == 10:
+                break
+        return tasks
+
+    @staticmethod
+    def _has_trigger(line: str) -> bool:
+        lowered = line.lower()
+        return any(trigger in lowered for trigger in NEXT_STEP_TRIGGERS)
+
+    @staticmethod
+    def _next_step(line: str) -> dict[str, str]:
+        owner = 'prospect' if 'you will' in line.lower() else 'rep'
+        return {'description': line, 'owner': owner, 'status': 'open'}
+
+    @staticmethod
+    def _sentences(transcript: str) -> Iterator[str]:
+        start = 0
+        while start <= len(transcript):
+            end = transcript.find('.', start)
+            if end == -1:
+                end = len(transcript)
+            line = transcript[start:end].strip()
+            if line:
+                yield line
+            start = end + 1
 
     @staticmethod
-    def _infer_call_type(normalized: str) -> str:
-        if 'demo' in normalized:
+    def _infer_call_type(phrases: Container[str]) -> str:
+        if 'demo' in phrases:
             return 'demo'
-        if 'proposal' in normalized or 'pricing' in normalized:
+        if 'proposal' in phrases or 'pricing' in phrases:
             return 'negotiation'
         return 'discovery'
 
     @staticmethod
-    def _infer_outcome(normalized: str) -> str:
-        if 'next week' in normalized or 'schedule' in normalized:
+    def _infer_outcome(phrases: Container[str]) -> str:
+        if 'next week' in phrases or 'schedule' in phrases:
             return 'next_step_confirmed'
-        if 'follow up' in normalized:
+        if 'follow up' in phrases:
             return 'follow_up_needed'
         return 'open'
 
     @staticmethod
-    def _extract_bant(normalized: str) -> dict[str, str]:
+    def _extract_bant(phrases: Container[str]) -> dict[str, str]:
         def status(keyword_set: set[str]) -> str:
-            return 'covered' if any(word in normalized for word in keyword_set) else 'missing'
+            return 'covered' if any(word in phrases for word in keyword_set) else 'missing'
 
-        return {
-            'budget': status({'budget', 'cost', 'price'}),
-            'authority': status({'decision maker', 'vp', 'director', 'cfo'}),
-            'need': status({'problem', 'need', 'challenge', 'pain'}),
-            'timeline': status({'timeline', 'quarter', 'month', 'deadline'}),
-        }
+        return {dimension: status(terms) for dimension, terms in BANT_TERMS.items()}
 
     @staticmethod
-    def _key_moments(normalized: str) -> list[str]:
-        checks = {
-            'budget_discussion': 'budget',
-            'timeline_mention': 'timeline',
-            'decision_maker': 'decision maker',
-            'pricing_conversation': 'price',
-            'demo_request': 'demo',
-            'contract_discussion': 'contract',
-        }
-        return [label for label, keyword in checks.items() if keyword in normalized]
+    def _key_moments(phrases: Container[str]) -> list[str]:
+        return [label for label, keyword in KEY_MOMENT_TERMS.items() if keyword in phrases]
 
     @staticmethod
-    def _detect_framework_cues(normalized: str) -> dict[str, str]:
+    def _detect_framework_cues(phrases: Container[str]) -> dict[str, str]:
         return {
-            'emotional_trigger': 'urgency' if 'urgent' in normalized else 'confidence',
-            'deal_risk_moment': 'pricing_pushback' if 'expensive' in normalized else 'none_detected',
+            'emotional_trigger': 'urgency' if 'urgent' in phrases else 'confidence',
+            'deal_risk_moment': 'pricing_pushback' if 'expensive' in phrases else 'none_detected',
         }
 
     @staticmethod
-    def _detect_competitive_cues(normalized: str) -> dict[str, str]:
-        competitor_mentioned = 'competitor' in normalized or 'alternative' in normalized
+    def _detect_competitive_cues(phrases: Container[str]) -> dict[str, str]:
+        competitor_mentioned = 'competitor' in phrases or 'alternative' in phrases
         return {
             'competitive_pressure': 'high' if competitor_mentioned else 'low',
             'recommended_posture': 'differentiate_on_roi' if competitor_mentioned else 'consultative',
@@ -153,8 +362,7 @@ class AnalysisService:
         return 'nurture'
 
     @staticmethod
-    def _generate_follow_up(transcript: str, summary: str) -> dict[str, Any]:
-        preview_points = [line.strip() for line in transcript.split('.') if line.strip()][:2]
+    def _generate_follow_up(summary: str, preview_points: list[str]) -> dict[str, Any]:
         email_body = (
             'Thanks again for the conversation today. '\
             f"Key themes we aligned on: {summary}. "
@@ -163,7 +371,7 @@ class AnalysisService:
             'Unsubscribe: {{dynamic_unsubscribe_link}}'
         )
         return {
-            'subject': 'Next steps from our sales strategy call',
+            'subject': DEFAULT_FOLLOW_UP_SUBJECT,
             'draft_body': email_body,
             'negative_reverse_sell_line': 'If this is not the right quarter, we can pause and revisit later.',
             'objection_neutralizer_line': 'If budget is tight, we can phase rollout to protect ROI early.',
@@ -181,3 +389,136 @@ class AnalysisService:
             ],
             'referenced_moments': preview_points,
         }
+
+
+class StreamingAnalyzer:
+    """Incremental ``AnalysisService.analyze`` over a transcript fed in chunks.
+
+    Keyword matching runs over overlapping windows: each window is the carried tail of
+    the previous one plus the new chunk, and only matches starting where every term
+    and its trailing token boundary fit inside the window are counted. The tail keeps
+    one extra character so the leading boundary of the next match is known.
+
+    The summary's words and the sentences are tracked incrementally: only the word or
+    sentence still being read is carried between chunks, and sentences only until the
+    two follow-up preview lines and ten next steps are found. Both carries are cut at
+    ``STREAM_BUFFER_CHARS``, so memory is bounded by the chunk size plus that limit;
+    below it the result is identical to ``analyze``.
+    """
+
+    def __init__(self) -> None:
+        self._scan = KeywordScan()
+        self._tail = ''
+        self._tail_start = 0
+        self._words: list[str] = []
+        self._word = ''
+        self._summary: str | None = None
+        self._sentence: list[str] = []
+        self._sentence_chars = 0
+        self._previews: list[str] = []
+        self._next_steps: list[dict[str, str]] = []
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._feed_summary(chunk)
+        self._feed_sentences(chunk)
+
+        window = self._tail + chunk.lower()
+        stop = len(window) - MATCHER.max_term_length
+        if stop > self._tail_start:
+            MATCHER.scan(window, self._tail_start, stop, self._scan)
+            self._tail = window[stop - 1 :]
+            self._tail_start = 1
+        else:
+            self._tail = window
+
+    def result(self) -> dict[str, Any]:
+        MATCHER.scan(self._tail, self._tail_start, len(self._tail), self._scan)
+        self._tail = ''
+        if self._sentence:
+            self._end_sentence()
+        summary = self._summary
+        if summary is None:
+            summary = ' '.join(self._words + [self._word] if self._word else self._words)
+        return AnalysisService._assemble(
+            self._scan.token_counts, self._scan.phrases, summary, self._next_steps, self._previews
+        )
+
+    def _feed_summary(self, chunk: str) -> None:
+        if self._summary is not None:
+            return
+        if self._word and chunk[0].isspace():
+            self._end_word(self._word)
+        for match in WORD.finditer(chunk):
+            if self._summary is not None:
+                return
+            word = match.group()
+            if match.start() == 0:
+                word = self._word + word
+            self._word = ''
+            if match.end() < len(chunk):
+                self._end_word(word)
+            else:
+                self._word = word[:STREAM_BUFFER_CHARS]
+
+    def _end_word(self, word: str) -> None:
+        # The summary is final once its last word is followed by whitespace.
+        self._words.append(word)
+        self._word = ''
+        if len(self._words) == SUMMARY_WORDS:
+            self._summary = ' '.join(self._words)
+            self._words = []
+
+    def _feed_sentences(self, chunk: str) -> None:
+        start = 0
+        while not self._collecting_done():
+            end = chunk.find('.', start)
+            if end == -1:
+                self._extend_sentence(chunk[start:])
+                return
+            self._extend_sentence(chunk[start:end])
+            self._end_sentence()
+            start = end + 1
+
+    def _extend_sentence(self, piece: str) -> None:
+        piece = piece[: STREAM_BUFFER_CHARS - self._sentence_chars]
+        if piece:
+            self._sentence.append(piece)
+            self._sentence_chars += len(piece)
+
+    def _end_sentence(self) -> None:
+        self._add_sentence(''.join(self._sentence))
+        self._sentence = []
+        self._sentence_chars = 0
+
+    def _add_sentence(self, sentence: str) -> None:
+        line = sentence.strip()
+        if not line:
+            return
+        if len(self._previews) < 2:
+            self._previews.append(line)
+        if len(self._next_steps) < 10 and AnalysisService._has_trigger(line):
+            self._next_steps.append(AnalysisService._next_step(line))
+
+    def _collecting_done(self) -> bool:
+        return len(self._previews) == 2 and len(self._next_steps) == 10
+
+
+class TermSearch:
+    """Which of ``terms`` occur, case-insensitively, in a text fed in chunks."""
+
+    def __init__(self, terms: Iterable[Any]) -> None:
+        self._pending = {str(term).lower() for term in terms} - {''}
+        self._keep = max(map(len, self._pending), default=1) - 1
+        self._tail = ''
+        self.found: set[str] = set()
+
+    def feed(self, chunk: str) -> None:
+        if not self._pending:
+            return
+        window = self._tail + chunk.lower()
+        hits = {term for term in self._pending if term in window}
+        self.found |= hits
+        self._pending -= hits
+        self._tail = window[max(0, len(window) - self._keep) :] if self._keep else ''
@@ -0,0 +1,106 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import Date, case, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.entities import Call, CallStatus, User
+
+
+class AnalyticsGroupBy(str, Enum):
+    REP = 'rep'
+    WEEK = 'week'
+    CALL_TYPE = 'call_type'
+
+
+def _week_start(dialect: str):
+    if dialect == 'sqlite':
+        # 'weekday 0' moves forward to Sunday; six days back is that week's Monday.
+        return func.date(Call.created_at, 'weekday 0', '-6 days')
+    return cast(func.date_trunc('week', Call.created_at), Date)
+
+
+def _state_count(state: str):
+    return func.sum(case((Call.conversation_state == state, 1), else_=0))
+
+
+def _aggregates() -> list:
+    return [
+        func.count(Call.id).label('calls'),
+        func.avg(Call.sentiment_score).label('avg_sentiment'),
+        func.avg(Call.buying_intent_score).label('avg_buying_intent'),
+        func.avg(Call.closing_probability).label('avg_closing_probability'),
+        func.avg(Call.engagement_score).label('avg_engagement'),
+        _state_count('hot').label('hot'),
+        _state_count('warm').label('warm'),
+        _state_count('nurture').label('nurture'),
+    ]
+
+
+def _key(value: Any) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _row(row: Any, key: str | None = None, label: str | None = None) -> dict[str, Any]:
+    def average(value: Any) -> float | None:
+        return round(float(value), 2) if value is not None else None
+
+    return {
+        'key': key,
+        'label': label,
+        'calls': row.calls,
+        'avg_sentiment': average(row.avg_sentiment),
+        'avg_buying_intent': average(row.avg_buying_intent),
+        'avg_closing_probability': average(row.avg_closing_probability),
+        'avg_engagement': average(row.avg_engagement),
+        'hot': row.hot or 0,
+        'warm': row.warm or 0,
+        'nurture': row.nurture or 0,
+    }
+
+
+class CallAnalyticsService:
+    """Aggregates over the score columns materialized from each call's analysis."""
+
+    @staticmethod
+    async def summarize(
+        db: AsyncSession,
+        organization_id: int,
+        group_by: AnalyticsGroupBy,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> dict[str, Any]:
+        filters = [Call.organization_id == organization_id, Call.status == CallStatus.ANALYZED]
+        if created_from is not None:
+            filters.append(Call.created_at >= created_from)
+        if created_to is not None:
+            filters.append(Call.created_at < created_to)
+
+        totals = (await db.execute(select(*_aggregates()).where(*filters))).one()
+
+        if group_by == AnalyticsGroupBy.REP:
+            key, label = Call.user_id, User.full_name
+            query = select(key, label, *_aggregates()).join(User, User.id == Call.user_id)
+            group_columns = (key, label)
+        else:
+            key = (
+                _week_start(db.get_bind().dialect.name)
+                if group_by == AnalyticsGroupBy.WEEK
+                else Call.call_type
+            )
+            query = select(key, *_aggregates())
+            group_columns = (key,)
+
+        result = await db.execute(
+            query.where(*filters).group_by(*group_columns).order_by(group_columns[0])
+        )
+        groups = []
+        for row in result.all():
+            group_key = _key(row[0])
+            label = row[1] if group_by == AnalyticsGroupBy.REP else group_key
+            groups.append(_row(row, group_key, label))
+
+        return {'group_by': group_by.value, 'totals': _row(totals), 'groups': groups}
@@ -0,0 +1,142 @@
+"""Split long recordings into overlapping segments and stitch their transcripts back.
+
+Cuts are placed in the quietest stretch shortly before each nominal boundary, so words
+are rarely split; each segment also starts ``overlap`` seconds early so a word that is
+cut still appears whole in one of the two neighbours. Overlapping words are removed
+again when the segment transcripts are joined.
+"""
+
+import string
+import sys
+import warnings
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+
+with warnings.catch_warnings():
+    # Deprecated since 3.11 and removed in 3.13, where ``audioop-lts`` provides it.
+    warnings.simplefilter('ignore', DeprecationWarning)
+    import audioop
+
+CHUNKABLE_SUFFIXES = {'.wav'}
+SILENCE_WINDOW_SECONDS = 0.02
+COPY_BLOCK_FRAMES = 64 * 1024
+MAX_OVERLAP_WORDS = 512
+
+
+@dataclass(frozen=True)
+class AudioSegment:
+    index: int
+    path: str
+    start_seconds: float
+    end_seconds: float
+
+
+def duration_seconds(file_path: str) -> float | None:
+    """Length of a chunkable recording, or ``None`` when it cannot be split locally."""
+    if Path(file_path).suffix.lower() not in CHUNKABLE_SUFFIXES:
+        return None
+    try:
+        with wave.open(file_path, 'rb') as audio:
+            return audio.getnframes() / audio.getframerate()
+    except (wave.Error, EOFError):
+        return None
+
+
+def _quietest_frame(audio: wave.Wave_read, start: int, stop: int) -> int:
+    """Centre of the lowest-energy window in ``[start, stop)``; ``stop`` for non-16-bit audio."""
+    if audio.getsampwidth() != 2 or stop <= start:
+        return stop
+    audio.setpos(start)
+    frames = audio.readframes(stop - start)
+    if sys.byteorder == 'big':
+        frames = audioop.byteswap(frames, 2)
+
+    frame_width = 2 * audio.getnchannels()
+    window = max(1, int(audio.getframerate() * SILENCE_WINDOW_SECONDS)) * frame_width
+    offsets = range(0, len(frames) - window + 1, window)
+    if not offsets:
+        return stop
+    view = memoryview(frames)
+    # ``min`` keeps the first of equally quiet windows.
+    quietest = min(offsets, key=lambda offset: audioop.rms(view[offset : offset + window], 2))
+    return start + (quietest + window // 2) // frame_width
+
+
+def plan_cuts(
+    audio: wave.Wave_read, chunk_seconds: float, search_seconds: float
+) -> list[int]:
+    """Frame positions where segments end, the last one being the end of the file."""
+    rate = audio.getframerate()
+    total = audio.getnframes()
+    chunk = max(1, int(chunk_seconds * rate))
+    search = int(search_seconds * rate)
+
+    cuts: list[int] = []
+    previous = 0
+    while previous + chunk < total:
+        nominal = previous + chunk
+        window_start = max(previous + chunk // 2, nominal - search)
+        previous = _quietest_frame(audio, window_start, nominal)
+        cuts.append(previous)
+    cuts.append(total)
+    return cuts
+
+
+def _copy_frames(audio: wave.Wave_read, target: Path, start: int, stop: int) -> None:
+    audio.setpos(start)
+    with wave.open(str(target), 'wb') as output:
+        output.setparams(audio.getparams())
+        frame_width = audio.getsampwidth() * audio.getnchannels()
+        remaining = stop - start
+        while remaining > 0:
+            frames = audio.readframes(min(COPY_BLOCK_FRAMES, remaining))
+            if not frames:
+                break
+            output.writeframes(frames)
+            # ``readframes`` may return fewer frames than asked for.
+            remaining -= len(frames) // frame_width
+
+
+def split_wav(
+    file_path: str,
+    directory: str,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float,
+) -> list[AudioSegment]:
+    """Write overlapping segments of ``file_path`` into ``directory``."""
+    segments: list[AudioSegment] = []
+    with wave.open(file_path, 'rb') as audio:
+        rate = audio.getframerate()
+        overlap = int(overlap_seconds * rate)
+        start = 0
+        for index, stop in enumerate(plan_cuts(audio, chunk_seconds, search_seconds)):
+            begin = max(0, start - overlap)
+            target = Path(directory) / f'segment_{index:05d}.wav'
+            _copy_frames(audio, target, begin, stop)
+            segments.append(AudioSegment(index, str(target), begin / rate, stop / rate))
+            start = stop
+    return segments
+
+
+def _normalized(word: str) -> str:
+    return word.strip(string.punctuation).lower()
+
+
+def merge_overlap(left: list[str], right: list[str]) -> list[str]:
+    """Join two word lists, dropping the longest prefix of ``right`` that ends ``left``."""
+    limit = min(len(left), len(right), MAX_OVERLAP_WORDS)
+    tail = [_normalized(word) for word in left[-limit:]] if limit else []
+    head = [_normalized(word) for word in right[:limit]]
+    for size in range(limit, 0, -1):
+        if tail[-size:] == head[:size]:
+            return left + right[size:]
+    return left + right
+
+
+def stitch(transcripts: list[str]) -> str:
+    words: list[str] = []
+    for transcript in transcripts:
+        words = merge_overlap(words, transcript.split())
+    return ' '.join(words)
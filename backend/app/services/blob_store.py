@@ -0,0 +1,519 @@
+"""Content-addressed storage for uploaded recordings and transcripts.
+
+Every distinct upload of an organization is stored once, under
+``<sha256>-<organization id>.<suffix>``, and the ``blobs`` row counts the calls
+referencing it. Identical bytes from two organizations are two blobs: one tenant's calls
+never point at an object another tenant uploaded. Objects are sharded two levels deep by
+the leading hex digits (``ab/cd/abcd….txt.gz``), so no directory holds more than a few
+thousand entries at any scale; text transcripts are gzipped on the way in.
+
+Blobs start in the hot tier (``BLOB_BACKEND``). ``BlobRetentionService`` moves them to
+the cold tier (``BLOB_COLD_BACKEND``) and releases call references according to the
+organization's ``subscription_tier``, then deletes objects nobody references anymore.
+Backends are the local filesystem or any S3-compatible API; ``tests/fakes/s3.py`` is an
+in-memory stand-in for the latter.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import hmac
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path, PurePosixPath
+from typing import Any
+from urllib.parse import quote
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import bindparam, case, delete, literal, null, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings, get_settings
+from app.models.entities import Blob, BlobTier, Call, Organization, Timestamp
+from app.services.transcription import COMPRESSED_SUFFIX, TEXT_SUFFIXES
+
+# Tests and local tooling can route S3 traffic to an in-process app.
+client_transport: httpx.AsyncBaseTransport | None = None
+
+IDENTITY = 'identity'
+GZIP = 'gzip'
+BLOB_URI_PREFIX = 'blob://'
+COPY_CHUNK_BYTES = 1024 * 1024
+UNSIGNED_PAYLOAD = 'UNSIGNED-PAYLOAD'
+
+
+class BlobStoreError(Exception):
+    pass
+
+
+def blob_key(organization_id: int, content_hash: str, suffix: str) -> str:
+    # The suffix decides how the bytes are transcribed, so it is part of the identity.
+    suffix = ''.join(ch for ch in suffix.lower() if ch.isalnum())[:16]
+    key = f'{content_hash}-{organization_id}'
+    return f'{key}.{suffix}' if suffix else key
+
+
+def object_name(key: str, codec: str) -> str:
+    name = f'{key[:2]}/{key[2:4]}/{key}'
+    return f'{name}{COMPRESSED_SUFFIX}' if codec == GZIP else name
+
+
+def _codec_for(key: str) -> str:
+    return GZIP if PurePosixPath(key).suffix in TEXT_SUFFIXES else IDENTITY
+
+
+def _gzip_file(source: Path, level: int) -> Path:
+    target = source.with_name(f'{source.name}{COMPRESSED_SUFFIX}')
+    with source.open('rb') as raw, target.open('wb') as handle:
+        # No file name or mtime in the header: equal content compresses to equal bytes.
+        with gzip.GzipFile(
+            filename='', mode='wb', fileobj=handle, compresslevel=level, mtime=0
+        ) as packed:
+            shutil.copyfileobj(raw, packed, COPY_CHUNK_BYTES)
+    return target
+
+
+async def _file_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open('rb') as handle:
+        while chunk := handle.read(COPY_CHUNK_BYTES):
+            yield chunk
+
+
+class BlobBackend(ABC):
+    """Where a tier keeps its objects; ``name`` is a relative, sharded object name."""
+
+    @abstractmethod
+    async def put(self, name: str, source: Path) -> None:
+        """Store ``source`` as ``name``, consuming the file."""
+
+    @abstractmethod
+    async def fetch(self, name: str, destination: Path) -> None:
+        """Copy the object to the local file ``destination``."""
+
+    @abstractmethod
+    async def exists(self, name: str) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, name: str) -> None:
+        """Remove the object; deleting a missing object is not an error."""
+
+    def local_path(self, name: str) -> Path | None:
+        """The object's path when it can be read in place, else ``None``."""
+        return None
+
+
+class LocalBlobBackend(BlobBackend):
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def local_path(self, name: str) -> Path:
+        return self.root / name
+
+    async def put(self, name: str, source: Path) -> None:
+        destination = self.root / name
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        # A rename when ``source`` is on the same filesystem, so readers never see a
+        # partially written object.
+        await asyncio.to_thread(shutil.move, source, destination)
+
+    async def fetch(self, name: str, destination: Path) -> None:
+        await asyncio.to_thread(shutil.copyfile, self.root / name, destination)
+
+    async def exists(self, name: str) -> bool:
+        return (self.root / name).is_file()
+
+    async def delete(self, name: str) -> None:
+        (self.root / name).unlink(missing_ok=True)
+
+
+class S3BlobBackend(BlobBackend):
+    """Path-style S3 object API (PUT, GET, HEAD, DELETE) signed with AWS Signature V4."""
+
+    def __init__(self, settings: Settings, storage_class: str = '') -> None:
+        self.endpoint = settings.s3_endpoint_url.rstrip('/')
+        self.host = httpx.URL(self.endpoint).netloc.decode('ascii')
+        self.region = settings.s3_region
+        self.bucket = settings.s3_bucket
+        self.access_key = settings.s3_access_key
+        self.secret_key = settings.s3_secret_key
+        self.storage_class = storage_class
+        self.timeout = settings.s3_timeout_seconds
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.endpoint, transport=client_transport, timeout=self.timeout
+        )
+
+    def _path(self, name: str) -> str:
+        return quote(f'/{self.bucket}/{name}')
+
+    def _signed(
+        self, method: str, path: str, headers: dict[str, str] | None = None
+    ) -> dict[str, str]:
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        scope = f'{amz_date[:8]}/{self.region}/s3/aws4_request'
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        headers.update(
+            {'host': self.host, 'x-amz-content-sha256': UNSIGNED_PAYLOAD, 'x-amz-date': amz_date}
+        )
+        names = sorted(headers)
+        signed_headers = ';'.join(names)
+        canonical_request = '\n'.join(
+            [
+                method,
+                path,
+                '',
+                *(f'{name}:{headers[name].strip()}' for name in names),
+                '',
+                signed_headers,
+                UNSIGNED_PAYLOAD,
+            ]
+        )
+        string_to_sign = '\n'.join(
+            [
+                'AWS4-HMAC-SHA256',
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+        key = f'AWS4{self.secret_key}'.encode()
+        for part in (amz_date[:8], self.region, 's3', 'aws4_request'):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        headers['authorization'] = (
+            f'AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, '
+            f'SignedHeaders={signed_headers}, Signature={signature}'
+        )
+        return headers
+
+    @staticmethod
+    def _check(response: httpx.Response, method: str, name: str, *allowed: int) -> None:
+        if response.status_code not in {200, *allowed}:
+            raise BlobStoreError(f'S3 {method} {name} failed with HTTP {response.status_code}')
+
+    async def put(self, name: str, source: Path) -> None:
+        path = self._path(name)
+        headers = {'content-length': str(source.stat().st_size)}
+        if self.storage_class:
+            headers['x-amz-storage-class'] = self.storage_class
+        try:
+            async with self._client() as client:
+                response = await client.put(
+                    path, content=_file_chunks(source), headers=self._signed('PUT', path, headers)
+                )
+            self._check(response, 'PUT', name)
+        finally:
+            source.unlink(missing_ok=True)
+
+    async def fetch(self, name: str, destination: Path) -> None:
+        path = self._path(name)
+        async with self._client() as client:
+            async with client.stream('GET', path, headers=self._signed('GET', path)) as response:
+                self._check(response, 'GET', name)
+                with destination.open('wb') as handle:
+                    async for chunk in response.aiter_bytes(COPY_CHUNK_BYTES):
+                        handle.write(chunk)
+
+    async def exists(self, name: str) -> bool:
+        path = self._path(name)
+        async with self._client() as client:
+            response = await client.head(path, headers=self._signed('HEAD', path))
+        self._check(response, 'HEAD', name, 404)
+        return response.status_code == 200
+
+    async def delete(self, name: str) -> None:
+        path = self._path(name)
+        async with self._client() as client:
+            response = await client.delete(path, headers=self._signed('DELETE', path))
+        self._check(response, 'DELETE', name, 204, 404)
+
+
+class BlobStore:
+    """Reference-counted uploads; see the module docstring for the layout."""
+
+    @staticmethod
+    def backend(tier: BlobTier) -> BlobBackend:
+        settings = get_settings()
+        kind = settings.blob_backend if tier == BlobTier.HOT else settings.blob_cold_backend
+        if kind == 's3':
+            storage_class = settings.s3_cold_storage_class if tier == BlobTier.COLD else ''
+            return S3BlobBackend(settings, storage_class)
+        if kind == 'local':
+            if tier == BlobTier.HOT:
+                return LocalBlobBackend(Path(settings.storage_path) / 'blobs')
+            return LocalBlobBackend(Path(settings.blob_cold_path))
+        raise BlobStoreError(f'No backend configured for the {tier.value} tier')
+
+    @staticmethod
+    def incoming_path() -> Path:
+        """A fresh path to stream an upload to before it is hashed and ingested."""
+        return Path(get_settings().storage_path) / 'incoming' / uuid4().hex
+
+    @staticmethod
+    async def ingest(
+        db: AsyncSession, source: Path, organization_id: int, content_hash: str, suffix: str
+    ) -> Blob:
+        """Add a reference to the organization's blob holding ``source``'s content, storing
+        it if new.
+
+        ``source`` is consumed either way. Before any object is written, a pending row
+        (no references, released now) is committed on its own connection; the reference
+        is then taken in the caller's transaction. Should the caller roll back, the row
+        stays unreferenced and garbage collection deletes the object after the grace
+        period. While the caller's transaction is open, its row lock keeps collection off
+        the blob.
+        """
+        try:
+            key = blob_key(organization_id, content_hash, suffix)
+            now = datetime.now(timezone.utc)
+            dialect = db.get_bind().dialect.name
+            insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            row = {
+                'key': key,
+                'codec': _codec_for(key),
+                'tier': BlobTier.HOT,
+                'size': source.stat().st_size,
+                'stored_size': 0,
+                'last_referenced_at': now,
+            }
+            pending = (
+                insert(Blob)
+                .values(**row, ref_count=0, released_at=now)
+                # An unreferenced blob restarts its grace period instead of being collected
+                # under the upload.
+                .on_conflict_do_update(
+                    index_elements=[Blob.key],
+                    set_={'released_at': now},
+                    where=Blob.ref_count <= 0,
+                )
+            )
+            async with db.bind.begin() as connection:
+                await connection.execute(pending)
+            upsert = (
+                insert(Blob)
+                .values(**row, ref_count=1)
+                .on_conflict_do_update(
+                    index_elements=[Blob.key],
+                    set_={
+                        'ref_count': Blob.ref_count + 1,
+                        'last_referenced_at': now,
+                        'released_at': None,
+                    },
+                )
+                .returning(Blob)
+            )
+            result = await db.execute(upsert, execution_options={'populate_existing': True})
+            blob = result.scalar_one()
+            name = object_name(blob.key, blob.codec)
+            if not await BlobStore.backend(blob.tier).exists(name):
+                hot = BlobStore.backend(BlobTier.HOT)
+                blob.stored_size = await BlobStore._put(hot, name, source, blob.codec)
+                blob.tier = BlobTier.HOT
+            return blob
+        finally:
+            source.unlink(missing_ok=True)
+
+    @staticmethod
+    async def _put(backend: BlobBackend, name: str, source: Path, codec: str) -> int:
+        staged = source
+        if codec == GZIP:
+            staged = await asyncio.to_thread(_gzip_file, source, get_settings().blob_gzip_level)
+        try:
+            stored_size = staged.stat().st_size
+            await backend.put(name, staged)
+        finally:
+            staged.unlink(missing_ok=True)
+        return stored_size
+
+    @staticmethod
+    @asynccontextmanager
+    async def local_file(db: AsyncSession, call: Call) -> AsyncIterator[str]:
+        """A local path to the call's upload, downloaded to a temporary file if need be."""
+        if call.blob_key is None:
+            if call.file_path.startswith(BLOB_URI_PREFIX):
+                raise BlobStoreError(f'The upload of call {call.id} was released by retention')
+            # Stored before the blob store, at its own path.
+            yield call.file_path
+            return
+
+        blob = await db.get(Blob, call.blob_key)
+        backend = BlobStore.backend(blob.tier)
+        name = object_name(blob.key, blob.codec)
+        path = backend.local_path(name)
+        if path is not None:
+            yield str(path)
+            return
+        with tempfile.TemporaryDirectory(prefix='blob-') as directory:
+            destination = Path(directory) / PurePosixPath(name).name
+            await backend.fetch(name, destination)
+            yield str(destination)
+
+
+def _policy_cutoff(policy: dict[str, dict[str, int]], step: str, now: datetime) -> Any:
+    """Per-tier ``created_at`` cutoff for ``step``, or ``None`` when no tier uses it."""
+    cutoffs = {
+        tier: literal(now - timedelta(days=rules[step]), Timestamp)
+        for tier, rules in policy.items()
+        if rules.get(step, 0) > 0
+    }
+    if not cutoffs:
+        return None
+    return case(cutoffs, value=Organization.subscription_tier, else_=null())
+
+
+class BlobRetentionService:
+    """Applies ``BLOB_RETENTION_POLICY`` in three bounded, resumable steps.
+
+    1. Calls older than their tier's ``delete_after_days`` drop their blob reference
+       (the transcript and analysis stay).
+    2. Hot blobs whose every reference is older than its tier's ``cold_after_days``
+       move to the cold backend.
+    3. Blobs unreferenced for ``BLOB_GC_GRACE_HOURS`` are deleted, row first, including
+       the pending rows of uploads that rolled back.
+    """
+
+    @staticmethod
+    async def run(db: AsyncSession, now: datetime | None = None) -> dict[str, int]:
+        now = now or datetime.now(timezone.utc)
+        return {
+            'released': await BlobRetentionService._release_expired(db, now),
+            'moved_to_cold': await BlobRetentionService._move_to_cold(db, now),
+            'deleted': await BlobRetentionService._collect(db, now),
+        }
+
+    @staticmethod
+    async def _release_expired(db: AsyncSession, now: datetime) -> int:
+        settings = get_settings()
+        cutoff = _policy_cutoff(settings.blob_retention_policy, 'delete_after_days', now)
+        if cutoff is None:
+            return 0
+        blobs = Blob.__table__
+        remaining = blobs.c.ref_count - bindparam('released')
+        release = (
+            update(blobs)
+            .where(blobs.c.key == bindparam('blob_key'))
+            .values(
+                ref_count=remaining,
+                released_at=case(
+                    (remaining <= 0, literal(now, Timestamp)), else_=blobs.c.released_at
+                ),
+            )
+        )
+        released = 0
+        while True:
+            query = (
+                select(Call.id, Call.blob_key)
+                .join(Organization, Organization.id == Call.organization_id)
+                .where(Call.blob_key.is_not(None), Call.created_at < cutoff)
+                .order_by(Call.id)
+                .limit(settings.blob_retention_batch_size)
+            )
+            if db.get_bind().dialect.name == 'postgresql':
+                # Concurrent runs take disjoint calls instead of releasing a reference twice.
+                query = query.with_for_update(skip_locked=True, of=Call)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+            await db.execute(
+                update(Call).where(Call.id.in_([row.id for row in rows])).values(blob_key=None)
+            )
+            counts = Counter(row.blob_key for row in rows)
+            await db.execute(
+                release, [{'blob_key': key, 'released': count} for key, count in counts.items()]
+            )
+            await db.commit()
+            released += len(rows)
+        return released
+
+    @staticmethod
+    async def _move_to_cold(db: AsyncSession, now: datetime) -> int:
+        settings = get_settings()
+        policy = settings.blob_retention_policy
+        cutoff = _policy_cutoff(policy, 'cold_after_days', now)
+        if not settings.blob_cold_backend or cutoff is None:
+            return 0
+        # A blob referenced since the shortest cold_after_days has a call too recent to move.
+        shortest = min(
+            days for rules in policy.values() if (days := rules.get('cold_after_days', 0)) > 0
+        )
+        still_hot = (
+            select(Call.id)
+            .join(Organization, Organization.id == Call.organization_id)
+            .where(Call.blob_key == Blob.key, or_(cutoff.is_(None), Call.created_at >= cutoff))
+            .exists()
+        )
+        hot, cold = BlobStore.backend(BlobTier.HOT), BlobStore.backend(BlobTier.COLD)
+        moved = 0
+        while True:
+            query = (
+                select(Blob)
+                .where(
+                    Blob.tier == BlobTier.HOT,
+                    Blob.ref_count > 0,
+                    Blob.last_referenced_at < now - timedelta(days=shortest),
+                    ~still_hot,
+                )
+                .order_by(Blob.last_referenced_at, Blob.key)
+                .limit(settings.blob_retention_batch_size)
+            )
+            if db.get_bind().dialect.name == 'postgresql':
+                query = query.with_for_update(skip_locked=True, of=Blob)
+            blobs = (await db.execute(query)).scalars().all()
+            if not blobs:
+                break
+            names = [object_name(blob.key, blob.codec) for blob in blobs]
+            with tempfile.TemporaryDirectory(prefix='blob-') as directory:
+                for blob, name in zip(blobs, names):
+                    staged = Path(directory) / PurePosixPath(name).name
+                    await hot.fetch(name, staged)
+                    await cold.put(name, staged)
+                    blob.tier = BlobTier.COLD
+            await db.commit()
+            # Only once the rows point at the cold copies.
+            for name in names:
+                await hot.delete(name)
+            moved += len(blobs)
+        return moved
+
+    @staticmethod
+    async def _collect(db: AsyncSession, now: datetime) -> int:
+        settings = get_settings()
+        grace = now - timedelta(hours=settings.blob_gc_grace_hours)
+        deleted = 0
+        while True:
+            query = (
+                select(Blob.key)
+                .where(Blob.ref_count <= 0, Blob.released_at < grace)
+                .order_by(Blob.released_at, Blob.key)
+                .limit(settings.blob_retention_batch_size)
+            )
+            if db.get_bind().dialect.name == 'postgresql':
+                # Locked rows are skipped; an upload re-referencing one waits for this commit.
+                query = query.with_for_update(skip_locked=True)
+            # Deleting the rows first takes their locks (on SQLite, the database write lock)
+            # before any object goes, and re-checks ref_count under them: an upload that
+            # referenced a blob since it was selected keeps it, one that comes after waits
+            # for this commit and stores the object again.
+            claim = (
+                delete(Blob)
+                .where(Blob.key.in_(query.scalar_subquery()), Blob.ref_count <= 0)
+                .returning(Blob.key, Blob.codec, Blob.tier)
+                .execution_options(synchronize_session=False)
+            )
+            blobs = (await db.execute(claim)).all()
+            if not blobs:
+                break
+            for blob in blobs:
+                await BlobStore.backend(blob.tier).delete(object_name(blob.key, blob.codec))
+            await db.commit()
+            deleted += len(blobs)
+        return deleted
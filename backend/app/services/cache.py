@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from threading import Lock
+from time import monotonic
+from typing import Generic, TypeVar
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe LRU map bounded by entry count, with hit/miss counters.
+
+    With ``ttl_seconds`` set, entries also expire that long after they were written.
+    With ``max_bytes`` set, ``weigh`` gives each value's size and the least recently
+    used entries are evicted until the total fits; a value larger than the whole
+    budget is not stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float | None = None,
+        max_bytes: int | None = None,
+        weigh: Callable[[V], int] | None = None,
+    ) -> None:
+        if max_bytes is not None and weigh is None:
+            raise ValueError('max_bytes needs a weigh function')
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.weigh = weigh
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bytes = 0
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._expires: dict[K, float] = {}
+        self._sizes: dict[K, int] = {}
+        self._lock = Lock()
+
+    def _discard(self, key: K) -> V | None:
+        self._expires.pop(key, None)
+        self.bytes -= self._sizes.pop(key, 0)
+        return self._data.pop(key, None)
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return None
+            if key in self._expires and self._expires[key] <= monotonic():
+                self._discard(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        size = self.weigh(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._discard(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = value
+            if self.max_bytes is not None:
+                self._sizes[key] = size
+                self.bytes += size
+            if self.ttl_seconds:
+                self._expires[key] = monotonic() + self.ttl_seconds
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                self._discard(next(iter(self._data)))
+                self.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        with self._lock:
+            return self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            self._sizes.clear()
+            self.hits = self.misses = self.evictions = self.expirations = self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            stats = {
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+            if self.max_bytes is not None:
+                stats.update(bytes=self.bytes, max_bytes=self.max_bytes)
+            return stats
@@ -0,0 +1,120 @@
+from collections.abc import Collection, Mapping
+from typing import Any
+
+import orjson
+from sqlalchemy import Select, Text, cast, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.compression import decompress_text
+from app.models.entities import CallAnalysisSection, CallTranscript
+from app.services.cache import LRUCache
+
+EMPTY_ANALYSIS_JSON = b'{}'
+
+
+class CallContentService:
+    """Read-only bulk access to the transcripts and analyses of many calls.
+
+    ``Call.transcript`` and ``Call.analysis`` go through one ORM object per transcript
+    and per analysis section; pages of calls read plain rows here instead, with each
+    call's sections folded into one JSON document by the database.
+    """
+
+    _analysis_json: LRUCache[tuple[int, int], bytes] | None = None
+
+    @staticmethod
+    async def transcripts(db: AsyncSession, call_ids: Collection[int]) -> dict[int, str]:
+        if not call_ids:
+            return {}
+        result = await db.execute(
+            select(CallTranscript.call_id, CallTranscript.codec, CallTranscript.content).where(
+                CallTranscript.call_id.in_(call_ids)
+            )
+        )
+        return {call_id: decompress_text(codec, content) for call_id, codec, content in result}
+
+    @staticmethod
+    def _documents(
+        db: AsyncSession, call_ids: Collection[int], sections: Collection[str] | None = None
+    ) -> Select:
+        """``(call_id, analysis JSON text)`` for the calls that have sections."""
+        conditions = [CallAnalysisSection.call_id.in_(call_ids)]
+        if sections is not None:
+            conditions.append(CallAnalysisSection.section.in_(sections))
+
+        if db.get_bind().dialect.name == 'postgresql':
+            document = func.json_object_agg(
+                CallAnalysisSection.section,
+                aggregate_order_by(CallAnalysisSection.payload, CallAnalysisSection.position),
+            )
+            return (
+                select(CallAnalysisSection.call_id, cast(document, Text))
+                .where(*conditions)
+                .group_by(CallAnalysisSection.call_id)
+            )
+
+        # SQLite only accepts ORDER BY inside an aggregate from 3.44; before that its
+        # aggregates take rows in the order of the subquery they read from.
+        ordered = (
+            select(
+                CallAnalysisSection.call_id,
+                CallAnalysisSection.section,
+                CallAnalysisSection.payload,
+            )
+            .where(*conditions)
+            .order_by(CallAnalysisSection.call_id, CallAnalysisSection.position)
+            .subquery()
+        )
+        document = func.json_group_object(ordered.c.section, func.json(ordered.c.payload))
+        return select(ordered.c.call_id, cast(document, Text)).group_by(ordered.c.call_id)
+
+    @staticmethod
+    async def analyses(
+        db: AsyncSession, call_ids: Collection[int], sections: Collection[str] | None = None
+    ) -> dict[int, dict[str, Any]]:
+        """Each call's analysis, or only ``sections`` of it; calls without one are left out."""
+        if not call_ids or sections is not None and not sections:
+            return {}
+        result = await db.execute(CallContentService._documents(db, call_ids, sections))
+        return {call_id: orjson.loads(document) for call_id, document in result}
+
+    @classmethod
+    def _json_cache(cls) -> LRUCache[tuple[int, int], bytes]:
+        if cls._analysis_json is None:
+            cls._analysis_json = LRUCache(get_settings().analysis_json_cache_entries)
+        return cls._analysis_json
+
+    @classmethod
+    async def analysis_json(
+        cls, db: AsyncSession, revisions: Mapping[int, int]
+    ) -> dict[int, bytes]:
+        """Each call's analysis as JSON bytes, ready to embed in a response unparsed.
+
+        ``revisions`` maps call ids to their ``analysis_revision``. Documents are cached
+        per revision, so an analysis rewritten by another process is never served stale;
+        only the calls missing from the cache are read, already serialized, from the
+        database.
+        """
+        cache = cls._json_cache()
+        documents: dict[int, bytes] = {}
+        missing = []
+        for call_id, revision in revisions.items():
+            document = cache.get((call_id, revision))
+            if document is None:
+                missing.append(call_id)
+            else:
+                documents[call_id] = document
+        if missing:
+            result = await db.execute(CallContentService._documents(db, missing))
+            fetched = {call_id: document.encode() for call_id, document in result}
+            for call_id in missing:
+                document = fetched.get(call_id, EMPTY_ANALYSIS_JSON)
+                cache.put((call_id, revisions[call_id]), document)
+                documents[call_id] = document
+        return documents
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._analysis_json = None
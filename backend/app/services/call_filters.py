@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import ColumnElement, func, literal, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.entities import Call, CallAnalysisSection
+
+
+class BantStatus(str, Enum):
+    COVERED = 'covered'
+    MISSING = 'missing'
+
+
+ARRAY_FIELDS = ('objections', 'pain_points', 'key_moments')
+
+
+@dataclass
+class AnalysisFilters:
+    """Filters over a call's analysis; list fields match calls containing every value."""
+
+    bant: dict[str, BantStatus] = field(default_factory=dict)
+    objections: list[str] = field(default_factory=list)
+    pain_points: list[str] = field(default_factory=list)
+    key_moments: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.bant or any(getattr(self, name) for name in ARRAY_FIELDS))
+
+    def containment(self) -> dict[str, Any]:
+        document: dict[str, Any] = {}
+        if self.bant:
+            document['bant'] = {name: status.value for name, status in self.bant.items()}
+        for name in ARRAY_FIELDS:
+            if getattr(self, name):
+                document[name] = getattr(self, name)
+        return document
+
+
+def _section_exists(name: str, *conditions: ColumnElement[bool]) -> ColumnElement[bool]:
+    return (
+        select(literal(1))
+        .where(
+            CallAnalysisSection.call_id == Call.id,
+            CallAnalysisSection.section == name,
+            *conditions,
+        )
+        .exists()
+    )
+
+
+def _json_each_contains(value: str) -> ColumnElement[bool]:
+    elements = func.json_each(CallAnalysisSection.payload).table_valued('value')
+    return select(literal(1)).select_from(elements).where(elements.c.value == value).exists()
+
+
+def analysis_conditions(filters: AnalysisFilters, dialect: str) -> list[ColumnElement[bool]]:
+    """WHERE clauses for ``filters``, one EXISTS per analysis section involved.
+
+    Postgres tests each section with one ``payload @> ...`` containment, which the
+    ``jsonb_path_ops`` GIN index on ``call_analysis_sections`` answers directly. Other
+    databases fall back to JSON1 lookups on the call's section row.
+    """
+    if not filters:
+        return []
+    if dialect == 'postgresql':
+        return [
+            _section_exists(name, type_coerce(CallAnalysisSection.payload, JSONB).contains(value))
+            for name, value in filters.containment().items()
+        ]
+
+    conditions = []
+    if filters.bant:
+        conditions.append(
+            _section_exists(
+                'bant',
+                *(
+                    func.json_extract(CallAnalysisSection.payload, f'$.{name}') == status.value
+                    for name, status in filters.bant.items()
+                ),
+            )
+        )
+    for name in ARRAY_FIELDS:
+        values = getattr(filters, name)
+        if values:
+            conditions.append(
+                _section_exists(name, *(_json_each_contains(value) for value in values))
+            )
+    return conditions
@@ -0,0 +1,179 @@
+import copy
+import hashlib
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import orjson
+from sqlalchemy import delete, func, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.entities import ContentCacheEntry
+from app.services.cache import LRUCache
+
+ANALYSIS = 'analysis'
+UPLOAD = 'upload'
+# Hits refresh ``last_hit_at`` at most this often, so repeated hits do not write every time.
+LAST_HIT_RESOLUTION = timedelta(minutes=10)
+
+
+def payload_size(payload: dict[str, Any]) -> int:
+    return len(orjson.dumps(payload))
+
+
+def transcript_hash(transcript: str) -> str:
+    return hashlib.sha256(transcript.encode('utf-8')).hexdigest()
+
+
+def analysis_key(organization_id: int, digest: str) -> str:
+    """Key of the analysis of the transcript whose ``transcript_hash`` is ``digest``."""
+    return f'{organization_id}:{digest}'
+
+
+def upload_key(organization_id: int, content_hash: str, suffix: str) -> str:
+    # The suffix decides how a blob is transcribed, so identical bytes uploaded
+    # under different extensions are kept apart.
+    return f'{organization_id}:{content_hash}:{suffix.lower()}'
+
+
+class ContentCacheService:
+    """Content-hash keyed cache of stored blobs, transcripts and analysis results.
+
+    Keys are scoped to the organization, so an upload only ever reuses work done for
+    its own tenant and a hit reveals nothing about other tenants' content.
+
+    Entries live in a per-process LRU and, when ``content_cache_persistent`` is on,
+    in the ``content_cache`` table so other replicas and workers share them. Both are
+    bounded in bytes: the LRUs by ``CONTENT_CACHE_MAX_MB`` each, the table by ``trim``,
+    which drops the least recently hit rows. Hit and miss counters are kept per
+    organization for the same reason as the keys.
+    """
+
+    _caches: dict[str, LRUCache[str, dict[str, Any]]] = {}
+    _counters: dict[tuple[int, str], Counter[str]] = defaultdict(Counter)
+
+    @classmethod
+    def _cache(cls, kind: str) -> LRUCache[str, dict[str, Any]]:
+        if kind not in cls._caches:
+            settings = get_settings()
+            cls._caches[kind] = LRUCache(
+                settings.content_cache_entries,
+                max_bytes=settings.content_cache_max_mb * 1024 * 1024,
+                weigh=payload_size,
+            )
+        return cls._caches[kind]
+
+    @classmethod
+    async def get(
+        cls, db: AsyncSession, kind: str, organization_id: int, key: str
+    ) -> dict[str, Any] | None:
+        cache = cls._cache(kind)
+        counters = cls._counters[(organization_id, kind)]
+        payload = cache.get(key)
+        if payload is None and get_settings().content_cache_persistent:
+            entry = ContentCacheEntry.__table__.c
+            found = (entry.kind == kind) & (entry.cache_key == key)
+            now = datetime.now(timezone.utc)
+            stale = or_(entry.last_hit_at.is_(None), entry.last_hit_at < now - LAST_HIT_RESOLUTION)
+            result = await db.execute(select(entry.payload, stale).where(found))
+            row = result.one_or_none()
+            if row is not None:
+                payload, touch = row
+                counters['persistent_hits'] += 1
+                cache.put(key, payload)
+                if touch:
+                    await db.execute(
+                        update(ContentCacheEntry).where(found).values(last_hit_at=now)
+                    )
+        counters['hits' if payload is not None else 'misses'] += 1
+        return copy.deepcopy(payload) if payload is not None else None
+
+    @classmethod
+    async def put(cls, db: AsyncSession, kind: str, key: str, payload: dict[str, Any]) -> None:
+        cls._cache(kind).put(key, copy.deepcopy(payload))
+        if not get_settings().content_cache_persistent:
+            return
+        dialect = db.bind.dialect.name
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        await db.execute(
+            insert(ContentCacheEntry)
+            .values(
+                kind=kind,
+                cache_key=key,
+                payload=payload,
+                size_bytes=payload_size(payload),
+                last_hit_at=datetime.now(timezone.utc),
+            )
+            .on_conflict_do_nothing()
+        )
+
+    @staticmethod
+    async def trim(db: AsyncSession, max_bytes: int, batch_size: int = 500) -> int:
+        """Delete the least recently hit ``content_cache`` rows until the table fits
+        ``max_bytes``; returns how many were deleted. One transaction per batch."""
+        entry = ContentCacheEntry
+        total = await db.scalar(select(func.coalesce(func.sum(entry.size_bytes), 0)))
+        excess = total - max_bytes
+        deleted = 0
+        while excess > 0:
+            result = await db.execute(
+                select(entry.kind, entry.cache_key, entry.size_bytes)
+                .order_by(entry.last_hit_at, entry.created_at)
+                .limit(batch_size)
+            )
+            victims = []
+            for kind, key, size in result:
+                if excess <= 0:
+                    break
+                victims.append((kind, key))
+                excess -= size
+            if not victims:
+                break
+            await db.execute(
+                delete(entry).where(tuple_(entry.kind, entry.cache_key).in_(victims))
+            )
+            await db.commit()
+            deleted += len(victims)
+        return deleted
+
+    @classmethod
+    async def get_upload(
+        cls, db: AsyncSession, organization_id: int, key: str
+    ) -> dict[str, Any] | None:
+        return await cls.get(db, UPLOAD, organization_id, key)
+
+    @classmethod
+    async def put_upload(cls, db: AsyncSession, key: str, transcript: str) -> None:
+        if len(transcript) > get_settings().content_cache_max_transcript_kb * 1024:
+            return
+        await cls.put(db, UPLOAD, key, {'transcript': transcript})
+
+    @classmethod
+    async def get_analysis(
+        cls, db: AsyncSession, organization_id: int, digest: str
+    ) -> dict[str, Any] | None:
+        return await cls.get(db, ANALYSIS, organization_id, analysis_key(organization_id, digest))
+
+    @classmethod
+    async def put_analysis(
+        cls, db: AsyncSession, organization_id: int, digest: str, analysis: dict[str, Any]
+    ) -> None:
+        await cls.put(db, ANALYSIS, analysis_key(organization_id, digest), analysis)
+
+    @classmethod
+    def stats(cls, organization_id: int) -> dict[str, dict[str, int]]:
+        """The organization's own lookups; cache sizes span tenants and are not reported."""
+        return {
+            kind: {
+                name: cls._counters.get((organization_id, kind), {}).get(name, 0)
+                for name in ('hits', 'misses', 'persistent_hits')
+            }
+            for kind in (UPLOAD, ANALYSIS)
+        }
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._caches.clear()
+        cls._counters.clear()
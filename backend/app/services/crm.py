@@ -0,0 +1,134 @@
+"""CRM adapter used by the outbox drain.
+
+Records go out through one batch request, ``POST /v1/records/batch``, carrying up to
+``CRM_BATCH_SIZE`` records and answered with one result per record. Every record has a
+stable ``ref`` (the call id), so a CRM that upserts by ref makes retried batches
+harmless. ``tests/fakes/crm.py`` is a local stand-in speaking the same protocol.
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import httpx
+
+from app.core.config import Settings
+
+# Tests and local tooling can route CRM traffic to an in-process app.
+client_transport: httpx.AsyncBaseTransport | None = None
+
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Used when an organization has not configured ``crm_field_mapping``.
+DEFAULT_FIELD_MAPPING = {
+    'call_id': 'call_id',
+    'file_name': 'call_name',
+    'created_at': 'call_date',
+    'rep_email': 'owner_email',
+    'call_type': 'call_type',
+    'conversation_state': 'lead_temperature',
+    'closing_probability': 'close_probability',
+    'executive_summary.overview': 'summary',
+}
+CALL_SOURCE_FIELDS = (
+    'file_name',
+    'sentiment_score',
+    'buying_intent_score',
+    'closing_probability',
+    'engagement_score',
+    'conversation_state',
+    'call_type',
+)
+
+
+class CrmError(Exception):
+    """The whole batch failed and should be retried later."""
+
+
+@dataclass(frozen=True)
+class CrmRecordResult:
+    ref: str
+    external_id: str | None = None
+    error: str | None = None
+
+
+def _analysis_value(analysis: dict[str, Any], path: str) -> Any:
+    value: Any = analysis
+    for part in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def mapped_sections(mapping: dict[str, str]) -> set[str]:
+    """The analysis sections ``mapping`` reads, i.e. the first part of each analysis path."""
+    return {
+        source.split('.', 1)[0]
+        for source in (mapping or DEFAULT_FIELD_MAPPING)
+        if source not in {'call_id', 'rep_email', 'created_at', *CALL_SOURCE_FIELDS}
+    }
+
+
+def source_value(row: Any, analysis: dict[str, Any], rep_email: str | None, source: str) -> Any:
+    """Resolve a mapping source: a call column, ``rep_email``, or a dotted analysis path."""
+    if source == 'call_id':
+        return row.call_id
+    if source == 'rep_email':
+        return rep_email
+    if source == 'created_at':
+        created_at: datetime | None = row.created_at
+        return created_at.isoformat() if created_at else None
+    if source in CALL_SOURCE_FIELDS:
+        return getattr(row, source)
+    return _analysis_value(analysis, source)
+
+
+def crm_record(
+    row: Any, analysis: dict[str, Any], rep_email: str | None, mapping: dict[str, str]
+) -> dict[str, Any]:
+    fields = {}
+    for source, target in (mapping or DEFAULT_FIELD_MAPPING).items():
+        value = source_value(row, analysis, rep_email, source)
+        if value is not None:
+            fields[target] = value
+    return {'ref': str(row.call_id), 'object': 'call', 'fields': fields}
+
+
+class CrmClient:
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+
+    async def push_batch(self, records: list[dict[str, Any]]) -> dict[str, CrmRecordResult]:
+        try:
+            response = await self.client.post('/v1/records/batch', json={'records': records})
+        except httpx.TransportError as exc:
+            raise CrmError(f'CRM unreachable: {exc}') from exc
+        if response.status_code in RETRY_STATUS_CODES:
+            raise CrmError(f'CRM returned {response.status_code}')
+        if response.is_error:
+            raise CrmError(f'CRM rejected the batch with {response.status_code}')
+
+        results = {}
+        for item in response.json().get('results', []):
+            ref = str(item.get('ref'))
+            if item.get('status') == 'ok':
+                results[ref] = CrmRecordResult(ref, external_id=str(item.get('id')))
+            else:
+                results[ref] = CrmRecordResult(ref, error=str(item.get('error') or 'rejected'))
+        return results
+
+
+@asynccontextmanager
+async def open_crm_client(settings: Settings) -> AsyncIterator[CrmClient]:
+    """One pooled connection set for a whole drain run."""
+    headers = {'Authorization': f'Bearer {settings.crm_api_key}'} if settings.crm_api_key else {}
+    async with httpx.AsyncClient(
+        base_url=settings.crm_base_url,
+        headers=headers,
+        transport=client_transport,
+        timeout=httpx.Timeout(settings.crm_timeout_seconds, connect=10.0),
+    ) as client:
+        yield CrmClient(client)
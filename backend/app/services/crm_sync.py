@@ -0,0 +1,247 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import exists, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.entities import (
+    Call,
+    CallStatus,
+    CrmOutboxEntry,
+    CrmSyncStatus,
+    Organization,
+    User,
+)
+from app.services.call_content import CallContentService
+from app.services.crm import (
+    CALL_SOURCE_FIELDS,
+    CrmClient,
+    CrmError,
+    crm_record,
+    mapped_sections,
+    open_crm_client,
+)
+from app.services.resource_versions import CALL, ResourceVersionCache
+
+OUTBOX_STATUS = CrmOutboxEntry.__table__.c.status.type
+
+
+class CrmSyncService:
+    """Bulk CRM sync through a transactional outbox.
+
+    ``enqueue`` writes one pending outbox row per call with a single INSERT ... SELECT
+    in the caller's transaction, so requesting a sync commits or rolls back with it.
+    ``drain`` sends pending rows to the CRM in batches and records each batch's
+    outcome with two bulk statements, never rewriting the calls' analysis sections.
+    """
+
+    @staticmethod
+    async def enqueue(
+        db: AsyncSession,
+        organization_id: int,
+        user_id: int,
+        call_ids: list[int],
+        status: CallStatus | None = None,
+        conversation_state: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> int:
+        already_pending = exists().where(
+            CrmOutboxEntry.call_id == Call.id, CrmOutboxEntry.status == CrmSyncStatus.PENDING
+        )
+        candidates = select(
+            Call.organization_id,
+            Call.id,
+            literal(user_id),
+            literal(CrmSyncStatus.PENDING, OUTBOX_STATUS),
+            literal(0),
+        ).where(Call.organization_id == organization_id, ~already_pending)
+        if call_ids:
+            candidates = candidates.where(Call.id.in_(call_ids))
+        if status is not None:
+            candidates = candidates.where(Call.status == status)
+        if conversation_state is not None:
+            candidates = candidates.where(Call.conversation_state == conversation_state)
+        if created_from is not None:
+            candidates = candidates.where(Call.created_at >= created_from)
+        if created_to is not None:
+            candidates = candidates.where(Call.created_at < created_to)
+        candidates = candidates.order_by(Call.id).limit(get_settings().crm_sync_max_calls)
+
+        result = await db.execute(
+            insert(CrmOutboxEntry).from_select(
+                ['organization_id', 'call_id', 'requested_by_user_id', 'status', 'attempts'],
+                candidates,
+            )
+        )
+        return result.rowcount
+
+    @staticmethod
+    async def counts(db: AsyncSession, organization_id: int) -> dict[str, int]:
+        result = await db.execute(
+            select(CrmOutboxEntry.status, func.count())
+            .where(CrmOutboxEntry.organization_id == organization_id)
+            .group_by(CrmOutboxEntry.status)
+        )
+        counts = {status.value: 0 for status in CrmSyncStatus}
+        counts.update({status.value: count for status, count in result.all()})
+        return counts
+
+    @staticmethod
+    async def drain(db: AsyncSession, client: CrmClient) -> dict[str, Any]:
+        """Send pending rows until none are left or the CRM fails a whole batch."""
+        settings = get_settings()
+        totals = {'batches': 0, 'sent': 0, 'failed': 0, 'retry_later': False}
+        mappings: dict[int, dict[str, str]] = {}
+        emails: dict[int, str] = {}
+
+        while True:
+            query = (
+                select(
+                    CrmOutboxEntry.id,
+                    CrmOutboxEntry.organization_id,
+                    CrmOutboxEntry.attempts,
+                    Call.id.label('call_id'),
+                    Call.user_id,
+                    Call.created_at,
+                    *(getattr(Call, name) for name in CALL_SOURCE_FIELDS),
+                )
+                .join(Call, Call.id == CrmOutboxEntry.call_id)
+                .where(CrmOutboxEntry.status == CrmSyncStatus.PENDING)
+                .order_by(CrmOutboxEntry.id)
+                .limit(settings.crm_batch_size)
+            )
+            if db.get_bind().dialect.name == 'postgresql':
+                # Concurrent drains take disjoint batches instead of double-sending.
+                query = query.with_for_update(skip_locked=True, of=CrmOutboxEntry)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+
+            await CrmSyncService._load_context(db, rows, mappings, emails)
+            # Only the analysis sections the organizations' mappings read.
+            sections = set().union(
+                *(mapped_sections(mappings.get(row.organization_id, {})) for row in rows)
+            )
+            analyses = await CallContentService.analyses(
+                db, [row.call_id for row in rows], sections
+            )
+            records = [
+                crm_record(
+                    row,
+                    analyses.get(row.call_id, {}),
+                    emails.get(row.user_id),
+                    mappings.get(row.organization_id, {}),
+                )
+                for row in rows
+            ]
+            try:
+                results = await client.push_batch(records)
+            except CrmError as exc:
+                totals['failed'] += await CrmSyncService._batch_failed(db, rows, str(exc))
+                await db.commit()
+                totals['retry_later'] = True
+                break
+
+            now = datetime.now(timezone.utc)
+            sent, failed, synced_call_ids = CrmSyncService._split_results(rows, results, now)
+            if sent:
+                await db.execute(update(CrmOutboxEntry), sent)
+                await CrmSyncService.mark_synced(db, synced_call_ids, now)
+            if failed:
+                await db.execute(update(CrmOutboxEntry), failed)
+            await db.commit()
+            ResourceVersionCache.invalidate(CALL, synced_call_ids)
+            totals['batches'] += 1
+            totals['sent'] += len(sent)
+            totals['failed'] += len(failed)
+        return totals
+
+    @staticmethod
+    async def mark_synced(db: AsyncSession, call_ids: list[int], synced_at: datetime) -> None:
+        """Record on the calls rows that they reached the CRM, in the caller's transaction.
+
+        Both the per-call sync and the outbox drain go through here, so ``crm_synced_at``
+        and the ETag ``version`` change the same way whichever path sent the call.
+        """
+        await db.execute(
+            update(Call)
+            .where(Call.id.in_(call_ids))
+            .values(crm_synced_at=synced_at, version=Call.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def _load_context(
+        db: AsyncSession, rows: list, mappings: dict[int, dict], emails: dict[int, str]
+    ) -> None:
+        org_ids = {row.organization_id for row in rows} - mappings.keys()
+        if org_ids:
+            result = await db.execute(
+                select(Organization.id, Organization.settings).where(Organization.id.in_(org_ids))
+            )
+            for org_id, org_settings in result.all():
+                mappings[org_id] = (org_settings or {}).get('crm_field_mapping') or {}
+        user_ids = {row.user_id for row in rows} - emails.keys()
+        if user_ids:
+            result = await db.execute(select(User.id, User.email).where(User.id.in_(user_ids)))
+            emails.update(dict(result.all()))
+
+    @staticmethod
+    def _split_results(
+        rows: list, results: dict, now: datetime
+    ) -> tuple[list[dict], list[dict], list[int]]:
+        sent, failed, synced_call_ids = [], [], []
+        for row in rows:
+            outcome = results.get(str(row.call_id))
+            if outcome is not None and outcome.error is None:
+                sent.append(
+                    {
+                        'id': row.id,
+                        'status': CrmSyncStatus.SENT,
+                        'attempts': row.attempts + 1,
+                        'external_id': outcome.external_id,
+                        'last_error': None,
+                        'sent_at': now,
+                    }
+                )
+                synced_call_ids.append(row.call_id)
+            else:
+                # A record the CRM rejected will be rejected again; it needs a data fix.
+                error = outcome.error if outcome is not None else 'missing from CRM response'
+                failed.append(
+                    {
+                        'id': row.id,
+                        'status': CrmSyncStatus.FAILED,
+                        'attempts': row.attempts + 1,
+                        'last_error': error[:500],
+                    }
+                )
+        return sent, failed, synced_call_ids
+
+    @staticmethod
+    async def _batch_failed(db: AsyncSession, rows: list, error: str) -> int:
+        max_attempts = get_settings().crm_max_attempts
+        updates = [
+            {
+                'id': row.id,
+                'attempts': row.attempts + 1,
+                'last_error': error[:500],
+                'status': (
+                    CrmSyncStatus.FAILED
+                    if row.attempts + 1 >= max_attempts
+                    else CrmSyncStatus.PENDING
+                ),
+            }
+            for row in rows
+        ]
+        await db.execute(update(CrmOutboxEntry), updates)
+        return sum(item['status'] == CrmSyncStatus.FAILED for item in updates)
+
+
+async def run_crm_drain() -> dict[str, Any]:
+    """Drain the outbox on its own session, e.g. from a background task after the response."""
+    async with AsyncSessionLocal() as db, open_crm_client(get_settings()) as client:
+        return await CrmSyncService.drain(db, client)
@@ -6,14 +6,45 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.db.session import get_db
-from app.models.entities import User
+from app.models.entities import Role, User
+from app.services.user_cache import UserCacheService, detached_user
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/api/v1/auth/login')
 
+CLAIM_KEYS = ('uid', 'org', 'role', 'name')
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-) -> User:
+
+def user_claims(user: User) -> dict:
+    """Claims embedded in access tokens when ``auth_token_claims`` is enabled."""
+    return {
+        'uid': user.id,
+        'org': user.organization_id,
+        'role': user.role.value,
+        'name': user.full_name,
+    }
+
+
+def _claims_user(subject: str, payload: dict) -> User | None:
+    if not all(key in payload for key in CLAIM_KEYS):
+        return None
+    try:
+        role = Role(payload['role'])
+    except ValueError:
+        return None
+    # Deactivation and role changes take effect when the token expires.
+    return detached_user(
+        {
+            'id': payload['uid'],
+            'organization_id': payload['org'],
+            'email': subject,
+            'full_name': payload['name'],
+            'role': role,
+            'is_active': True,
+        }
+    )
+
+
+async def _authenticate(token: str, db: AsyncSession, allow_claims: bool) -> User:
     settings = get_settings()
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -27,8 +58,35 @@ async def get_current_user(
     except JWTError as exc:
         raise credentials_exception from exc
 
-    result = await db.execute(select(User).where(User.email == subject))
-    user = result.scalar_one_or_none()
+    if allow_claims and settings.auth_token_claims:
+        user = _claims_user(subject, payload)
+        if user is not None:
+            return user
+
+    user = UserCacheService.get(subject)
+    if user is None:
+        result = await db.execute(select(User).where(User.email == subject))
+        user = result.scalar_one_or_none()
+        if user is not None:
+            UserCacheService.put(user)
     if user is None or not user.is_active:
         raise credentials_exception
     return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> User:
+    return await _authenticate(token, db, allow_claims=True)
+
+
+async def get_stored_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> User:
+    """Like ``get_current_user`` but always backed by the (cached) users row, never claims."""
+    return await _authenticate(token, db, allow_claims=False)
+
+
+def ensure_manager_or_admin(user: User) -> None:
+    if user.role not in {Role.MANAGER, Role.ADMIN}:
+        raise HTTPException(status_code=403, detail='Manager or admin role required')
@@ -0,0 +1,197 @@
+"""Call progress events for ``GET /calls/{call_id}/events`` subscribers.
+
+The memory broker fans events out inside one process, which covers inline processing
+and eager Celery. When workers run elsewhere, set ``EVENT_BROKER=redis`` so they publish
+through Redis pub/sub and every API replica relays to its own subscribers.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from functools import lru_cache
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.entities import Call, CallStatus
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {CallStatus.ANALYZED, CallStatus.FAILED}
+
+
+def call_channel(call_id: int) -> str:
+    return f'calls:{call_id}:events'
+
+
+def _offer(queue: asyncio.Queue, message: dict[str, Any]) -> None:
+    # A stalled subscriber loses its oldest events rather than holding up publishers;
+    # the terminal status is always published last, so the stream still closes.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+class MemoryEventBroker:
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = (
+            defaultdict(set)
+        )
+        self._lock = threading.Lock()
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    async def publish(self, channel: str, message: dict[str, Any]) -> None:
+        with self._lock:
+            targets = list(self._subscribers.get(channel, ()))
+        current = asyncio.get_running_loop()
+        for loop, queue in targets:
+            if loop is current:
+                _offer(queue, message)
+            elif not loop.is_closed():
+                # Eager Celery tasks publish from their own event loop.
+                loop.call_soon_threadsafe(_offer, queue, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        entry = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers[channel].add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(entry)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisEventBroker:
+    def __init__(self, url: str, queue_size: int) -> None:
+        self.url = url
+        self.queue_size = queue_size
+        # redis-py connections are bound to the loop that opened them.
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _client(self) -> aioredis.Redis:
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            self._clients[loop] = aioredis.from_url(self.url)
+        return self._clients[loop]
+
+    async def close(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def publish(self, channel: str, message: dict[str, Any]) -> None:
+        await self._client().publish(channel, json.dumps(message))
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        pubsub = self._client().pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+
+        async def relay() -> None:
+            try:
+                async for message in pubsub.listen():
+                    _offer(queue, json.loads(message['data']))
+                raise RedisConnectionError(f'Subscription to {channel} ended')
+            except Exception as exc:
+                # Handed to the reader, which re-raises it: the stream ends and the client
+                # reconnects instead of waiting on a relay that is gone.
+                _offer(queue, exc)
+
+        reader = asyncio.create_task(relay())
+        try:
+            yield queue
+        finally:
+            reader.cancel()
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+
+EventBroker = MemoryEventBroker | RedisEventBroker
+
+
+@lru_cache
+def get_event_broker() -> EventBroker:
+    settings = get_settings()
+    if settings.event_broker == 'redis':
+        return RedisEventBroker(settings.event_redis_url, settings.event_queue_size)
+    return MemoryEventBroker(settings.event_queue_size)
+
+
+async def close_event_broker() -> None:
+    broker = get_event_broker()
+    if isinstance(broker, RedisEventBroker):
+        await broker.close()
+
+
+def format_sse(event_id: int, event: str, data: Any) -> str:
+    return f'id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+class CallEventService:
+    """Publishes processing progress and renders it as a server-sent event stream."""
+
+    @staticmethod
+    async def publish(call_id: int, event: str, data: dict[str, Any]) -> None:
+        try:
+            await get_event_broker().publish(call_channel(call_id), {'event': event, 'data': data})
+        except (OSError, RedisError):
+            # Progress events are best effort; processing must not fail because of them.
+            logger.warning('Could not publish %s event for call %s', event, call_id, exc_info=True)
+
+    @staticmethod
+    def subscribe(call_id: int) -> AbstractAsyncContextManager[asyncio.Queue]:
+        return get_event_broker().subscribe(call_channel(call_id))
+
+    @staticmethod
+    async def stream(call_id: int) -> AsyncIterator[str]:
+        """Current status first, then live events until the call settles.
+
+        Raises whatever stopped the broker relaying events, ending the response so the
+        client reconnects.
+        """
+        keepalive = get_settings().event_keepalive_seconds
+        async with CallEventService.subscribe(call_id) as queue:
+            # Subscribed before reading the status, so no transition can fall in between.
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(select(Call.status).where(Call.id == call_id))
+                current = result.scalar_one()
+            event_id = 1
+            yield format_sse(event_id, 'status', {'status': current.value})
+            if current in TERMINAL_STATUSES:
+                return
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if isinstance(message, Exception):
+                    raise message
+                event_id += 1
+                yield format_sse(event_id, message['event'], message['data'])
+                if message['event'] == 'status' and CallStatus(
+                    message['data']['status']
+                ) in TERMINAL_STATUSES:
+                    return
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import re
+
+# Characters that make up a token in the engine's ``[a-z']+`` tokenization.
+TOKEN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz'")
+
+
+@dataclass
+class KeywordScan:
+    token_counts: Counter[str] = field(default_factory=Counter)
+    phrases: set[str] = field(default_factory=set)
+    trigger_positions: list[int] = field(default_factory=list)
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Multi-pattern matcher that reports every occurrence of every term in one pass.
+
+    Terms are compiled into a single trie-shaped regex, so each ``finditer`` match is
+    the longest term starting at that position. Shorter terms starting at the same
+    position, and terms starting inside the consumed match, are recovered from a
+    per-term output table built at construction time (Aho-Corasick output links).
+    Terms that run past the end of the match are confirmed with ``startswith``.
+
+    Tokens are counted only where they form a whole ``[a-z']+`` token, phrases are
+    reported on substring presence and trigger positions are recorded in order.
+    """
+
+    def __init__(
+        self, tokens: Iterable[str], phrases: Iterable[str], triggers: Iterable[str]
+    ) -> None:
+        self.tokens = frozenset(tokens)
+        self.phrases = frozenset(phrases)
+        self.triggers = frozenset(triggers)
+        terms = sorted(self.tokens | self.phrases | self.triggers)
+        self.max_term_length = max(map(len, terms))
+        self._regex = re.compile(_trie_pattern(terms))
+        self._outputs = {term: self._build_outputs(term, terms) for term in terms}
+
+    def _build_outputs(self, matched: str, terms: list[str]) -> tuple:
+        outputs = []
+        for offset in range(len(matched)):
+            rest = matched[offset:]
+            for term in terms:
+                if rest.startswith(term):
+                    verify = False
+                elif offset and term.startswith(rest):
+                    verify = True
+                else:
+                    continue
+                outputs.append(
+                    (
+                        offset,
+                        term,
+                        verify,
+                        term in self.tokens,
+                        term in self.phrases,
+                        term in self.triggers,
+                    )
+                )
+        return tuple(outputs)
+
+    def scan(
+        self,
+        normalized: str,
+        start: int = 0,
+        stop: int | None = None,
+        result: KeywordScan | None = None,
+    ) -> KeywordScan:
+        """Scan ``normalized``, keeping only occurrences that start in ``[start, stop)``.
+
+        Characters outside the range still decide token boundaries, which lets a
+        caller scan overlapping windows of a stream; ``result`` accumulates across calls.
+        """
+        result = result if result is not None else KeywordScan()
+        stop = len(normalized) if stop is None else stop
+        counts = result.token_counts
+        phrases = result.phrases
+        triggers = result.trigger_positions
+        size = len(normalized)
+        outputs = self._outputs
+        startswith = normalized.startswith
+
+        for match in self._regex.finditer(normalized):
+            match_start = match.start()
+            for offset, term, verify, is_token, is_phrase, is_trigger in outputs[match.group()]:
+                pos = match_start + offset
+                if pos < start or pos >= stop or (verify and not startswith(term, pos)):
+                    continue
+                if is_token:
+                    end = pos + len(term)
+                    if (pos == 0 or normalized[pos - 1] not in TOKEN_CHARS) and (
+                        end == size or normalized[end] not in TOKEN_CHARS
+                    ):
+                        counts[term] += 1
+                if is_phrase:
+                    phrases.add(term)
+                if is_trigger:
+                    triggers.append(pos)
+        return result
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+from collections.abc import Iterable
+from contextlib import closing
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import LargeBinary, cast, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.compression import IDENTITY, TextCompressor
+from app.db.search_index import TranscriptIndexer
+from app.models.entities import Call, CallStatus, CallTranscript, Organization
+from app.services.analysis import AnalysisService, StreamingAnalyzer, TermSearch
+from app.services.blob_store import BlobStore
+from app.services.content_cache import ContentCacheService, transcript_hash, upload_key
+from app.services.events import CallEventService
+from app.services.reanalysis import current_template
+from app.services.transcription import TranscriptionService
+
+
+async def load_call_content(db: AsyncSession, call: Call) -> None:
+    """Load whichever of the call's transcript and analysis sections are not loaded yet."""
+    unloaded = inspect(call).unloaded & {'transcript_record', 'analysis_sections'}
+    if unloaded:
+        await db.refresh(call, sorted(unloaded))
+
+
+class _PartialTranscript:
+    """Persists the finished prefix of a transcript that is still being transcribed.
+
+    Long recordings are transcribed in segments; saving the prefix lets clients polling
+    the call read it while the rest is in flight. Prefixes are stored uncompressed and
+    unindexed, and each save that extends the previous one only appends the new text:
+    the final ``Call.transcript`` write compresses and indexes the whole transcript once.
+    """
+
+    def __init__(self, db: AsyncSession, call: Call) -> None:
+        self.db = db
+        self.call = call
+        self.saved: str | None = None
+
+    async def save(self, transcript: str) -> None:
+        call = self.call
+        if self.saved is not None and transcript.startswith(self.saved):
+            offset = len(self.saved)
+            tail = transcript[offset:].encode('utf-8')
+            await self.db.execute(
+                update(CallTranscript)
+                .where(CallTranscript.call_id == call.id)
+                .values(
+                    content=cast(CallTranscript.content.op('||')(tail), LargeBinary),
+                    text_bytes=CallTranscript.text_bytes + len(tail),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            # Only ever assigned from here on, never read, so the stale copy is dropped.
+            self.db.expire(call.transcript_record, ['content', 'text_bytes'])
+        else:
+            offset = 0
+            data = transcript.encode('utf-8')
+            record = call.transcript_record
+            if record is None:
+                record = call.transcript_record = CallTranscript()
+            record.codec, record.content, record.text_bytes = IDENTITY, data, len(data)
+        call.version = Call.version + 1
+        await self.db.commit()
+        self.saved = transcript
+        await CallEventService.publish(
+            call.id, 'transcript', {'offset': offset, 'text': transcript[offset:]}
+        )
+
+
+async def _stream_transcript(
+    db: AsyncSession, call: Call, file_path: str, terms: Iterable[Any]
+) -> tuple[str, dict[str, Any], set[str]]:
+    """Store, index and analyze a text transcript file in one pass, a chunk at a time.
+
+    Returns the transcript's hash, its base analysis and which of ``terms`` occur in it.
+    What stays in memory is the compressed transcript and the indexed prefix of the
+    text, at most ``SEARCH_INDEX_MAX_KB``.
+    """
+    record = call.transcript_record
+    if record is None:
+        record = call.transcript_record = CallTranscript()
+    record.codec, record.content, record.text_bytes = IDENTITY, b'', 0
+    await db.flush()
+
+    digest = hashlib.sha256()
+    compressor = TextCompressor()
+    analyzer = StreamingAnalyzer()
+    search = TermSearch(terms)
+    indexer = TranscriptIndexer(call.id)
+    connection = await db.connection()
+    chunk_size = get_settings().analysis_stream_chunk_kb * 1024
+    with closing(TranscriptionService.read_chunks(file_path, chunk_size)) as chunks:
+
+        def consume() -> str | None:
+            chunk = next(chunks, None)
+            if chunk is not None:
+                digest.update(chunk.encode('utf-8'))
+                compressor.feed(chunk)
+                search.feed(chunk)
+                analyzer.feed(chunk)
+                indexer.feed(chunk)
+            return chunk
+
+        while await asyncio.to_thread(consume) is not None:
+            pass
+    await connection.run_sync(indexer.close)
+    record.codec, record.content = compressor.finish()
+    record.text_bytes = compressor.text_bytes
+    return digest.hexdigest(), analyzer.result(), search.found
+
+
+async def _set_status(db: AsyncSession, call: Call, status: CallStatus) -> None:
+    call.status = status
+    await db.commit()
+    await CallEventService.publish(call.id, 'status', {'status': status.value})
+
+
+async def _stage_finished(call: Call, stage: str, started: float) -> None:
+    await CallEventService.publish(
+        call.id, 'stage', {'stage': stage, 'seconds': round(perf_counter() - started, 4)}
+    )
+
+
+class CallProcessingService:
+    """Walks a persisted call through transcription and analysis.
+
+    Each status transition, stage duration and analysis section is also published to
+    the call's event channel as soon as it is committed.
+    """
+
+    @staticmethod
+    async def process(db: AsyncSession, call: Call) -> Call:
+        await load_call_content(db, call)
+        try:
+            started = perf_counter()
+            result = await db.execute(
+                select(Organization).where(Organization.id == call.organization_id)
+            )
+            template, version = current_template(result.scalar_one())
+            transcript = analysis = found_terms = None
+            key = cached_upload = None
+            if call.content_hash:
+                key = upload_key(
+                    call.organization_id, call.content_hash, Path(call.file_path).suffix
+                )
+                cached_upload = await ContentCacheService.get_upload(db, call.organization_id, key)
+            if cached_upload is not None:
+                transcript = cached_upload['transcript']
+            elif CallProcessingService._streams(call):
+                # Analysis happens during the same pass, so it is reported with transcription.
+                async with BlobStore.local_file(db, call) as file_path:
+                    digest, analysis, found_terms = await _stream_transcript(
+                        db, call, file_path, template.get('objection_terms') or []
+                    )
+                await ContentCacheService.put_analysis(db, call.organization_id, digest, analysis)
+            else:
+                async with BlobStore.local_file(db, call) as file_path:
+                    transcript = await TranscriptionService.transcribe(
+                        file_path, on_partial=_PartialTranscript(db, call).save
+                    )
+                if key:
+                    await ContentCacheService.put_upload(db, key, transcript)
+            if transcript is not None:
+                call.transcript = transcript
+            await _set_status(db, call, CallStatus.TRANSCRIBED)
+            await _stage_finished(call, 'transcription', started)
+
+            started = perf_counter()
+            if analysis is None:
+                digest = transcript_hash(transcript)
+                analysis = await ContentCacheService.get_analysis(db, call.organization_id, digest)
+                if analysis is None:
+                    analysis = await AnalysisService.analyze_async(transcript)
+                    await ContentCacheService.put_analysis(
+                        db, call.organization_id, digest, analysis
+                    )
+            call.analysis = AnalysisService.apply_template(
+                analysis, template, transcript, found_terms=found_terms
+            )
+            call.analysis_template_version = version
+            call.status = CallStatus.ANALYZED
+        except Exception:
+            call.analysis = {'error': 'Analysis failed'}
+            await _set_status(db, call, CallStatus.FAILED)
+            raise
+
+        await db.commit()
+        await _stage_finished(call, 'analysis', started)
+        for section, value in call.analysis.items():
+            await CallEventService.publish(
+                call.id, 'analysis', {'section': section, 'value': value}
+            )
+        await CallEventService.publish(call.id, 'status', {'status': CallStatus.ANALYZED.value})
+        return call
+
+    @staticmethod
+    def _streams(call: Call) -> bool:
+        """Whether the call is a text transcript large enough to be read in chunks."""
+        threshold = get_settings().analysis_stream_threshold_mb * 1024 * 1024
+        return call.file_size >= threshold and TranscriptionService.is_text(call.file_path)
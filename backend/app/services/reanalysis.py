@@ -0,0 +1,191 @@
+from typing import Any
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.entities import (
+    AnalysisTemplate,
+    Call,
+    CallStatus,
+    Organization,
+    ReanalysisJob,
+    ReanalysisStatus,
+)
+from app.services.analysis import TRANSCRIPT_SECTIONS, AnalysisService
+from app.services.call_content import CallContentService
+
+TEMPLATE_KEY = 'call_analysis_template'
+VERSION_KEY = 'call_analysis_template_version'
+
+
+def current_template(org: Organization) -> tuple[dict[str, Any], int]:
+    settings = org.settings or {}
+    return settings.get(TEMPLATE_KEY, {}), settings.get(VERSION_KEY, 0)
+
+
+class ReanalysisService:
+    """Keeps stored call analyses in step with the organization's analysis template.
+
+    Every template change gets a new version. Calls record the version their analysis was
+    produced with, and a job only rebuilds the sections whose template inputs differ
+    between a call's version and the current one, checkpointing after each batch.
+    """
+
+    @staticmethod
+    async def publish_template(
+        db: AsyncSession, org: Organization, template: dict[str, Any]
+    ) -> ReanalysisJob | None:
+        previous, version = current_template(org)
+        if template == previous:
+            return None
+
+        if await db.get(AnalysisTemplate, (org.id, version)) is None:
+            # Templates saved before versioning (version 0) were never recorded; keep
+            # them so calls analyzed with them are diffed against what they really used.
+            db.add(AnalysisTemplate(organization_id=org.id, version=version, template=previous))
+
+        version += 1
+        settings = dict(org.settings or {})
+        settings[TEMPLATE_KEY] = template
+        settings[VERSION_KEY] = version
+        org.settings = settings
+        db.add(AnalysisTemplate(organization_id=org.id, version=version, template=template))
+        job = ReanalysisJob(organization_id=org.id, template_version=version)
+        db.add(job)
+        await db.flush()
+        return job
+
+    @staticmethod
+    async def _template_at(
+        db: AsyncSession, organization_id: int, version: int, cache: dict[int, dict[str, Any]]
+    ) -> dict[str, Any]:
+        if version not in cache:
+            result = await db.execute(
+                select(AnalysisTemplate.template).where(
+                    AnalysisTemplate.organization_id == organization_id,
+                    AnalysisTemplate.version == version,
+                )
+            )
+            cache[version] = result.scalar_one_or_none() or {}
+        return cache[version]
+
+    @staticmethod
+    async def run_job(
+        db: AsyncSession, job_id: int, batch_size: int | None = None
+    ) -> ReanalysisJob | None:
+        batch_size = batch_size or get_settings().reanalysis_batch_size
+        job = await db.get(ReanalysisJob, job_id)
+        if job is None or job.status in {ReanalysisStatus.COMPLETED, ReanalysisStatus.SUPERSEDED}:
+            return job
+
+        org = await db.get(Organization, job.organization_id)
+        template, version = current_template(org)
+        if version != job.template_version:
+            # A newer job diffs every stale call against the newer template.
+            job.status = ReanalysisStatus.SUPERSEDED
+            await db.commit()
+            return job
+
+        job.status = ReanalysisStatus.RUNNING
+        try:
+            await ReanalysisService._run(db, job, template, batch_size)
+        except Exception:
+            await db.rollback()
+            job.status = ReanalysisStatus.FAILED
+            await db.commit()
+            raise
+        return job
+
+    @staticmethod
+    async def _run(
+        db: AsyncSession, job: ReanalysisJob, template: dict[str, Any], batch_size: int
+    ) -> None:
+        version = job.template_version
+        templates = {version: template}
+        sections_by_version: dict[int, set[str]] = {}
+
+        async def sections_for(old_version: int) -> set[str]:
+            if old_version not in sections_by_version:
+                old_template = await ReanalysisService._template_at(
+                    db, job.organization_id, old_version, templates
+                )
+                sections_by_version[old_version] = AnalysisService.template_sections(
+                    old_template, template
+                )
+            return sections_by_version[old_version]
+
+        stale = (
+            Call.organization_id == job.organization_id,
+            Call.status == CallStatus.ANALYZED,
+            Call.analysis_template_version < version,
+        )
+
+        # Versions whose template differs only in keys no section depends on need no
+        # recompute at all; bump them with one UPDATE per version.
+        result = await db.execute(select(Call.analysis_template_version).where(*stale).distinct())
+        for old_version in result.scalars().all():
+            if await sections_for(old_version):
+                continue
+            bumped = await db.execute(
+                update(Call)
+                .where(*stale, Call.analysis_template_version == old_version)
+                .values(analysis_template_version=version)
+            )
+            job.bumped_calls += bumped.rowcount
+        await db.commit()
+
+        while True:
+            result = await db.execute(
+                select(Call)
+                .options(
+                    load_only(Call.id, Call.analysis_template_version),
+                    selectinload(Call.analysis_sections),
+                )
+                .where(*stale, Call.id > job.last_call_id)
+                .order_by(Call.id)
+                .limit(batch_size)
+            )
+            calls = result.scalars().all()
+            if not calls:
+                break
+
+            plan = {call.id: await sections_for(call.analysis_template_version) for call in calls}
+            needs_transcript = [
+                call_id for call_id, sections in plan.items() if sections & TRANSCRIPT_SECTIONS
+            ]
+            transcripts = await CallContentService.transcripts(db, needs_transcript)
+
+            for call in calls:
+                if plan[call.id]:
+                    call.analysis = AnalysisService.apply_template(
+                        call.analysis, template, transcripts.get(call.id), plan[call.id]
+                    )
+                    job.recomputed_calls += 1
+                else:
+                    job.bumped_calls += 1
+                call.analysis_template_version = version
+            job.last_call_id = calls[-1].id
+            await db.commit()
+
+        job.status = ReanalysisStatus.COMPLETED
+        await db.commit()
+
+    @staticmethod
+    async def pending_calls(db: AsyncSession, organization_id: int, version: int) -> int:
+        result = await db.execute(
+            select(func.count(Call.id)).where(
+                Call.organization_id == organization_id,
+                Call.status == CallStatus.ANALYZED,
+                Call.analysis_template_version < version,
+            )
+        )
+        return result.scalar_one()
+
+
+async def run_reanalysis_job(job_id: int) -> None:
+    """Run a job on its own session, e.g. from a background task after the response."""
+    async with AsyncSessionLocal() as db:
+        await ReanalysisService.run_job(db, job_id)
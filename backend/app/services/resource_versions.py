@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.entities import Call, Organization
+from app.services.cache import LRUCache
+from app.services.events import RedisEventBroker, get_event_broker
+
+logger = logging.getLogger(__name__)
+
+CALL = 'call'
+TEMPLATES = 'templates'
+INVALIDATIONS_CHANNEL = 'resource-versions:invalidations'
+_PENDING_KEY = 'resource_version_invalidations'
+
+# Broadcasts still in flight; held so they are not garbage collected before they run.
+_broadcasts: set[asyncio.Task] = set()
+
+
+class ResourceVersionCache:
+    """TTL + LRU cache of the latest version seen of each polled resource.
+
+    Keys are ``(kind, id)``; values are ``(organization id, version)``, so a conditional
+    GET can be scoped to the caller's organization and answered with 304 without
+    reading the row. Committed ORM changes drop their entries in this process; bulk
+    updates invalidate explicitly.
+
+    With ``EVENT_BROKER=redis`` several processes share the database, so every
+    invalidation is also published on the broker and each API process applies the
+    others' in ``listen``. The cache only answers while that subscription is up: until
+    it is, and after it drops, requests read the version column instead.
+    """
+
+    _cache: LRUCache[tuple[str, int], tuple[int, int]] | None = None
+    _listening = False
+
+    @classmethod
+    def _lru(cls) -> LRUCache[tuple[str, int], tuple[int, int]]:
+        if cls._cache is None:
+            settings = get_settings()
+            cls._cache = LRUCache(
+                settings.http_version_cache_entries, settings.http_version_cache_ttl_seconds
+            )
+        return cls._cache
+
+    @classmethod
+    def enabled(cls) -> bool:
+        settings = get_settings()
+        return (
+            settings.http_version_cache_entries > 0
+            and settings.http_version_cache_ttl_seconds > 0
+        )
+
+    @staticmethod
+    def shared() -> bool:
+        """Whether other processes write the same resources and broadcast invalidations."""
+        return isinstance(get_event_broker(), RedisEventBroker)
+
+    @classmethod
+    def get(cls, kind: str, resource_id: int, organization_id: int) -> int | None:
+        if not cls.enabled() or (cls.shared() and not cls._listening):
+            return None
+        entry = cls._lru().get((kind, resource_id))
+        if entry is None or entry[0] != organization_id:
+            return None
+        return entry[1]
+
+    @classmethod
+    def put(cls, kind: str, resource_id: int, organization_id: int, version: int) -> None:
+        if cls.enabled():
+            cls._lru().put((kind, resource_id), (organization_id, version))
+
+    @classmethod
+    def invalidate(cls, kind: str, resource_ids: Iterable[int]) -> None:
+        """Drop committed changes here and, when shared, in every other process."""
+        resources = [(kind, resource_id) for resource_id in resource_ids]
+        cls._drop(resources)
+        cls._broadcast(resources)
+
+    @classmethod
+    def _drop(cls, resources: Iterable[tuple[str, int]]) -> None:
+        if cls._cache is not None:
+            for resource in resources:
+                cls._cache.pop(resource)
+
+    @classmethod
+    def _broadcast(cls, resources: list[tuple[str, int]]) -> None:
+        if not resources or not cls.enabled() or not cls.shared():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous sessions (maintenance scripts) cannot publish; the TTL covers them.
+            return
+        task = loop.create_task(cls._publish(resources))
+        _broadcasts.add(task)
+        task.add_done_callback(_broadcasts.discard)
+
+    @staticmethod
+    async def _publish(resources: list[tuple[str, int]]) -> None:
+        try:
+            await get_event_broker().publish(
+                INVALIDATIONS_CHANNEL, {'resources': [list(resource) for resource in resources]}
+            )
+        except RedisError:
+            logger.warning('Could not broadcast invalidations of %s', resources, exc_info=True)
+
+    @staticmethod
+    async def flush() -> None:
+        """Wait for pending broadcasts, before an event loop that started them closes."""
+        await asyncio.gather(*list(_broadcasts))
+
+    @classmethod
+    async def listen(cls, retry_seconds: float = 1) -> None:
+        """Apply the invalidations other processes broadcast, until cancelled."""
+        while True:
+            try:
+                async with get_event_broker().subscribe(INVALIDATIONS_CHANNEL) as queue:
+                    cls._listening = True
+                    while True:
+                        message = await queue.get()
+                        if isinstance(message, Exception):
+                            raise message
+                        cls._drop((kind, resource_id) for kind, resource_id in message['resources'])
+            except Exception:
+                logger.warning('Resource version invalidations interrupted', exc_info=True)
+            finally:
+                # Anything may have changed while no invalidations were arriving.
+                cls._listening = False
+                cls.clear()
+            await asyncio.sleep(retry_seconds)
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return cls._lru().stats()
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._cache = None
+
+
+def _queue(target: Any, kind: str, resource_id: int) -> None:
+    ResourceVersionCache._drop([(kind, resource_id)])
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add((kind, resource_id))
+
+
+@event.listens_for(Call, 'after_update')
+@event.listens_for(Call, 'after_delete')
+def _queue_call_invalidation(_: Any, __: Any, call: Call) -> None:
+    _queue(call, CALL, call.id)
+
+
+@event.listens_for(Organization, 'after_update')
+def _queue_templates_invalidation(_: Any, __: Any, org: Organization) -> None:
+    _queue(org, TEMPLATES, org.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_invalidations(session: Session) -> None:
+    pending = sorted(session.info.pop(_PENDING_KEY, ()))
+    ResourceVersionCache._drop(pending)
+    ResourceVersionCache._broadcast(pending)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
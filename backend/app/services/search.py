@@ -0,0 +1,172 @@
+import html
+import re
+from bisect import bisect_left
+from collections.abc import Callable
+from itertools import islice
+from typing import Any
+
+from sqlalchemy import Float, column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.porter import porter_stem
+from app.db.search_index import SEARCH_CONFIG
+from app.models.entities import Call
+from app.services.call_content import CallContentService
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+SNIPPET_WORDS = 16
+
+_TERM = re.compile(r'"([^"]+)"|(\S+)')
+
+_WORD = re.compile(r'\w+')
+
+# Maps a lowercased word to the lexeme the index stored for it, or None for a stop word.
+Stemmer = Callable[[str], str | None]
+
+_RESULT_COLUMNS = (
+    Call.__table__.c.id,
+    Call.__table__.c.file_name,
+    Call.__table__.c.status,
+    Call.__table__.c.created_at,
+    column('rank', Float),
+)
+
+# Transcripts are stored compressed, so the database only ranks; snippets are cut in
+# Python from the page's transcripts alone.
+POSTGRES_SEARCH = text(
+    f"""
+    SELECT calls.id, calls.file_name, calls.status, calls.created_at,
+        ts_rank_cd(call_transcripts.search_vector, query) AS rank
+    FROM calls
+        JOIN call_transcripts ON call_transcripts.call_id = calls.id,
+        websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS query
+    WHERE calls.organization_id = :organization_id AND call_transcripts.search_vector @@ query
+    ORDER BY rank DESC, calls.id DESC
+    LIMIT :limit OFFSET :offset
+    """
+).columns(*_RESULT_COLUMNS)
+
+SQLITE_SEARCH = text(
+    """
+    SELECT calls.id, calls.file_name, calls.status, calls.created_at, -bm25(calls_fts) AS rank
+    FROM calls_fts JOIN calls ON calls.id = calls_fts.rowid
+    WHERE calls_fts MATCH :query AND calls.organization_id = :organization_id
+    ORDER BY bm25(calls_fts), calls.id DESC
+    LIMIT :limit OFFSET :offset
+    """
+).columns(*_RESULT_COLUMNS)
+
+# Postgres stems with its own Snowball dictionary; asking it keeps the marks on exactly
+# the words the tsvector matched. Stop words come back as an empty array.
+POSTGRES_STEMS = text(
+    f"SELECT word, (ts_lexize('{SEARCH_CONFIG}_stem', word))[1] AS stem "
+    'FROM unnest(CAST(:words AS text[])) AS word'
+)
+
+
+def fts5_query(query: str) -> str:
+    """Quote each word or ``"phrase"`` so user input cannot use FTS5 operators.
+
+    Terms are ANDed, matching the default of Postgres' ``websearch_to_tsquery``.
+    """
+    terms = []
+    for phrase, word in _TERM.findall(query):
+        term = (phrase or word).strip()
+        if term:
+            terms.append('"{}"'.format(term.replace('"', '""')))
+    return ' '.join(terms)
+
+
+def highlight_terms(query: str, stem: Stemmer = porter_stem) -> frozenset[str]:
+    """Stems of the words to mark, leaving out ``-excluded`` words, ``or`` and stop words."""
+    stems = set()
+    for phrase, word in _TERM.findall(query):
+        if word.startswith('-') or word.lower() == 'or':
+            continue
+        stems.update(stem(item.lower()) for item in _WORD.findall(phrase or word))
+    stems.discard(None)
+    return frozenset(stems)
+
+
+def snippet(
+    transcript: str,
+    terms: frozenset[str],
+    words: int = SNIPPET_WORDS,
+    stem: Stemmer = porter_stem,
+) -> str:
+    """About ``words`` words around the densest run of matches, as HTML with ``<mark>``.
+
+    ``stem`` must be the stemmer ``terms`` came from, the one the index used: by default
+    the Porter stemmer of SQLite's ``porter unicode61`` tokenizer.
+    """
+    hits = []
+    if terms:
+        hits = [
+            match.start()
+            for match in _WORD.finditer(transcript)
+            if stem(match.group().lower()) in terms
+        ]
+    # Pick the match followed by the most others within a typical window's characters.
+    span = words * 6
+    anchor, best = 0, 0
+    for position in hits:
+        count = bisect_left(hits, position + span) - bisect_left(hits, position)
+        if count > best:
+            anchor, best = position, count
+    # Keep a couple of words of context ahead of it.
+    before = list(_WORD.finditer(transcript, max(0, anchor - 40), anchor))
+    start = before[-2].start() if len(before) > 1 else anchor
+    window = list(islice(_WORD.finditer(transcript, start), words))
+    if not window:
+        return ''
+
+    # Clients render the snippet as HTML: transcript text is escaped, only the marks are not.
+    parts = ['…'] if _WORD.search(transcript, 0, window[0].start()) else []
+    position = window[0].start()
+    for token in window:
+        parts.append(html.escape(transcript[position : token.start()]))
+        if stem(token.group().lower()) in terms:
+            parts.append(f'{HIGHLIGHT_START}{html.escape(token.group())}{HIGHLIGHT_STOP}')
+        else:
+            parts.append(html.escape(token.group()))
+        position = token.end()
+    if _WORD.search(transcript, position):
+        parts.append('…')
+    return ''.join(parts)
+
+
+class CallSearchService:
+    """Ranked transcript search over the full-text index in ``app.db.search_index``."""
+
+    @staticmethod
+    async def search(
+        db: AsyncSession, organization_id: int, query: str, limit: int, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        params = {'organization_id': organization_id, 'limit': limit, 'offset': offset}
+        postgres = db.get_bind().dialect.name == 'postgresql'
+        if postgres:
+            statement = POSTGRES_SEARCH
+            params['query'] = query
+        else:
+            statement = SQLITE_SEARCH
+            params['query'] = fts5_query(query)
+            if not params['query']:
+                return []
+        matches = [dict(row) for row in (await db.execute(statement, params)).mappings()]
+        if not matches:
+            return []
+
+        transcripts = await CallContentService.transcripts(db, [match['id'] for match in matches])
+        stem: Stemmer = porter_stem
+        if postgres:
+            words = {
+                word.lower()
+                for item in (query, *transcripts.values())
+                for word in _WORD.findall(item)
+            }
+            stem = dict((await db.execute(POSTGRES_STEMS, {'words': sorted(words)})).all()).get
+        terms = highlight_terms(query, stem)
+        for match in matches:
+            match['snippet'] = snippet(transcripts.get(match['id'], ''), terms, stem=stem)
+        return matches
@@ -1,15 +1,107 @@
+import asyncio
+import gzip
 import pathlib
+import tempfile
+from collections.abc import Awaitable, Callable, Iterator
+from typing import TextIO
+
+from app.core.config import get_settings
+from app.core.metrics import timed_stage
+from app.services.audio_chunking import AudioSegment, duration_seconds, split_wav, stitch
+from app.services.transcription_providers import TranscriptionProvider, get_provider
+
+PartialCallback = Callable[[str], Awaitable[None]]
+
+TEXT_SUFFIXES = {'.txt'}
+# The blob store gzips text transcripts and names them ``<key>.txt.gz``.
+COMPRESSED_SUFFIX = '.gz'
+LOCAL_MODE_PLACEHOLDER = (
+    'Transcript unavailable for binary media in local mode. '
+    'Upload a .txt transcript for deterministic analysis.'
+)
 
 
 class TranscriptionService:
-    """Transcription adapter using text passthrough for manual testing."""
+    """Text transcripts pass through; media goes to the configured provider, if any.
+
+    Recordings longer than ``transcription_chunk_seconds`` are split into overlapping
+    segments that are transcribed concurrently; ``on_partial`` receives the stitched
+    transcript each time the finished segments extend the contiguous prefix.
+    """
 
     @staticmethod
-    async def transcribe(file_path: str) -> str:
+    def is_text(file_path: str) -> bool:
+        suffixes = [suffix.lower() for suffix in pathlib.Path(file_path).suffixes]
+        if suffixes[-2:-1] and suffixes[-1] == COMPRESSED_SUFFIX:
+            suffixes.pop()
+        return bool(suffixes) and suffixes[-1] in TEXT_SUFFIXES
+
+    @staticmethod
+    def open_text(file_path: str) -> TextIO:
         path = pathlib.Path(file_path)
-        if path.suffix.lower() in {'.txt'}:
-            return path.read_text(encoding='utf-8')
-        return (
-            'Transcript unavailable for binary media in local mode. '
-            'Upload a .txt transcript for deterministic analysis.'
-        )
+        if path.suffix.lower() == COMPRESSED_SUFFIX:
+            return gzip.open(path, 'rt', encoding='utf-8')
+        return path.open(encoding='utf-8')
+
+    @staticmethod
+    @timed_stage('transcription')
+    async def transcribe(file_path: str, on_partial: PartialCallback | None = None) -> str:
+        if TranscriptionService.is_text(file_path):
+            with TranscriptionService.open_text(file_path) as handle:
+                return handle.read()
+        provider = get_provider()
+        if provider is None:
+            return LOCAL_MODE_PLACEHOLDER
+
+        settings = get_settings()
+        chunk_seconds = settings.transcription_chunk_seconds
+        overlap_seconds = settings.transcription_chunk_overlap_seconds
+        duration = duration_seconds(file_path) if chunk_seconds > 0 else None
+        if duration is None or duration <= chunk_seconds + overlap_seconds:
+            return await provider.transcribe(file_path)
+
+        with tempfile.TemporaryDirectory(prefix='segments-') as directory:
+            segments = await asyncio.to_thread(
+                split_wav,
+                file_path,
+                directory,
+                chunk_seconds,
+                overlap_seconds,
+                settings.transcription_silence_search_seconds,
+            )
+            return await TranscriptionService._transcribe_segments(provider, segments, on_partial)
+
+    @staticmethod
+    async def _transcribe_segments(
+        provider: TranscriptionProvider,
+        segments: list[AudioSegment],
+        on_partial: PartialCallback | None,
+    ) -> str:
+        async def run(segment: AudioSegment) -> tuple[int, str]:
+            return segment.index, await provider.transcribe(segment.path)
+
+        # The provider's semaphore bounds how many segments are in flight at once.
+        tasks = [asyncio.ensure_future(run(segment)) for segment in segments]
+        texts: list[str | None] = [None] * len(segments)
+        published = 0
+        try:
+            for finished in asyncio.as_completed(tasks):
+                index, text = await finished
+                texts[index] = text
+                ready = published
+                while ready < len(texts) and texts[ready] is not None:
+                    ready += 1
+                if ready > published and ready < len(texts) and on_partial is not None:
+                    await on_partial(stitch(texts[:ready]))
+                published = ready
+        finally:
+            for task in tasks:
+                task.cancel()
+        return stitch(texts)
+
+    @staticmethod
+    def read_chunks(file_path: str, chunk_size: int) -> Iterator[str]:
+        """Yield a text transcript file ``chunk_size`` characters at a time."""
+        with TranscriptionService.open_text(file_path) as handle:
+            while chunk := handle.read(chunk_size):
+                yield chunk
@@ -0,0 +1,256 @@
+import asyncio
+import mimetypes
+import random
+import weakref
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+import httpx
+
+from app.core.config import Settings, get_settings
+
+T = TypeVar('T')
+
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+STREAM_CHUNK_BYTES = 256 * 1024
+
+# Tests and local tooling can route provider traffic to an in-process app.
+client_transport: httpx.AsyncBaseTransport | None = None
+
+
+class TranscriptionProviderError(Exception):
+    pass
+
+
+class RetryableProviderError(TranscriptionProviderError):
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class _LoopState:
+    client: httpx.AsyncClient
+    semaphores: dict[str, asyncio.Semaphore] = field(default_factory=dict)
+
+
+# httpx pools and asyncio semaphores belong to the loop that created them; Celery tasks
+# run each job on a fresh loop, so state is kept per loop rather than per process.
+_loop_states: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        settings = get_settings()
+        state = _LoopState(
+            client=httpx.AsyncClient(
+                transport=client_transport,
+                timeout=httpx.Timeout(settings.transcription_timeout_seconds, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=settings.transcription_http_max_connections,
+                    max_keepalive_connections=settings.transcription_http_max_connections,
+                ),
+            )
+        )
+        _loop_states[loop] = state
+    return state
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Connection pool shared by every provider call on the running event loop."""
+    return _loop_state().client
+
+
+async def close_http_client() -> None:
+    state = _loop_states.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        await state.client.aclose()
+
+
+async def _file_body(path: Path) -> AsyncIterator[bytes]:
+    with path.open('rb') as handle:
+        while chunk := await asyncio.to_thread(handle.read, STREAM_CHUNK_BYTES):
+            yield chunk
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers['retry-after'])
+    except (KeyError, ValueError):
+        return None
+
+
+def raise_for_provider_status(response: httpx.Response) -> None:
+    if response.status_code in RETRY_STATUS_CODES:
+        raise RetryableProviderError(
+            f'Provider returned {response.status_code}', _retry_after(response)
+        )
+    if response.is_error:
+        raise TranscriptionProviderError(f'Provider returned {response.status_code}')
+
+
+class TranscriptionProvider(ABC):
+    """Base for HTTP speech-to-text providers.
+
+    Subclasses implement ``_attempt``; the base adds the per-provider concurrency limit,
+    retries with exponential backoff and jitter, and hedging: when an attempt is still
+    running after ``transcription_hedge_after_seconds`` and the provider has spare
+    capacity, a second attempt starts and whichever finishes first wins.
+    """
+
+    name = 'provider'
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+
+    @abstractmethod
+    async def _attempt(self, client: httpx.AsyncClient, path: Path, content_type: str) -> str:
+        """Transcribe the file once; raise ``RetryableProviderError`` for transient failures."""
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        semaphores = _loop_state().semaphores
+        if self.name not in semaphores:
+            semaphores[self.name] = asyncio.Semaphore(self.settings.transcription_max_concurrency)
+        return semaphores[self.name]
+
+    async def transcribe(self, file_path: str) -> str:
+        path = Path(file_path)
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        return await self._with_retries(lambda: self._hedged(path, content_type))
+
+    async def _limited(self, path: Path, content_type: str) -> str:
+        async with self._semaphore():
+            return await self._attempt(get_http_client(), path, content_type)
+
+    async def _hedged(self, path: Path, content_type: str) -> str:
+        hedge_after = self.settings.transcription_hedge_after_seconds
+        primary = asyncio.ensure_future(self._limited(path, content_type))
+        if hedge_after <= 0:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done or self._semaphore().locked():
+            # Finished in time, or hedging would only queue behind our own quota.
+            return await primary
+
+        attempts = {primary, asyncio.ensure_future(self._limited(path, content_type))}
+        error: BaseException | None = None
+        try:
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def _with_retries(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        retries = self.settings.transcription_max_retries
+        for number in range(retries + 1):
+            try:
+                return await attempt()
+            except (RetryableProviderError, httpx.TransportError) as exc:
+                if number == retries:
+                    raise TranscriptionProviderError(
+                        f'{self.name} transcription failed after {retries + 1} attempts'
+                    ) from exc
+                delay = self.settings.transcription_backoff_seconds * 2**number
+                delay = delay * (0.5 + random.random())
+                retry_after = getattr(exc, 'retry_after', None)
+                await asyncio.sleep(max(delay, retry_after or 0))
+        raise AssertionError('unreachable')
+
+
+class DeepgramProvider(TranscriptionProvider):
+    """Deepgram pre-recorded API: the audio is the request body, one round-trip."""
+
+    name = 'deepgram'
+
+    def __init__(
+        self, settings: Settings, base_url: str | None = None, api_key: str | None = None
+    ) -> None:
+        super().__init__(settings)
+        self.base_url = (base_url or settings.deepgram_base_url).rstrip('/')
+        self.api_key = api_key if api_key is not None else settings.deepgram_api_key
+
+    async def _attempt(self, client: httpx.AsyncClient, path: Path, content_type: str) -> str:
+        response = await client.post(
+            f'{self.base_url}/v1/listen',
+            params={'model': self.settings.deepgram_model, 'smart_format': 'true'},
+            headers={'Authorization': f'Token {self.api_key}', 'Content-Type': content_type},
+            content=_file_body(path),
+        )
+        raise_for_provider_status(response)
+        try:
+            channel = response.json()['results']['channels'][0]
+            return channel['alternatives'][0]['transcript']
+        except (KeyError, IndexError, ValueError) as exc:
+            raise TranscriptionProviderError('Unexpected Deepgram response') from exc
+
+
+class AssemblyAIProvider(TranscriptionProvider):
+    """AssemblyAI: upload, create a transcript job, then poll until it settles."""
+
+    name = 'assemblyai'
+
+    def __init__(self, settings: Settings) -> None:
+        super().__init__(settings)
+        self.base_url = settings.assemblyai_base_url.rstrip('/')
+        self.headers = {'Authorization': settings.assemblyai_api_key}
+
+    async def _attempt(self, client: httpx.AsyncClient, path: Path, content_type: str) -> str:
+        upload = await client.post(
+            f'{self.base_url}/v2/upload', headers=self.headers, content=_file_body(path)
+        )
+        raise_for_provider_status(upload)
+        job = await client.post(
+            f'{self.base_url}/v2/transcript',
+            headers=self.headers,
+            json={'audio_url': upload.json()['upload_url']},
+        )
+        raise_for_provider_status(job)
+        job_id = job.json()['id']
+
+        loop = asyncio.get_running_loop()
+        timeout = self.settings.transcription_poll_timeout_seconds
+        deadline = loop.time() + timeout
+        while True:
+            poll = await client.get(f'{self.base_url}/v2/transcript/{job_id}', headers=self.headers)
+            raise_for_provider_status(poll)
+            body: dict[str, Any] = poll.json()
+            if body['status'] == 'completed':
+                return body.get('text') or ''
+            if body['status'] == 'error':
+                raise TranscriptionProviderError(body.get('error') or 'AssemblyAI job failed')
+            if loop.time() >= deadline:
+                # Not retryable: another attempt would upload the file and wait all over again.
+                raise TranscriptionProviderError(
+                    f'AssemblyAI job {job_id} did not finish within {timeout:g}s'
+                )
+            await asyncio.sleep(self.settings.transcription_poll_interval_seconds)
+
+
+def get_provider(settings: Settings | None = None) -> TranscriptionProvider | None:
+    """The configured media provider, or ``None`` for local passthrough mode."""
+    settings = settings or get_settings()
+    name = settings.transcription_provider
+    if name == 'local':
+        return None
+    if name == 'deepgram':
+        return DeepgramProvider(settings)
+    if name == 'assemblyai':
+        return AssemblyAIProvider(settings)
+    if name == 'fake':
+        # The stand-in server in ``tests/fakes/transcriber.py`` speaks the Deepgram API.
+        return DeepgramProvider(settings, base_url=settings.fake_transcriber_url, api_key='fake')
+    raise ValueError(f'Unknown transcription provider: {name}')
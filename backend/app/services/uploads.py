@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import timed_stage
+from app.models.entities import UploadSession
+
+EXPIRE_BATCH_SIZE = 500
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    path: Path
+    size: int
+    content_hash: str
+
+
+def _open_at(destination: Path, offset: int) -> BinaryIO:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.touch(exist_ok=True)
+    handle = destination.open('r+b')
+    handle.truncate(offset)
+    handle.seek(offset)
+    return handle
+
+
+class UploadStorageService:
+    """Streams uploads to disk in fixed-size chunks, hashing as it goes.
+
+    File opens and writes run in a worker thread so a slow disk never stalls the event loop.
+    """
+
+    @staticmethod
+    @timed_stage('file_write')
+    async def save(
+        upload: UploadFile, destination: Path, max_bytes: int, chunk_size: int
+    ) -> StoredUpload:
+        digest = hashlib.sha256()
+        size = 0
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            handle = await asyncio.to_thread(destination.open, 'wb')
+            try:
+                while chunk := await upload.read(chunk_size):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadTooLargeError(f'Upload exceeds {max_bytes} bytes')
+                    digest.update(chunk)
+                    await asyncio.to_thread(handle.write, chunk)
+            finally:
+                await asyncio.to_thread(handle.close)
+        except BaseException:
+            destination.unlink(missing_ok=True)
+            raise
+        return StoredUpload(path=destination, size=size, content_hash=digest.hexdigest())
+
+    @staticmethod
+    @timed_stage('file_write')
+    async def append(
+        chunks: AsyncIterator[bytes], destination: Path, offset: int, max_bytes: int
+    ) -> int:
+        """Write ``chunks`` at ``offset`` and return the new file size.
+
+        Anything past ``offset`` (e.g. bytes from an interrupted request that were never
+        acknowledged) is discarded first; on failure the file is truncated back to ``offset``.
+        """
+        handle = await asyncio.to_thread(_open_at, destination, offset)
+        size = offset
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f'Upload exceeds {max_bytes} bytes')
+                await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(handle.truncate, offset)
+            raise
+        finally:
+            await asyncio.to_thread(handle.close)
+        return size
+
+    @staticmethod
+    def hash_file(path: Path, chunk_size: int) -> str:
+        digest = hashlib.sha256()
+        with path.open('rb') as handle:
+            while chunk := handle.read(chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+class UploadSessionService:
+    @staticmethod
+    async def expire(db: AsyncSession, now: datetime | None = None) -> int:
+        """Delete resumable uploads older than ``UPLOAD_SESSION_TTL_HOURS`` and their part
+        files, except those a request is writing or completing right now."""
+        settings = get_settings()
+        now = now or datetime.now(timezone.utc)
+        unclaimed = or_(UploadSession.writer_id.is_(None), UploadSession.writer_expires_at < now)
+        expired = (
+            select(UploadSession.id)
+            .where(
+                UploadSession.created_at < now - timedelta(hours=settings.upload_session_ttl_hours),
+                unclaimed,
+            )
+            .limit(EXPIRE_BATCH_SIZE)
+        )
+        deleted = 0
+        while True:
+            # The claim is re-checked by the delete itself, so a part that started since
+            # the select keeps its session.
+            rows = await db.execute(
+                delete(UploadSession)
+                .where(UploadSession.id.in_(expired.scalar_subquery()), unclaimed)
+                .returning(UploadSession.part_path)
+                .execution_options(synchronize_session=False)
+            )
+            paths = rows.scalars().all()
+            await db.commit()
+            if not paths:
+                return deleted
+            for path in paths:
+                Path(path).unlink(missing_ok=True)
+            deleted += len(paths)
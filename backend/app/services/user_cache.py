@@ -0,0 +1,119 @@
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session, make_transient_to_detached
+
+from app.core.config import get_settings
+from app.models.entities import User
+from app.services.cache import LRUCache
+
+USER_COLUMNS = (
+    'id',
+    'organization_id',
+    'email',
+    'full_name',
+    'role',
+    'hashed_password',
+    'is_active',
+    'created_at',
+)
+_PENDING_KEY = 'user_cache_invalidations'
+_PENDING_ALL_KEY = 'user_cache_invalidate_all'
+
+
+def detached_user(values: dict[str, Any]) -> User:
+    """Build a read-only ``User`` that is not attached to, and never inserted by, a session."""
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+class UserCacheService:
+    """TTL + LRU cache of authenticated users keyed by token subject (the email).
+
+    Entries are column snapshots rather than ORM instances, so a cached user never
+    leaks one request's session into another. Any committed change to a user row
+    drops its entry in this process; other processes catch up within the TTL.
+    """
+
+    _cache: LRUCache[str, dict[str, Any]] | None = None
+
+    @classmethod
+    def _lru(cls) -> LRUCache[str, dict[str, Any]]:
+        if cls._cache is None:
+            settings = get_settings()
+            cls._cache = LRUCache(settings.user_cache_entries, settings.user_cache_ttl_seconds)
+        return cls._cache
+
+    @classmethod
+    def enabled(cls) -> bool:
+        settings = get_settings()
+        return settings.user_cache_entries > 0 and settings.user_cache_ttl_seconds > 0
+
+    @classmethod
+    def get(cls, subject: str) -> User | None:
+        if not cls.enabled():
+            return None
+        values = cls._lru().get(subject)
+        return detached_user(values) if values is not None else None
+
+    @classmethod
+    def put(cls, user: User) -> None:
+        if cls.enabled():
+            cls._lru().put(user.email, {name: getattr(user, name) for name in USER_COLUMNS})
+
+    @classmethod
+    def invalidate(cls, subject: str) -> None:
+        if cls._cache is not None:
+            cls._cache.pop(subject)
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        if cls._cache is not None:
+            cls._cache.clear()
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return cls._lru().stats()
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._cache = None
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _queue_user_invalidation(_: Any, __: Any, user: User) -> None:
+    state = inspect(user)
+    subjects = {user.email, *state.attrs.email.history.deleted}
+    # Drop now so this session's own reads miss, and again on commit so a concurrent
+    # request cannot re-cache the pre-commit row for the rest of the TTL.
+    for subject in subjects:
+        UserCacheService.invalidate(subject)
+    if state.session is not None:
+        state.session.info.setdefault(_PENDING_KEY, set()).update(subjects)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _queue_bulk_user_invalidation(state: ORMExecuteState) -> None:
+    # Bulk UPDATE/DELETE statements skip the mapper events above and do not say which
+    # rows they hit, so every cached user is dropped.
+    if (state.is_update or state.is_delete) and any(
+        mapper.class_ is User for mapper in state.all_mappers
+    ):
+        UserCacheService.invalidate_all()
+        state.session.info[_PENDING_ALL_KEY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_user_invalidations(session: Session) -> None:
+    if session.info.pop(_PENDING_ALL_KEY, False):
+        UserCacheService.invalidate_all()
+    for subject in session.info.pop(_PENDING_KEY, ()):
+        UserCacheService.invalidate(subject)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_user_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_PENDING_ALL_KEY, None)
@@ -1,9 +1,149 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from celery import Celery
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+from app.models.entities import Call, CallStatus
+from app.services.blob_store import BlobRetentionService
+from app.services.content_cache import ContentCacheService
+from app.services.crm import open_crm_client
+from app.services.crm_sync import CrmSyncService
+from app.services.events import close_event_broker
+from app.services.processing import CallProcessingService
+from app.services.reanalysis import ReanalysisService
+from app.services.resource_versions import ResourceVersionCache
+from app.services.uploads import UploadSessionService
 
-celery_app = Celery('salesops', broker='redis://localhost:6379/0', backend='redis://localhost:6379/1')
-celery_app.conf.update(task_serializer='json', result_serializer='json', timezone='UTC')
+settings = get_settings()
+
+celery_app = Celery(
+    'salesops', broker=settings.celery_broker_url, backend=settings.celery_result_backend
+)
+celery_app.conf.update(
+    task_serializer='json',
+    result_serializer='json',
+    timezone='UTC',
+    task_always_eager=settings.celery_task_always_eager,
+    task_acks_late=True,
+    # Run `celery -A app.workers.celery_app beat` to retry outbox rows left pending
+    # after a CRM outage, to apply the blob retention policy, to keep the persistent
+    # dedup cache within its byte budget and to drop abandoned resumable uploads.
+    beat_schedule={
+        'drain-crm-outbox': {
+            'task': 'crm.drain_outbox',
+            'schedule': settings.crm_drain_interval_seconds,
+        },
+        'enforce-blob-retention': {
+            'task': 'blobs.enforce_retention',
+            'schedule': settings.blob_retention_interval_seconds,
+        },
+        'trim-content-cache': {
+            'task': 'content_cache.trim',
+            'schedule': settings.content_cache_trim_interval_seconds,
+        },
+        'expire-upload-sessions': {
+            'task': 'uploads.expire_sessions',
+            'schedule': settings.upload_session_sweep_interval_seconds,
+        },
+    },
+)
 
 
 @celery_app.task(name='health.ping')
 def ping() -> str:
     return 'pong'
+
+
+@asynccontextmanager
+async def _worker_session() -> AsyncIterator[AsyncSession]:
+    # Tasks run on a fresh event loop each time, so pooled connections from the
+    # API engine cannot be reused here.
+    engine = create_async_engine(get_settings().database_url, poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            yield db
+    finally:
+        await engine.dispose()
+        await ResourceVersionCache.flush()
+        await close_event_broker()
+
+
+async def _process_call(call_id: int) -> str:
+    async with _worker_session() as db:
+        result = await db.execute(select(Call).where(Call.id == call_id))
+        call = result.scalar_one_or_none()
+        if call is None:
+            return 'missing'
+        if call.status in {CallStatus.ANALYZED, CallStatus.FAILED}:
+            return call.status.value
+        try:
+            await CallProcessingService.process(db, call)
+        except Exception:
+            return CallStatus.FAILED.value
+        return call.status.value
+
+
+@celery_app.task(name='calls.process')
+def process_call(call_id: int) -> str:
+    return asyncio.run(_process_call(call_id))
+
+
+async def _reanalyze(job_id: int) -> str:
+    async with _worker_session() as db:
+        job = await ReanalysisService.run_job(db, job_id)
+        return job.status.value if job else 'missing'
+
+
+@celery_app.task(name='calls.reanalyze')
+def reanalyze_calls(job_id: int) -> str:
+    return asyncio.run(_reanalyze(job_id))
+
+
+async def _drain_crm_outbox() -> dict:
+    async with _worker_session() as db, open_crm_client(get_settings()) as client:
+        return await CrmSyncService.drain(db, client)
+
+
+@celery_app.task(name='crm.drain_outbox')
+def drain_crm_outbox() -> dict:
+    return asyncio.run(_drain_crm_outbox())
+
+
+async def _enforce_blob_retention() -> dict:
+    async with _worker_session() as db:
+        return await BlobRetentionService.run(db)
+
+
+@celery_app.task(name='blobs.enforce_retention')
+def enforce_blob_retention() -> dict:
+    return asyncio.run(_enforce_blob_retention())
+
+
+async def _trim_content_cache() -> dict:
+    settings = get_settings()
+    if not settings.content_cache_persistent:
+        return {'deleted': 0}
+    async with _worker_session() as db:
+        max_bytes = settings.content_cache_persistent_max_mb * 1024 * 1024
+        return {'deleted': await ContentCacheService.trim(db, max_bytes)}
+
+
+@celery_app.task(name='content_cache.trim')
+def trim_content_cache() -> dict:
+    return asyncio.run(_trim_content_cache())
+
+
+async def _expire_upload_sessions() -> dict:
+    async with _worker_session() as db:
+        return {'deleted': await UploadSessionService.expire(db)}
+
+
+@celery_app.task(name='uploads.expire_sessions')
+def expire_upload_sessions() -> dict:
+    return asyncio.run(_expire_upload_sessions())
@@ -0,0 +1,78 @@
+"""Compare the single-pass analysis engine against the original multi-pass engine.
+
+Run from ``backend/``::
+
+    python -m benchmarks.analysis_matcher --sizes-mb 1 10 50
+"""
+
+import argparse
+import json
+import random
+import time
+
+from app.services.analysis import AnalysisService
+from benchmarks.reference_analysis import ReferenceAnalysisService
+
+FILLER = (
+    'the and we you our team that this is it to of for with on in can really think about so '
+    'what how they customer rollout users onboarding integration platform data report dashboard'
+).split()
+KEYWORDS = (
+    'budget timeline decision next week demo pricing proposal price cost vp director cfo problem '
+    'need pain quarter month deadline contract urgent expensive competitor alternative great '
+    'excellent love concern issue risk slow will send schedule follow up'
+).split()
+
+
+def synthetic_transcript(size_bytes: int, keyword_ratio: float = 0.04, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    parts: list[str] = []
+    length = 0
+    index = 0
+    while length < size_bytes:
+        word = rng.choice(KEYWORDS) if rng.random() < keyword_ratio else rng.choice(FILLER)
+        if index % 14 == 0:
+            word = word.capitalize()
+        word += '. ' if index % 14 == 13 else ' '
+        parts.append(word)
+        length += len(word)
+        index += 1
+    return ''.join(parts)
+
+
+def _best_of(fn, transcript: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(transcript)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes-mb', type=float, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for size_mb in args.sizes_mb:
+        transcript = synthetic_transcript(int(size_mb * 1024 * 1024))
+        assert json.dumps(AnalysisService.analyze(transcript)) == json.dumps(
+            ReferenceAnalysisService.analyze(transcript)
+        )
+        reference = _best_of(ReferenceAnalysisService.analyze, transcript, args.repeat)
+        optimized = _best_of(AnalysisService.analyze, transcript, args.repeat)
+        results.append(
+            {
+                'size_mb': size_mb,
+                'reference_s': round(reference, 4),
+                'single_pass_s': round(optimized, 4),
+                'speedup': round(reference / optimized, 2),
+            }
+        )
+        print(json.dumps(results[-1]))
+
+
+if __name__ == '__main__':
+    main()
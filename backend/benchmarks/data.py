@@ -0,0 +1,134 @@
+"""Synthetic sales-call data for benchmarks.
+
+Transcripts alternate rep and prospect turns drawn from discovery, pricing, objection and
+next-step talk, so they exercise the same vocabulary the analysis engine keys on.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+REP_LINES = (
+    'Thanks for making the time today, I wanted to walk through how your team runs onboarding.',
+    'Can you tell me about the biggest problem you see with reporting right now?',
+    'Who else is involved in the decision, is the VP of sales the decision maker here?',
+    'What does your timeline look like for rolling this out, is this quarter realistic?',
+    'Happy to share pricing once we understand the scope of users and integrations.',
+    'I will send a proposal with the pricing options by Friday.',
+    'Let me schedule a demo with your director and the operations team next week.',
+    'Our customers usually see progress in the first month after the integration is live.',
+    'I will follow up with the security questionnaire and a draft contract.',
+    'What budget range has been set aside for tooling this year?',
+)
+PROSPECT_LINES = (
+    'Honestly the main pain is that our managers spend hours building the weekly dashboard.',
+    'We need something live before the end of the quarter, the deadline is pretty firm.',
+    'Our CFO will want to see the cost breakdown before we commit to anything.',
+    'It sounds great, the team would love to stop exporting data by hand.',
+    'My concern is that it looks expensive compared to what we pay today.',
+    'We are also talking to a competitor, so the price needs to be in the same range.',
+    'There is some risk with the migration, our last rollout was slow and frustrating.',
+    'The budget is approved for this quarter if the numbers work out.',
+    'Send over the proposal and we can review it with the director next week.',
+    'This is really helpful, I am confident the team will be excited about the demo.',
+)
+FILLER_LINES = (
+    'Yeah, that makes sense.',
+    'Sorry, could you repeat the last part, the line cut out for a second.',
+    'Right, so the way it works today is mostly spreadsheets and a couple of scripts.',
+    'We have about forty reps across three regions and a small operations team.',
+    'Got it, and how often does that report go out to leadership?',
+)
+SCORE_COLUMNS = (
+    'sentiment_score',
+    'buying_intent_score',
+    'closing_probability',
+    'engagement_score',
+    'conversation_state',
+    'call_type',
+)
+
+
+def sales_call_transcript(size_bytes: int, seed: int = 1) -> str:
+    """A rep/prospect dialogue of roughly ``size_bytes`` characters."""
+    rng = random.Random(seed)
+    turns: list[str] = []
+    length = 0
+    speaker = 0
+    while length < size_bytes:
+        pool = FILLER_LINES if rng.random() < 0.3 else (REP_LINES, PROSPECT_LINES)[speaker]
+        label = ('Rep', 'Prospect')[speaker]
+        turn = f'{label}: {rng.choice(pool)}\n'
+        turns.append(turn)
+        length += len(turn)
+        speaker ^= 1
+    return ''.join(turns)[:size_bytes]
+
+
+def stored_call_rows(
+    count: int, organization_id: int, user_id: int, seed: int = 1
+) -> dict[str, list[dict[str, Any]]]:
+    """Rows per table for bulk-inserting analyzed calls, spread over the last 90 days.
+
+    Bulk inserts bypass ``Call``'s attribute hooks, so the materialized score columns,
+    the compressed transcripts and the analysis sections are filled in here. Calls get
+    ids ``1..count`` and must go into an empty table.
+    """
+    from app.models.entities import Call, CallStatus
+    from app.services.analysis import AnalysisService
+
+    rng = random.Random(seed)
+    samples = []
+    for index in range(32):
+        transcript = sales_call_transcript(2048, seed=seed + index)
+        call = Call(transcript=transcript, analysis=AnalysisService.analyze(transcript))
+        record = call.transcript_record
+        samples.append(
+            {
+                'scores': {name: getattr(call, name) for name in SCORE_COLUMNS},
+                'transcript': transcript,
+                'content': {
+                    'codec': record.codec,
+                    'content': record.content,
+                    'text_bytes': record.text_bytes,
+                },
+                'sections': [
+                    {'section': item.section, 'position': item.position, 'payload': item.payload}
+                    for item in call.analysis_sections.values()
+                ],
+            }
+        )
+
+    now = datetime.now(timezone.utc)
+    tables: dict[str, list[dict[str, Any]]] = {
+        'calls': [],
+        'call_transcripts': [],
+        'call_analysis_sections': [],
+    }
+    for index in range(count):
+        sample = samples[index % len(samples)]
+        call_id = index + 1
+        tables['calls'].append(
+            {
+                **sample['scores'],
+                'id': call_id,
+                'organization_id': organization_id,
+                'user_id': user_id,
+                'file_name': f'call_{index}.txt',
+                'file_path': f'/dev/null/{index}',
+                'file_size': len(sample['transcript']),
+                'status': CallStatus.ANALYZED,
+                'created_at': now - timedelta(seconds=rng.randrange(90 * 24 * 3600)),
+            }
+        )
+        tables['call_transcripts'].append({**sample['content'], 'call_id': call_id})
+        tables['call_analysis_sections'].extend(
+            {**section, 'call_id': call_id} for section in sample['sections']
+        )
+    return tables
+
+
+def stored_call_transcripts(count: int, seed: int = 1) -> list[tuple[int, str]]:
+    """``(call_id, transcript)`` pairs matching ``stored_call_rows``, for the search index."""
+    transcripts = [sales_call_transcript(2048, seed=seed + index) for index in range(32)]
+    return [(index + 1, transcripts[index % len(transcripts)]) for index in range(count)]
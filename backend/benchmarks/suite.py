@@ -0,0 +1,461 @@
+"""Benchmarks for the upload -> analyze -> list hot paths, with baseline comparison.
+
+Run from ``backend/``::
+
+    python -m benchmarks.suite --output bench.json --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --quick --only analyze auth
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+
+Every result has a ``seconds`` figure (lower is better). With ``--baseline``, any result
+slower than the baseline by more than ``--tolerance`` is reported and the run exits 1.
+Baselines are machine-specific; regenerate them on the machine that runs comparisons.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmarks.data import sales_call_transcript, stored_call_rows, stored_call_transcripts
+
+KB = 1024
+MB = 1024 * KB
+ANALYZE_SIZES = {'1kb': KB, '100kb': 100 * KB, '1mb': MB, '10mb': 10 * MB, '50mb': 50 * MB}
+QUICK_ANALYZE_SIZES = ('1kb', '100kb', '1mb')
+LIST_ROWS = (1_000, 10_000, 100_000)
+QUICK_LIST_ROWS = (1_000, 10_000)
+RARE_TERM = 'escrow'
+PASSWORD = 'Password123!'
+SERIALIZE_PAGE = 100
+BENCHMARKS = ('analyze', 'serialize', 'upload', 'list', 'auth')
+
+
+def _configure_environment(workdir: Path) -> None:
+    # Settings are cached on first import, so point the app at a scratch database and
+    # storage directory before anything under ``app`` is imported.
+    os.environ['DATABASE_URL'] = f"sqlite+aiosqlite:///{workdir / 'bench.db'}"
+    os.environ['STORAGE_PATH'] = str(workdir / 'storage')
+    os.environ['PROFILE_SLOW_REQUEST_MS'] = '0'
+    os.environ['ASYNC_PROCESSING'] = 'false'
+
+
+def _summary(timings: list[float], **extra: Any) -> dict[str, Any]:
+    ordered = sorted(timings)
+    return {
+        'seconds': round(statistics.median(ordered), 6),
+        'min_seconds': round(ordered[0], 6),
+        'p95_seconds': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        'samples': len(ordered),
+        **extra,
+    }
+
+
+async def _timed(call: Callable[[], Awaitable[Any]], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def bench_analyze(sizes: tuple[str, ...], repeat: int) -> dict[str, Any]:
+    from app.services.analysis import AnalysisService
+
+    results = {}
+    for name in sizes:
+        transcript = sales_call_transcript(ANALYZE_SIZES[name])
+        timings: list[float] = []
+        # Small inputs finish in microseconds; keep sampling for ~0.5s so noise averages out.
+        while len(timings) < repeat or (sum(timings) < 0.5 and len(timings) < 1_000):
+            started = time.perf_counter()
+            AnalysisService.analyze(transcript)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        # CPU-bound and single-threaded: best-of is the stable figure to compare.
+        results[f'analyze.{name}'] = {
+            **_summary(timings, mb_per_second=round(len(transcript) / MB / best, 2)),
+            'seconds': round(best, 6),
+        }
+    return results
+
+
+def bench_serialize(calls: int, repeat: int) -> dict[str, Any]:
+    """Per-call cost of turning a page of calls and their stored analyses into JSON bytes."""
+    import orjson
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+
+    from app.core.responses import ORJSONResponse
+    from app.models.entities import CallStatus
+    from app.schemas.calls import CallListItem
+    from app.services.analysis import AnalysisService
+
+    # Analyses as the database hands them over: JSON text.
+    documents = [
+        json.dumps(AnalysisService.analyze(sales_call_transcript(4 * KB, seed=seed)))
+        for seed in range(calls)
+    ]
+    encoded = [document.encode() for document in documents]
+    created_at = datetime.now(timezone.utc)
+    page = TypeAdapter(list[CallListItem])
+
+    def through_models() -> bytes:
+        # Parse each analysis, build and validate the response models, encode them again.
+        items = [
+            CallListItem(
+                id=index,
+                file_name=f'call_{index}.txt',
+                status=CallStatus.ANALYZED,
+                analysis=json.loads(document),
+                created_at=created_at,
+            )
+            for index, document in enumerate(documents)
+        ]
+        content = page.dump_python(page.validate_python(items), mode='json', exclude_unset=True)
+        return JSONResponse(content).body
+
+    def with_fragments() -> bytes:
+        items = [
+            {
+                'id': index,
+                'file_name': f'call_{index}.txt',
+                'status': CallStatus.ANALYZED,
+                'analysis': orjson.Fragment(document),
+                'created_at': created_at,
+            }
+            for index, document in enumerate(encoded)
+        ]
+        return ORJSONResponse(items).body
+
+    assert json.loads(through_models()) == json.loads(with_fragments())
+    results = {}
+    for name, render in {'models': through_models, 'orjson_fragments': with_fragments}.items():
+        timings: list[float] = []
+        while len(timings) < repeat or (sum(timings) < 0.5 and len(timings) < 1_000):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) / calls)
+        results[f'serialize.call.{name}'] = {**_summary(timings), 'seconds': round(min(timings), 9)}
+    return results
+
+
+async def _reset_database() -> None:
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.services.call_content import CallContentService
+    from app.services.content_cache import ContentCacheService
+    from app.services.resource_versions import ResourceVersionCache
+    from app.services.user_cache import UserCacheService
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    ContentCacheService.clear()
+    CallContentService.clear()
+    ResourceVersionCache.clear()
+    UserCacheService.clear()
+
+
+async def _login(client, email: str) -> dict[str, str]:
+    login = await client.post('/api/v1/auth/login', json={'email': email, 'password': PASSWORD})
+    return {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+
+async def _register(client, email: str) -> dict[str, str]:
+    await client.post(
+        '/api/v1/auth/register',
+        json={
+            'organization_name': 'Bench Inc',
+            'full_name': 'Bench Admin',
+            'email': email,
+            'password': PASSWORD,
+        },
+    )
+    return await _login(client, email)
+
+
+def _client():
+    from httpx import ASGITransport, AsyncClient
+
+    from app.main import app
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url='http://bench', timeout=None)
+
+
+async def bench_upload(clients: int, uploads_per_client: int, size: int) -> dict[str, Any]:
+    await _reset_database()
+    async with _client() as client:
+        headers = await _register(client, 'upload@bench.io')
+
+        async def worker(worker_id: int) -> list[float]:
+            timings = []
+            for index in range(uploads_per_client):
+                # Distinct content per upload so the dedup cache does not short-circuit.
+                body = sales_call_transcript(size, seed=worker_id * 10_000 + index).encode()
+                started = time.perf_counter()
+                response = await client.post(
+                    '/api/v1/calls/upload',
+                    headers=headers,
+                    files={'file': (f'bench_{worker_id}_{index}.txt', body, 'text/plain')},
+                )
+                timings.append(time.perf_counter() - started)
+                response.raise_for_status()
+            return timings
+
+        started = time.perf_counter()
+        per_worker = await asyncio.gather(*(worker(worker_id) for worker_id in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    timings = [timing for worker_timings in per_worker for timing in worker_timings]
+    return {
+        f'upload.c{clients}.{size // KB}kb': _summary(
+            timings, uploads_per_second=round(len(timings) / elapsed, 2), clients=clients
+        )
+    }
+
+
+async def _seed_calls(rows: int) -> None:
+    from sqlalchemy import insert, select
+
+    from app.db.search_index import index_transcripts
+    from app.db.session import AsyncSessionLocal
+    from app.models.entities import Call, CallAnalysisSection, CallTranscript, User
+
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.email == 'list@bench.io'))).scalar_one()
+        tables = stored_call_rows(rows, user.organization_id, user.id)
+        for model in (Call, CallTranscript, CallAnalysisSection):
+            payload = tables[model.__tablename__]
+            for start in range(0, len(payload), 5_000):
+                await db.execute(insert(model), payload[start : start + 5_000])
+        transcripts = stored_call_transcripts(rows)
+        await db.run_sync(lambda session: index_transcripts(session.connection(), transcripts))
+        await db.commit()
+
+
+async def _tag_rare_calls(rows: int, term: str, count: int) -> None:
+    from sqlalchemy import select
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.entities import CallTranscript
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CallTranscript).where(CallTranscript.call_id % (rows // count) == 0)
+        )
+        for record in result.scalars():
+            record.text += f' The {term} terms need legal review.'
+        await db.commit()
+
+
+async def _middle_cursor(rows: int) -> str:
+    from sqlalchemy import select
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.entities import Call
+    from app.services.pagination import encode_cursor
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Call.created_at, Call.id)
+            .order_by(Call.created_at.desc(), Call.id.desc())
+            .offset(rows // 2)
+            .limit(1)
+        )
+        created_at, call_id = result.one()
+    return encode_cursor(created_at, call_id)
+
+
+async def bench_list(row_counts: tuple[int, ...], repeat: int) -> dict[str, Any]:
+    results = {}
+    for rows in row_counts:
+        await _reset_database()
+        async with _client() as client:
+            headers = await _register(client, 'list@bench.io')
+            await _seed_calls(rows)
+            cursor = await _middle_cursor(rows)
+            cases = {
+                'first_page': {'limit': 100},
+                'projected': {'limit': 100, 'fields': 'id,status,created_at'},
+                'deep_page': {'limit': 100, 'fields': 'id,status,created_at', 'cursor': cursor},
+            }
+            for case, params in cases.items():
+
+                async def call(params: dict[str, Any] = params) -> None:
+                    response = await client.get('/api/v1/calls', headers=headers, params=params)
+                    response.raise_for_status()
+
+                await call()
+                results[f'list_calls.{rows}.{case}'] = _summary(await _timed(call, repeat))
+
+            async def analytics() -> None:
+                response = await client.get(
+                    '/api/v1/calls/analytics', headers=headers, params={'group_by': 'week'}
+                )
+                response.raise_for_status()
+
+            results[f'analytics.{rows}.week'] = _summary(await _timed(analytics, repeat))
+
+            await _tag_rare_calls(rows, RARE_TERM, 10)
+            # 'rare' matches ten calls; 'common' matches about half, so ranking dominates.
+            for case, term in {'rare': RARE_TERM, 'common': 'questionnaire'}.items():
+
+                async def search(term: str = term) -> None:
+                    response = await client.get(
+                        '/api/v1/calls/search', headers=headers, params={'q': term}
+                    )
+                    response.raise_for_status()
+
+                results[f'search.{rows}.{case}'] = _summary(await _timed(search, repeat))
+    return results
+
+
+async def bench_auth(requests: int) -> dict[str, Any]:
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    await _reset_database()
+    results = {}
+    async with _client() as client:
+        headers = await _register(client, 'auth@bench.io')
+
+        async def health() -> None:
+            (await client.get('/health')).raise_for_status()
+
+        async def authenticated() -> None:
+            (await client.get('/api/v1/calls/cache/stats', headers=headers)).raise_for_status()
+
+        async def login() -> None:
+            response = await client.post(
+                '/api/v1/auth/login', json={'email': 'auth@bench.io', 'password': PASSWORD}
+            )
+            response.raise_for_status()
+
+        results['auth.none'] = _summary(await _timed(health, requests))
+        results['auth.cached_user'] = _summary(await _timed(authenticated, requests))
+
+        ttl = settings.user_cache_ttl_seconds
+        settings.user_cache_ttl_seconds = 0
+        try:
+            results['auth.db_lookup'] = _summary(await _timed(authenticated, requests))
+        finally:
+            settings.user_cache_ttl_seconds = ttl
+
+        claims = settings.auth_token_claims
+        settings.auth_token_claims = True
+        try:
+            headers.update(await _login(client, 'auth@bench.io'))
+            results['auth.token_claims'] = _summary(await _timed(authenticated, requests))
+        finally:
+            settings.auth_token_claims = claims
+
+        results['auth.login'] = _summary(await _timed(login, max(requests // 20, 5)))
+    return results
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[dict[str, Any]]:
+    """Results slower than their baseline entry by more than ``tolerance`` (0.25 = 25%)."""
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous or not previous.get('seconds'):
+            continue
+        ratio = current['seconds'] / previous['seconds']
+        if ratio > 1 + tolerance:
+            regressions.append(
+                {
+                    'name': name,
+                    'baseline_seconds': previous['seconds'],
+                    'seconds': current['seconds'],
+                    'ratio': round(ratio, 2),
+                }
+            )
+    return regressions
+
+
+async def _run_async(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    if 'upload' in args.only:
+        uploads = 5 if args.quick else 20
+        results.update(await bench_upload(args.clients, uploads, 16 * KB))
+    if 'list' in args.only:
+        rows = QUICK_LIST_ROWS if args.quick else LIST_ROWS
+        results.update(await bench_list(rows, args.repeat * 5))
+    if 'auth' in args.only:
+        results.update(await bench_auth(100 if args.quick else 500))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument('--quick', action='store_true', help='smaller sizes for a fast check')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--clients', type=int, default=8, help='concurrent upload clients')
+    parser.add_argument('--output', type=Path, help='write results JSON here')
+    parser.add_argument('--baseline', type=Path, help='compare against this results JSON')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--save-baseline', type=Path, help='write results as the new baseline')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='salesops-bench-') as workdir:
+        _configure_environment(Path(workdir))
+        from app.services.analysis import shutdown_analysis_executor
+
+        results: dict[str, Any] = {}
+        try:
+            if 'analyze' in args.only:
+                sizes = QUICK_ANALYZE_SIZES if args.quick else tuple(ANALYZE_SIZES)
+                results.update(bench_analyze(sizes, args.repeat))
+            if 'serialize' in args.only:
+                results.update(bench_serialize(SERIALIZE_PAGE, args.repeat))
+            results.update(asyncio.run(_run_async(args)))
+        finally:
+            shutdown_analysis_executor()
+
+    report = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+    for name, result in results.items():
+        print(f"{name:<40} {result['seconds'] * 1000:>12.3f} ms")
+
+    status = 0
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())['results']
+        report['regressions'] = compare(results, baseline, args.tolerance)
+        for regression in report['regressions']:
+            print(
+                f"REGRESSION {regression['name']}: {regression['baseline_seconds'] * 1000:.3f} ms"
+                f" -> {regression['seconds'] * 1000:.3f} ms (x{regression['ratio']})"
+            )
+        status = 1 if report['regressions'] else 0
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=2) + '\n')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
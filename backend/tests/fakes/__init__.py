@@ -0,0 +1,5 @@
+"""In-memory stand-ins for the external services the backend talks to.
+
+Tests mount them with ``httpx.ASGITransport``; for local development each one also runs
+on its own, e.g. ``uvicorn fakes.transcriber:app --app-dir backend/tests``.
+"""
@@ -0,0 +1,64 @@
+"""Local stand-in for a CRM batch API.
+
+Used by the outbox drain in tests and local development::
+
+    uvicorn fakes.crm:app --app-dir backend/tests --port 8082
+    CRM_BASE_URL=http://127.0.0.1:8082 uvicorn app.main:app --app-dir backend
+
+Records are upserted by ``ref`` and kept in memory. Batch failures, rejected records
+and latency can be injected to exercise retries and partial failures.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class FakeCrmState:
+    max_batch_size: int = 200
+    latency_seconds: float = 0.0
+    fail_batches: int = 0
+    reject_refs: set[str] = field(default_factory=set)
+    batches: int = 0
+    batch_sizes: list[int] = field(default_factory=list)
+    records: dict[str, dict[str, Any]] = field(default_factory=dict)
+    ids: dict[str, str] = field(default_factory=dict)
+
+
+def create_app(state: FakeCrmState | None = None) -> FastAPI:
+    fake = FastAPI(title='Fake CRM')
+    fake.state.crm = state or FakeCrmState()
+
+    @fake.post('/v1/records/batch')
+    async def upsert_batch(request: Request) -> JSONResponse:
+        current: FakeCrmState = fake.state.crm
+        current.batches += 1
+        if current.batches <= current.fail_batches:
+            return JSONResponse({'error': 'temporarily unavailable'}, status_code=503)
+
+        records = (await request.json()).get('records', [])
+        if len(records) > current.max_batch_size:
+            return JSONResponse({'error': 'batch too large'}, status_code=413)
+        current.batch_sizes.append(len(records))
+        await asyncio.sleep(current.latency_seconds)
+
+        results = []
+        for record in records:
+            ref = str(record['ref'])
+            if ref in current.reject_refs:
+                results.append({'ref': ref, 'status': 'error', 'error': 'validation failed'})
+                continue
+            current.records[ref] = record['fields']
+            record_id = current.ids.setdefault(ref, f'crm-{len(current.ids) + 1}')
+            results.append({'ref': ref, 'status': 'ok', 'id': record_id})
+        return JSONResponse({'results': results})
+
+    return fake
+
+
+app = create_app(FakeCrmState(latency_seconds=float(os.getenv('FAKE_CRM_LATENCY', '0'))))
@@ -0,0 +1,56 @@
+"""Local stand-in for an S3-compatible object store, e.g. MinIO.
+
+Used for the cold blob tier in tests and local development::
+
+    uvicorn fakes.s3:app --app-dir backend/tests --port 9000
+    BLOB_COLD_BACKEND=s3 uvicorn app.main:app --app-dir backend
+
+Objects are kept in memory per bucket with their storage class. Requests must carry an
+AWS Signature V4 ``Authorization`` header; the signature itself is not verified.
+"""
+
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Request, Response
+
+
+@dataclass
+class FakeS3State:
+    objects: dict[tuple[str, str], bytes] = field(default_factory=dict)
+    storage_classes: dict[tuple[str, str], str] = field(default_factory=dict)
+    requests: list[tuple[str, str]] = field(default_factory=list)
+
+
+def create_app(state: FakeS3State | None = None) -> FastAPI:
+    fake = FastAPI(title='Fake S3')
+    fake.state.s3 = state or FakeS3State()
+
+    @fake.api_route('/{bucket}/{key:path}', methods=['GET', 'HEAD', 'PUT', 'DELETE'])
+    async def object_route(bucket: str, key: str, request: Request) -> Response:
+        current: FakeS3State = fake.state.s3
+        current.requests.append((request.method, key))
+        if not request.headers.get('authorization', '').startswith('AWS4-HMAC-SHA256 '):
+            return Response(status_code=403)
+
+        address = (bucket, key)
+        if request.method == 'PUT':
+            current.objects[address] = await request.body()
+            current.storage_classes[address] = request.headers.get(
+                'x-amz-storage-class', 'STANDARD'
+            )
+            return Response(status_code=200)
+        if request.method == 'DELETE':
+            current.objects.pop(address, None)
+            current.storage_classes.pop(address, None)
+            return Response(status_code=204)
+        if address not in current.objects:
+            return Response(status_code=404)
+        body = current.objects[address]
+        if request.method == 'HEAD':
+            return Response(status_code=200, headers={'content-length': str(len(body))})
+        return Response(content=body, media_type='application/octet-stream')
+
+    return fake
+
+
+app = create_app()
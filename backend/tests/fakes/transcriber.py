@@ -0,0 +1,141 @@
+"""Local stand-in for a Deepgram-style transcription API.
+
+Used by the ``fake`` transcription provider in tests and local development::
+
+    uvicorn fakes.transcriber:app --app-dir backend/tests --port 8081
+    TRANSCRIPTION_PROVIDER=fake uvicorn app.main:app --app-dir backend
+
+Transcripts are deterministic: UTF-8 request bodies are echoed back, WAV files made by
+``synthesize_speech`` are decoded back to their words, and anything else becomes a fixed
+sentence derived from the bytes' hash. Latency and transient failures can be injected to
+exercise retries, hedging and concurrency limits.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import sys
+import wave
+from array import array
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class FakeTranscriberState:
+    latency_seconds: float = 0.0
+    slow_requests: int = 0
+    slow_latency_seconds: float = 0.0
+    fail_requests: int = 0
+    requests: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+# Each word is a burst of square wave whose amplitude encodes its vocabulary index, with
+# silence between words, so any slice of a recording decodes to the words it contains.
+VOCABULARY = (
+    'we', 'will', 'send', 'the', 'proposal', 'pricing', 'budget', 'demo', 'next', 'week',
+    'decision', 'timeline', 'team', 'director', 'contract', 'follow', 'up', 'great', 'risk',
+    'quarter', 'approved', 'integration', 'concern', 'expensive', 'competitor', 'schedule',
+)
+AMPLITUDE_STEP = 1000
+SILENCE_THRESHOLD = AMPLITUDE_STEP // 2
+
+
+def synthesize_speech(
+    words: list[str],
+    sample_rate: int = 8000,
+    word_seconds: float = 0.2,
+    gap_seconds: float = 0.1,
+) -> bytes:
+    """A 16-bit mono WAV of ``words`` that ``fake_transcript`` decodes exactly."""
+    samples = array('h')
+    gap = array('h', [0]) * int(gap_seconds * sample_rate)
+    for word in words:
+        amplitude = (VOCABULARY.index(word) + 1) * AMPLITUDE_STEP
+        burst = array('h', [amplitude, -amplitude]) * (int(word_seconds * sample_rate) // 2)
+        samples.extend(burst)
+        samples.extend(gap)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(sample_rate)
+        output.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def _decode_speech(audio: bytes) -> str:
+    with wave.open(io.BytesIO(audio), 'rb') as recording:
+        samples = array('h', recording.readframes(recording.getnframes()))
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    words = []
+    peak = 0
+    for sample in samples:
+        if abs(sample) >= SILENCE_THRESHOLD:
+            peak = max(peak, abs(sample))
+        elif peak:
+            words.append(VOCABULARY[round(peak / AMPLITUDE_STEP) - 1])
+            peak = 0
+    if peak:
+        words.append(VOCABULARY[round(peak / AMPLITUDE_STEP) - 1])
+    return ' '.join(words)
+
+
+def fake_transcript(audio: bytes) -> str:
+    if audio[:4] == b'RIFF' and audio[8:12] == b'WAVE':
+        try:
+            return _decode_speech(audio)
+        except (wave.Error, EOFError, IndexError):
+            pass
+    try:
+        return audio.decode('utf-8')
+    except UnicodeDecodeError:
+        digest = hashlib.sha256(audio).hexdigest()[:12]
+        return f'Fake transcript {digest} for {len(audio)} bytes of audio.'
+
+
+def create_app(state: FakeTranscriberState | None = None) -> FastAPI:
+    fake = FastAPI(title='Fake transcriber')
+    fake.state.transcriber = state or FakeTranscriberState()
+
+    @fake.post('/v1/listen')
+    async def listen(request: Request) -> JSONResponse:
+        current: FakeTranscriberState = fake.state.transcriber
+        current.requests += 1
+        number = current.requests
+        current.in_flight += 1
+        current.max_in_flight = max(current.max_in_flight, current.in_flight)
+        try:
+            audio = await request.body()
+            if number <= current.fail_requests:
+                return JSONResponse({'err_msg': 'try again'}, status_code=503)
+            delay = current.latency_seconds
+            if number <= current.fail_requests + current.slow_requests:
+                delay = current.slow_latency_seconds
+            await asyncio.sleep(delay)
+            transcript = fake_transcript(audio)
+            return JSONResponse(
+                {
+                    'metadata': {'request_id': f'fake-{number}'},
+                    'results': {
+                        'channels': [{'alternatives': [{'transcript': transcript}]}]
+                    },
+                }
+            )
+        finally:
+            current.in_flight -= 1
+
+    return fake
+
+
+app = create_app(
+    FakeTranscriberState(latency_seconds=float(os.getenv('FAKE_TRANSCRIBER_LATENCY', '0')))
+)
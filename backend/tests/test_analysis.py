@@ -0,0 +1,123 @@
+import json
+import random
+
+import pytest
+
+from app.services.analysis import STREAM_BUFFER_CHARS, AnalysisService, TermSearch
+from benchmarks.reference_analysis import ReferenceAnalysisService
+
+
+def _dump(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+FRAGMENTS = [
+    'budget', 'Budget', 'timeline', 'decision maker', 'decision', 'next week', 'next',
+    'costimeline', 'pricing', 'price', 'demo', 'proposal', 'schedule', 'follow up', 'follow',
+    'you will', 'We will', 'willing', 'send', 'vp', 'CFO', 'director', 'problem', 'painful',
+    'expensive', 'concern', 'risk', 'great', 'excellent', "budget's", 'urgent', 'competitor',
+    'alternative', 'contract', 'quarter', 'deadline', 'İ', 'ΑΣ', 'é', '_', '-', "'", '.',
+    '. ', '  ', '\n', '\t', ',', 'the', 'and', 'we',
+]
+
+EDGE_CASES = [
+    '',
+    '.',
+    '...',
+    'costimeline',
+    'decision maker. You will send the proposal next week.',
+    "budget's budget_ budget-budget 'budget' budgets",
+    'ΑΣ.Β will İ follow up',
+    'İstanbul team will schedule a demo. Price is EXPENSIVE.',
+    ' '.join(f'word{i}' for i in range(60)),
+    '. '.join(f'We will send item {i}' for i in range(15)),
+]
+
+
+@pytest.mark.parametrize('transcript', EDGE_CASES)
+def test_analyze_matches_reference_engine_on_edge_cases(transcript: str) -> None:
+    assert _dump(AnalysisService.analyze(transcript)) == _dump(
+        ReferenceAnalysisService.analyze(transcript)
+    )
+    assert AnalysisService.extract_next_steps(transcript) == (
+        ReferenceAnalysisService.extract_next_steps(transcript)
+    )
+
+
+def test_analyze_matches_reference_engine_on_random_transcripts() -> None:
+    rng = random.Random(7)
+    for _ in range(500):
+        transcript = ''.join(
+            rng.choice(FRAGMENTS) + rng.choice(['', ' ', ' ', '.']) for _ in range(rng.randint(1, 80))
+        )
+        assert _dump(AnalysisService.analyze(transcript)) == _dump(
+            ReferenceAnalysisService.analyze(transcript)
+        )
+
+
+def test_analyze_many_matches_sequential_results() -> None:
+    transcripts = [' '.join(FRAGMENTS[i : i + 12]) for i in range(0, len(FRAGMENTS), 3)]
+    assert AnalysisService.analyze_many(transcripts, chunksize=4) == [
+        AnalysisService.analyze(transcript) for transcript in transcripts
+    ]
+
+
+def _chunked(text: str, sizes: list[int]) -> list[str]:
+    chunks, position, index = [], 0, 0
+    while position < len(text):
+        size = sizes[index % len(sizes)]
+        chunks.append(text[position : position + size])
+        position += size
+        index += 1
+    return chunks
+
+
+@pytest.mark.parametrize('transcript', EDGE_CASES)
+def test_analyze_stream_matches_analyze_on_edge_cases(transcript: str) -> None:
+    expected = _dump(AnalysisService.analyze(transcript))
+    for size in (1, 2, 5, 64):
+        assert _dump(AnalysisService.analyze_stream(_chunked(transcript, [size]))) == expected
+
+
+def test_analyze_stream_matches_analyze_on_random_chunkings() -> None:
+    rng = random.Random(11)
+    for _ in range(300):
+        transcript = ''.join(
+            rng.choice(FRAGMENTS) + rng.choice(['', ' ', ' ', '.']) for _ in range(rng.randint(1, 80))
+        )
+        sizes = [rng.randint(1, 40) for _ in range(rng.randint(1, 4))]
+        assert _dump(AnalysisService.analyze_stream(_chunked(transcript, sizes))) == _dump(
+            AnalysisService.analyze(transcript)
+        )
+
+
+def test_analyze_stream_bounds_unpunctuated_runs() -> None:
+    run = 'we will send it ' * (STREAM_BUFFER_CHARS // 8)
+    analysis = AnalysisService.analyze_stream(_chunked(run + '. Budget is fine', [4096]))
+
+    first, second = analysis['follow_up']['referenced_moments']
+    assert first == run[:STREAM_BUFFER_CHARS].strip()
+    assert second == 'Budget is fine'
+    assert analysis['next_steps'][0]['description'] == first
+    assert analysis['executive_summary']['overview'] == ' '.join(run.split()[:48])
+
+
+def test_term_search_finds_terms_split_across_chunks() -> None:
+    rng = random.Random(5)
+    terms = ['Competitor', 'decision maker', 'İ', 'x', '']
+    for _ in range(200):
+        transcript = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 30)))
+        search = TermSearch(terms)
+        for chunk in _chunked(transcript, [rng.randint(1, 6)]):
+            search.feed(chunk)
+        assert search.found == {t.lower() for t in terms if t and t.lower() in transcript.lower()}
+
+
+def test_analyze_file_streams_the_transcript(tmp_path) -> None:
+    transcript = '\r\n'.join(f'Rep: we will send item {i}. Budget is fine' for i in range(400))
+    path = tmp_path / 'call.txt'
+    path.write_bytes(transcript.encode('utf-8'))
+
+    assert AnalysisService.analyze_file(str(path), chunk_size=97) == AnalysisService.analyze(
+        path.read_text(encoding='utf-8')
+    )
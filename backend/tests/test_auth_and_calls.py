@@ -1,20 +1,82 @@
+import asyncio
+import contextlib
+import hashlib
 import io
+import json
+import re
+import threading
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import select
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import BigInteger, event, select, text, update
+from sqlalchemy.dialects import postgresql
+from starlette.requests import Request
 
+from app.api.v1 import calls as calls_api
+from app.core import security
+from app.core.config import get_settings
+from app.core.security import (
+    PasswordHashingBusyError,
+    hash_password,
+    hashing_stats,
+    shutdown_hash_executor,
+    verify_and_update_password,
+)
 from app.db.base import Base
-from app.db.session import engine
+from app.db.compression import compress_text
+from app.db import search_index
+from app.db.porter import porter_stem
+from app.db.search_index import TranscriptIndexer
+from app.db.compact_transcripts import compact
+from app.db.session import AsyncSessionLocal, engine
 from app.main import app
-from app.models.entities import Call, CallStatus
+from app.models import entities
+from app.models.entities import (
+    CALL_CONTENT,
+    Call,
+    CallAnalysisSection,
+    CallStatus,
+    CallTranscript,
+    ContentCacheEntry,
+    CrmOutboxEntry,
+    CrmSyncStatus,
+    Organization,
+    UploadSession,
+    User,
+)
+from app.services import crm
+from app.services import events as event_service
+from app.services import resource_versions
+from app.services import transcription_providers
+from app.services.analysis import AnalysisService
+from app.services.call_content import CallContentService
+from app.services.content_cache import ContentCacheService
+from app.services.crm_sync import run_crm_drain
+from app.services.events import RedisEventBroker, call_channel, get_event_broker
+from app.services.processing import CallProcessingService
+from app.services.resource_versions import CALL, INVALIDATIONS_CHANNEL, ResourceVersionCache
+from app.services.search import highlight_terms, snippet
 from app.services.transcription import TranscriptionService
+from app.services.uploads import UploadSessionService
+from app.services.user_cache import UserCacheService
+from fakes.crm import FakeCrmState
+from fakes.crm import create_app as create_fake_crm
+from fakes.transcriber import VOCABULARY, FakeTranscriberState, synthesize_speech
+from fakes.transcriber import create_app as create_fake_transcriber
 
 
 async def _reset_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+    ContentCacheService.clear()
+    CallContentService.clear()
+    ResourceVersionCache.clear()
+    UserCacheService.clear()
 
 
 @pytest.mark.asyncio
@@ -115,11 +177,12 @@ async def test_upload_failure_marks_call_failed(monkeypatch: pytest.MonkeyPatch)
         assert upload.status_code == 500
 
     async with engine.begin() as conn:
-        result = await conn.execute(select(Call.status, Call.analysis))
-        rows = result.all()
-        assert len(rows) == 1
-        assert rows[0][0] == CallStatus.FAILED
-        assert rows[0][1] == {'error': 'Analysis failed'}
+        result = await conn.execute(select(Call.status))
+        assert result.scalars().all() == [CallStatus.FAILED]
+        result = await conn.execute(
+            select(CallAnalysisSection.section, CallAnalysisSection.payload)
+        )
+        assert result.all() == [('error', 'Analysis failed')]
 
 
 @pytest.mark.asyncio
@@ -149,6 +212,12 @@ async def test_call_crm_sync_and_template_settings() -> None:
         )
         call_id = upload.json()['id']
 
+        # Caches the serialized analysis; the sync below must invalidate it.
+        before = await client.get(
+            f'/api/v1/calls/{call_id}', headers={'Authorization': f'Bearer {token}'}
+        )
+        assert before.json() == upload.json()
+
         sync = await client.post(
             f'/api/v1/calls/{call_id}/sync-crm', headers={'Authorization': f'Bearer {token}'}
         )
@@ -162,6 +231,11 @@ async def test_call_crm_sync_and_template_settings() -> None:
         assert (
             updated.json()['analysis']['structured_payload']['crm_sync']['status'] == 'synced'
         )
+        assert before.json()['crm_synced_at'] is None
+        assert updated.json()['crm_synced_at'] is not None
+        assert updated.headers['etag'] != before.headers['etag']
+        listed = await client.get('/api/v1/calls', headers={'Authorization': f'Bearer {token}'})
+        assert listed.json()[0]['analysis'] == updated.json()['analysis']
 
         save_templates = await client.put(
             '/api/v1/settings/templates',
@@ -178,3 +252,1633 @@ async def test_call_crm_sync_and_template_settings() -> None:
         )
         assert read_templates.status_code == 200
         assert read_templates.json()['call_analysis_template']['framework'] == 'BANT'
+
+
+@pytest.mark.asyncio
+async def test_async_upload_is_processed_by_worker(monkeypatch: pytest.MonkeyPatch) -> None:
+    await _reset_db()
+
+    from app.workers.celery_app import celery_app
+
+    monkeypatch.setattr(get_settings(), 'async_processing', True)
+    monkeypatch.setitem(celery_app.conf, 'task_always_eager', True)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Delta Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@delta.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@delta.com', 'password': 'Password123!'}
+        )
+        token = login.json()['access_token']
+
+        upload = await client.post(
+            '/api/v1/calls/upload',
+            headers={'Authorization': f'Bearer {token}'},
+            files={'file': ('demo.txt', io.BytesIO(b'budget timeline next week demo'), 'text/plain')},
+        )
+        assert upload.status_code == 202
+        assert upload.json()['status'] == 'uploaded'
+
+        fetched = await client.get(
+            f"/api/v1/calls/{upload.json()['id']}", headers={'Authorization': f'Bearer {token}'}
+        )
+        assert fetched.json()['status'] == 'analyzed'
+        assert fetched.json()['analysis']['executive_summary']['call_type'] == 'demo'
+
+
+def _unread_form(*_args, **_kwargs):
+    raise AssertionError('The oversized form should not have been parsed')
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_rejected_and_cleaned_up(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    await _reset_db()
+
+    monkeypatch.setattr(get_settings(), 'max_upload_mb', 1)
+    monkeypatch.setattr(get_settings(), 'upload_chunk_kb', 64)
+    monkeypatch.setattr(get_settings(), 'storage_path', str(tmp_path))
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Epsilon Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@epsilon.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@epsilon.com', 'password': 'Password123!'}
+        )
+        token = login.json()['access_token']
+
+        upload = await client.post(
+            '/api/v1/calls/upload',
+            headers={'Authorization': f'Bearer {token}'},
+            files={'file': ('big.txt', io.BytesIO(b'a' * (1024 * 1024 + 1)), 'text/plain')},
+        )
+        assert upload.status_code == 413
+        assert [path for path in tmp_path.rglob('*') if path.is_file()] == []
+
+        # A declared length over the limit is refused before the form is read at all.
+        with monkeypatch.context() as patched:
+            patched.setattr(Request, 'form', _unread_form)
+            declared = await client.post(
+                '/api/v1/calls/upload',
+                headers={'Authorization': f'Bearer {token}'},
+                files={'file': ('huge.txt', io.BytesIO(b'a' * (2 * 1024 * 1024)), 'text/plain')},
+            )
+        assert declared.status_code == 413
+        assert declared.json()['detail'] == 'File exceeds maximum upload size'
+
+        accepted = await client.post(
+            '/api/v1/calls/upload',
+            headers={'Authorization': f'Bearer {token}'},
+            files={'file': ('ok.txt', io.BytesIO(b'budget timeline'), 'text/plain')},
+        )
+        assert accepted.status_code == 200
+
+    async with engine.begin() as conn:
+        result = await conn.execute(select(Call.file_size, Call.content_hash))
+        size, content_hash = result.one()
+        assert size == len(b'budget timeline')
+        assert content_hash == hashlib.sha256(b'budget timeline').hexdigest()
+    # Uploads past 2 GiB must not overflow the column on Postgres.
+    assert isinstance(Call.__table__.c.file_size.type, BigInteger)
+
+
+async def _failing_ingest(*_args, **_kwargs):
+    raise OSError('Blob store unavailable')
+
+
+@pytest.mark.asyncio
+async def test_resumable_upload_flow(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    await _reset_db()
+
+    monkeypatch.setattr(get_settings(), 'storage_path', str(tmp_path))
+    content = b'Prospect confirmed budget. We will schedule a demo next week.'
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Zeta Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@zeta.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@zeta.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        created = await client.post(
+            '/api/v1/calls/uploads',
+            headers=headers,
+            json={'file_name': 'long call.txt', 'total_size': len(content)},
+        )
+        assert created.status_code == 201
+        upload_id = created.json()['upload_id']
+
+        first = await client.put(
+            f'/api/v1/calls/uploads/{upload_id}?offset=0', headers=headers, content=content[:20]
+        )
+        assert first.json()['received_bytes'] == 20
+
+        stale = await client.put(
+            f'/api/v1/calls/uploads/{upload_id}?offset=0', headers=headers, content=content[:20]
+        )
+        assert stale.status_code == 409
+
+        early = await client.post(f'/api/v1/calls/uploads/{upload_id}/complete', headers=headers)
+        assert early.status_code == 409
+
+        # A second writer at the same offset is turned away while the first is mid-part.
+        writing, resume = asyncio.Event(), asyncio.Event()
+
+        async def slow_part():
+            yield content[20:30]
+            writing.set()
+            await resume.wait()
+            yield content[30:40]
+
+        slow = asyncio.create_task(
+            client.put(
+                f'/api/v1/calls/uploads/{upload_id}?offset=20', headers=headers, content=slow_part()
+            )
+        )
+        await writing.wait()
+        racing = await client.put(
+            f'/api/v1/calls/uploads/{upload_id}?offset=20', headers=headers, content=b'x' * 20
+        )
+        assert racing.status_code == 409
+        resume.set()
+        assert (await slow).json()['received_bytes'] == 40
+
+        status = await client.get(f'/api/v1/calls/uploads/{upload_id}', headers=headers)
+        offset = status.json()['received_bytes']
+        rest = await client.put(
+            f'/api/v1/calls/uploads/{upload_id}?offset={offset}',
+            headers=headers,
+            content=content[offset:],
+        )
+        assert rest.json()['received_bytes'] == len(content)
+
+        # A complete (or part) in flight holds the claim; a second complete is turned away.
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(UploadSession)
+                .where(UploadSession.id == upload_id)
+                .values(
+                    writer_id='other',
+                    writer_expires_at=datetime.now(timezone.utc) + timedelta(minutes=1),
+                )
+            )
+            await db.commit()
+        busy = await client.post(f'/api/v1/calls/uploads/{upload_id}/complete', headers=headers)
+        assert busy.status_code == 409
+
+        # A failed complete gives the claim back, so the client can retry.
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(UploadSession)
+                .where(UploadSession.id == upload_id)
+                .values(writer_id=None, writer_expires_at=None)
+            )
+            await db.commit()
+        with monkeypatch.context() as patch:
+            patch.setattr(calls_api.BlobStore, 'ingest', _failing_ingest)
+            with pytest.raises(OSError):
+                await client.post(f'/api/v1/calls/uploads/{upload_id}/complete', headers=headers)
+
+        completed = await client.post(
+            f'/api/v1/calls/uploads/{upload_id}/complete', headers=headers
+        )
+        assert completed.status_code == 200
+        assert completed.json()['status'] == 'analyzed'
+        assert completed.json()['transcript'] == content.decode()
+
+        gone = await client.get(f'/api/v1/calls/uploads/{upload_id}', headers=headers)
+        assert gone.status_code == 404
+
+    async with engine.begin() as conn:
+        result = await conn.execute(select(Call.content_hash))
+        assert result.scalar_one() == hashlib.sha256(content).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_abandoned_upload_sessions_expire_with_their_part_files(tmp_path) -> None:
+    await _reset_db()
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        org = Organization(name='Expiry Inc')
+        db.add(org)
+        await db.flush()
+        user = User(
+            organization_id=org.id, email='rep@expiry.com', full_name='Rep', hashed_password='x'
+        )
+        db.add(user)
+        await db.flush()
+        for name, age, writer in (('old', 30, None), ('writing', 30, 'w'), ('fresh', 1, None)):
+            part = tmp_path / f'{name}.part'
+            part.write_bytes(b'partial')
+            db.add(
+                UploadSession(
+                    id=name,
+                    organization_id=org.id,
+                    user_id=user.id,
+                    file_name=f'{name}.txt',
+                    part_path=str(part),
+                    total_size=100,
+                    received_bytes=7,
+                    writer_id=writer,
+                    writer_expires_at=now + timedelta(minutes=1) if writer else None,
+                    created_at=now - timedelta(hours=age),
+                )
+            )
+        await db.commit()
+
+        assert await UploadSessionService.expire(db, now) == 1
+        remaining = (await db.execute(select(UploadSession.id))).scalars().all()
+        assert sorted(remaining) == ['fresh', 'writing']
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['fresh.part', 'writing.part']
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_reuses_blob_and_analysis(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    await _reset_db()
+
+    monkeypatch.setattr(get_settings(), 'storage_path', str(tmp_path))
+    monkeypatch.setattr(get_settings(), 'content_cache_persistent', True)
+    content = b'Pricing concern raised, we will follow up with the CFO next week.'
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Eta Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@eta.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@eta.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        first = await client.post(
+            '/api/v1/calls/upload',
+            headers=headers,
+            files={'file': ('call.txt', io.BytesIO(content), 'text/plain')},
+        )
+        ContentCacheService.clear()  # force the second lookup through the persistent table
+
+        async def _unexpected(_: str) -> str:
+            raise AssertionError('duplicate upload should not be transcribed again')
+
+        monkeypatch.setattr(TranscriptionService, 'transcribe', _unexpected)
+        second = await client.post(
+            '/api/v1/calls/upload',
+            headers=headers,
+            files={'file': ('call-copy.txt', io.BytesIO(content), 'text/plain')},
+        )
+        assert second.status_code == 200
+        assert second.json()['analysis'] == first.json()['analysis']
+
+        stats = await client.get('/api/v1/calls/cache/stats', headers=headers)
+        assert stats.json()['upload'] == {'hits': 1, 'misses': 0, 'persistent_hits': 1}
+        assert stats.json()['analysis']['persistent_hits'] == 1
+
+        # Counters are per organization: another tenant sees none of these lookups.
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Iota Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@iota.com',
+                'password': 'Password123!',
+            },
+        )
+        other = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@iota.com', 'password': 'Password123!'}
+        )
+        other_stats = await client.get(
+            '/api/v1/calls/cache/stats',
+            headers={'Authorization': f"Bearer {other.json()['access_token']}"},
+        )
+        assert other_stats.json()['upload'] == {'hits': 0, 'misses': 0, 'persistent_hits': 0}
+
+    assert len([path for path in tmp_path.rglob('*') if path.is_file()]) == 1
+    async with engine.begin() as conn:
+        result = await conn.execute(select(Call.file_path))
+        paths = result.scalars().all()
+        assert len(paths) == 2 and paths[0] == paths[1]
+
+
+@pytest.mark.asyncio
+async def test_content_cache_evicts_least_recently_hit_within_byte_budgets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'content_cache_persistent', True)
+    monkeypatch.setattr(get_settings(), 'content_cache_max_mb', 1)
+    transcript = 'x' * 400 * 1024
+
+    async with AsyncSessionLocal() as db:
+        for name in ('a', 'b', 'c'):
+            await ContentCacheService.put_upload(db, name, transcript)
+        await db.commit()
+        # Three ~400 KB transcripts do not fit the 1 MB in-memory budget.
+        assert ContentCacheService._cache('upload').stats()['entries'] == 2
+
+        ContentCacheService.clear()
+        await db.execute(
+            update(ContentCacheEntry).values(last_hit_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+        )
+        await db.commit()
+        assert await ContentCacheService.get_upload(db, 1, 'a') is not None
+        await db.commit()
+
+        assert await ContentCacheService.trim(db, 500 * 1024) == 2
+        keys = (await db.execute(select(ContentCacheEntry.cache_key))).scalars().all()
+        assert keys == ['a']
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_scores_transcripts_and_rescores_calls() -> None:
+    await _reset_db()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Theta Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@theta.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@theta.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        upload = await client.post(
+            '/api/v1/calls/upload',
+            headers=headers,
+            files={'file': ('demo.txt', io.BytesIO(b'budget timeline next week demo'), 'text/plain')},
+        )
+        call_id = upload.json()['id']
+        await client.post(f'/api/v1/calls/{call_id}/sync-crm', headers=headers)
+
+        batch = await client.post(
+            '/api/v1/calls/analyze-batch',
+            headers=headers,
+            json={'transcripts': ['pricing proposal', 'we will schedule a demo'], 'call_ids': [call_id]},
+        )
+        assert batch.status_code == 200
+        body = batch.json()
+        assert [item['executive_summary']['call_type'] for item in body['analyses']] == [
+            'negotiation',
+            'demo',
+        ]
+        assert body['rescored_call_ids'] == [call_id]
+
+        fetched = await client.get(f'/api/v1/calls/{call_id}', headers=headers)
+        assert fetched.json()['analysis']['structured_payload']['crm_sync']['status'] == 'synced'
+
+
+@pytest.mark.asyncio
+async def test_list_calls_keyset_pagination_projection_and_filters(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await _reset_db()
+    monkeypatch.setattr(calls_api, 'DEFAULT_PAGE_SIZE', 2)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Kappa Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@kappa.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@kappa.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        for index in range(3):
+            await client.post(
+                '/api/v1/calls/upload',
+                headers=headers,
+                files={'file': (f'call{index}.txt', io.BytesIO(b'budget %d' % index), 'text/plain')},
+            )
+
+        first = await client.get(
+            '/api/v1/calls', headers=headers, params={'limit': 2, 'fields': 'file_name,status'}
+        )
+        assert first.status_code == 200
+        assert first.json() == [
+            {'id': 3, 'file_name': 'call2.txt', 'status': 'analyzed'},
+            {'id': 2, 'file_name': 'call1.txt', 'status': 'analyzed'},
+        ]
+        cursor = first.headers['X-Next-Cursor']
+
+        second = await client.get(
+            '/api/v1/calls', headers=headers, params={'limit': 2, 'fields': 'id', 'cursor': cursor}
+        )
+        assert second.json() == [{'id': 1}]
+        assert 'X-Next-Cursor' not in second.headers
+
+        # Without limit or cursor nothing is cut off; a cursor alone pages by the default.
+        unpaged = await client.get('/api/v1/calls', headers=headers, params={'fields': 'id'})
+        assert unpaged.json() == [{'id': 3}, {'id': 2}, {'id': 1}]
+        assert 'X-Next-Cursor' not in unpaged.headers
+        resumed = await client.get(
+            '/api/v1/calls', headers=headers, params={'fields': 'id', 'cursor': cursor}
+        )
+        assert resumed.json() == [{'id': 1}]
+
+        failed = await client.get('/api/v1/calls', headers=headers, params={'status': 'failed'})
+        assert failed.json() == []
+
+        # Bounds in any zone compare against the stored UTC times.
+        ahead = timezone(timedelta(hours=5))
+        recent = datetime.now(ahead) - timedelta(minutes=5)
+        since = await client.get(
+            '/api/v1/calls', headers=headers, params={'created_from': recent.isoformat()}
+        )
+        assert len(since.json()) == 3
+        until = await client.get(
+            '/api/v1/calls', headers=headers, params={'created_to': recent.isoformat()}
+        )
+        assert until.json() == []
+
+        unknown = await client.get('/api/v1/calls', headers=headers, params={'fields': 'secret'})
+        assert unknown.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_call_analytics_aggregates_materialized_scores() -> None:
+    await _reset_db()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Lambda Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@lambda.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@lambda.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        transcripts = [
+            b'We have budget approved and need this next quarter. Send a proposal and demo.',
+            b'Too expensive for us, we already use a competitor.',
+        ]
+        for index, content in enumerate(transcripts):
+            await client.post(
+                '/api/v1/calls/upload',
+                headers=headers,
+                files={'file': (f'call{index}.txt', io.BytesIO(content), 'text/plain')},
+            )
+
+        calls = (await client.get('/api/v1/calls', headers=headers)).json()
+        scores = [call['analysis']['scores'] for call in calls]
+
+        async with engine.connect() as conn:
+            stored = await conn.execute(
+                select(Call.closing_probability, Call.conversation_state, Call.call_type).order_by(
+                    Call.id.desc()
+                )
+            )
+            rows = stored.all()
+        assert [row.closing_probability for row in rows] == [
+            score['closing_probability'] for score in scores
+        ]
+        assert [row.conversation_state for row in rows] == [
+            call['analysis']['structured_payload']['conversation_state'] for call in calls
+        ]
+
+        by_rep = await client.get('/api/v1/calls/analytics', headers=headers)
+        assert by_rep.status_code == 200
+        body = by_rep.json()
+        assert body['group_by'] == 'rep'
+        assert body['totals']['calls'] == 2
+        assert body['totals']['avg_sentiment'] == round(
+            sum(score['sentiment_score'] for score in scores) / 2, 2
+        )
+        assert body['groups'][0]['label'] == 'Admin User'
+        assert body['groups'][0]['calls'] == 2
+        assert sum(body['totals'][state] for state in ('hot', 'warm', 'nurture')) == 2
+
+        by_week = await client.get(
+            '/api/v1/calls/analytics', headers=headers, params={'group_by': 'week'}
+        )
+        assert [group['calls'] for group in by_week.json()['groups']] == [2]
+
+        by_type = await client.get(
+            '/api/v1/calls/analytics', headers=headers, params={'group_by': 'call_type'}
+        )
+        assert sum(group['calls'] for group in by_type.json()['groups']) == 2
+
+        invalid = await client.get(
+            '/api/v1/calls/analytics', headers=headers, params={'group_by': 'region'}
+        )
+        assert invalid.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_user_cache_skips_lookup_and_invalidates_on_deactivation() -> None:
+    await _reset_db()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Mu Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@mu.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@mu.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        assert (await client.get('/api/v1/calls', headers=headers)).status_code == 200
+        assert (await client.get('/api/v1/calls', headers=headers)).status_code == 200
+        assert UserCacheService.stats()['hits'] == 1
+
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(select(User).where(User.email == 'admin@mu.com'))).scalar_one()
+            user.is_active = False
+            await db.commit()
+
+        deactivated = await client.get('/api/v1/calls', headers=headers)
+        assert deactivated.status_code == 401
+
+        # Bulk statements bypass the mapper events; they must not leave stale entries.
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(User).values(is_active=True))
+            await db.commit()
+        assert (await client.get('/api/v1/calls', headers=headers)).status_code == 200
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(User).where(User.email == 'admin@mu.com').values(is_active=False)
+            )
+            await db.commit()
+        assert (await client.get('/api/v1/calls', headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_conditional_gets_answer_304_from_cached_versions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'server_timing_enabled', True)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        for name in ('Nu', 'Xi'):
+            await client.post(
+                '/api/v1/auth/register',
+                json={
+                    'organization_name': f'{name} Inc',
+                    'full_name': 'Admin User',
+                    'email': f'admin@{name.lower()}.com',
+                    'password': 'Password123!',
+                },
+            )
+        logins = [
+            await client.post(
+                '/api/v1/auth/login', json={'email': email, 'password': 'Password123!'}
+            )
+            for email in ('admin@nu.com', 'admin@xi.com')
+        ]
+        headers, other = [
+            {'Authorization': f"Bearer {login.json()['access_token']}"} for login in logins
+        ]
+        upload = await client.post(
+            '/api/v1/calls/upload',
+            headers=headers,
+            files={'file': ('nu.txt', io.BytesIO(b'Budget is approved.'), 'text/plain')},
+        )
+        url = f"/api/v1/calls/{upload.json()['id']}"
+
+        first = await client.get(url, headers=headers)
+        etag = first.headers['ETag']
+        assert first.json() == upload.json()
+        assert first.headers['Cache-Control'] == 'private, no-cache'
+        assert first.headers['Vary'] == 'Authorization'
+
+        cached = await client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert cached.status_code == 304 and cached.content == b''
+        assert cached.headers['ETag'] == etag
+        assert 'desc="0 queries"' in cached.headers['Server-Timing']
+
+        ResourceVersionCache.clear()
+        weak = await client.get(url, headers={**headers, 'If-None-Match': f'"stale", W/{etag}'})
+        assert weak.status_code == 304
+        assert 'desc="1 queries"' in weak.headers['Server-Timing']
+        foreign = await client.get(url, headers={**other, 'If-None-Match': etag})
+        assert foreign.status_code == 404
+
+        # The calls row is untouched by a transcript rewrite; the version still moves.
+        async with AsyncSessionLocal() as db:
+            call = await db.get(Call, upload.json()['id'], options=CALL_CONTENT)
+            call.transcript = 'Budget is approved for next quarter.'
+            await db.commit()
+        changed = await client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.json()['transcript'] == 'Budget is approved for next quarter.'
+        assert changed.headers['ETag'] != etag
+
+        templates = await client.get('/api/v1/settings/templates', headers=headers)
+        templates_etag = templates.headers['ETag']
+        unchanged = await client.get(
+            '/api/v1/settings/templates', headers={**headers, 'If-None-Match': templates_etag}
+        )
+        assert unchanged.status_code == 304
+        put = await client.put(
+            '/api/v1/settings/templates',
+            headers=headers,
+            json={'crm_field_mapping': {'prospect_email': 'Contact.Email'}},
+        )
+        saved = await client.get(
+            '/api/v1/settings/templates', headers={**headers, 'If-None-Match': templates_etag}
+        )
+        assert saved.status_code == 200
+        assert saved.json()['crm_field_mapping'] == {'prospect_email': 'Contact.Email'}
+        assert saved.headers['ETag'] != templates_etag
+        assert put.headers['ETag'] == saved.headers['ETag']
+        assert put.json() == saved.json()
+        revalidated = await client.get(
+            '/api/v1/settings/templates', headers={**headers, 'If-None-Match': put.headers['ETag']}
+        )
+        assert revalidated.status_code == 304
+
+
+class _LoopbackRedis:
+    """Redis pub/sub delivering every publish to this process's subscribers."""
+
+    def __init__(self) -> None:
+        self.published: list[tuple[str, dict]] = []
+        self.queues: list[asyncio.Queue] = []
+
+    async def publish(self, channel: str, data: str) -> None:
+        self.published.append((channel, json.loads(data)))
+        for queue in self.queues:
+            queue.put_nowait({'data': data})
+
+    def pubsub(self, **_):
+        redis = self
+
+        class PubSub:
+            async def subscribe(self, channel: str) -> None:
+                self.queue = asyncio.Queue()
+                redis.queues.append(self.queue)
+
+            async def listen(self):
+                while True:
+                    yield await self.queue.get()
+
+            async def unsubscribe(self, channel: str) -> None:
+                redis.queues.remove(self.queue)
+
+            async def aclose(self) -> None:
+                pass
+
+        return PubSub()
+
+
+@pytest.mark.asyncio
+async def test_version_cache_applies_invalidations_broadcast_by_other_processes(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await _reset_db()
+    broker = RedisEventBroker('redis://unused', 8)
+    redis = _LoopbackRedis()
+    monkeypatch.setattr(broker, '_client', lambda: redis)
+    monkeypatch.setattr(resource_versions, 'get_event_broker', lambda: broker)
+
+    async with AsyncSessionLocal() as db:
+        org = Organization(name='Omicron Inc')
+        db.add(org)
+        await db.flush()
+        user = User(
+            organization_id=org.id,
+            email='rep@omicron.com',
+            full_name='Rep',
+            hashed_password='x',
+        )
+        db.add(user)
+        await db.flush()
+        call = Call(
+            organization_id=org.id,
+            user_id=user.id,
+            file_name='omicron.txt',
+            file_path=str(tmp_path / 'omicron.txt'),
+        )
+        db.add(call)
+        await db.commit()
+
+        # Not subscribed yet: another process's writes could go unnoticed, so no answers.
+        ResourceVersionCache.put(CALL, call.id, org.id, call.version)
+        assert ResourceVersionCache.get(CALL, call.id, org.id) is None
+
+        listener = asyncio.create_task(ResourceVersionCache.listen())
+        try:
+            async with asyncio.timeout(5):
+                while not redis.queues:
+                    await asyncio.sleep(0)
+                ResourceVersionCache.put(CALL, call.id, org.id, call.version)
+                assert ResourceVersionCache.get(CALL, call.id, org.id) == call.version
+
+                # Another process bumped the call and broadcast it.
+                await broker.publish(INVALIDATIONS_CHANNEL, {'resources': [[CALL, call.id]]})
+                while ResourceVersionCache.get(CALL, call.id, org.id) is not None:
+                    await asyncio.sleep(0)
+
+                # Commits here are broadcast to the others.
+                call.status = CallStatus.FAILED
+                await db.commit()
+                await ResourceVersionCache.flush()
+                assert redis.published[-1] == (
+                    INVALIDATIONS_CHANNEL, {'resources': [[CALL, call.id]]}
+                )
+        finally:
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
+
+
+@pytest.mark.asyncio
+async def test_claims_mode_authenticates_without_database(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'auth_token_claims', True)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Nu Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@nu.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@nu.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        statements: list[str] = []
+
+        def record(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, 'before_cursor_execute', record)
+        try:
+            stats = await client.get('/api/v1/calls/cache/stats', headers=headers)
+        finally:
+            event.remove(engine.sync_engine, 'before_cursor_execute', record)
+        assert stats.status_code == 200
+        assert statements == []
+
+        me = await client.get('/api/v1/auth/me', headers=headers)
+        assert me.json()['email'] == 'admin@nu.com'
+        assert me.json()['role'] == 'admin'
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_password_when_rounds_change(monkeypatch: pytest.MonkeyPatch) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'password_hash_rounds', 1000)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Xi Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@xi.com',
+                'password': 'Password123!',
+            },
+        )
+        monkeypatch.setattr(get_settings(), 'password_hash_rounds', 2000)
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@xi.com', 'password': 'Password123!'}
+        )
+        assert login.status_code == 200
+
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(select(User).where(User.email == 'admin@xi.com'))).scalar_one()
+        assert user.hashed_password.startswith('$pbkdf2-sha256$2000$')
+
+        wrong = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@xi.com', 'password': 'Wrong123!'}
+        )
+        assert wrong.status_code == 401
+
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        stats = await client.get('/api/v1/auth/hashing/stats', headers=headers)
+        assert stats.json()['rehashed'] >= 1
+        assert stats.json()['queued'] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hashing_waiters_leave_the_queue(monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'password_hash_workers', 1)
+    monkeypatch.setattr(settings, 'password_hash_max_queue', 1)
+    shutdown_hash_executor()
+    release = threading.Event()
+    try:
+        busy = asyncio.create_task(security._run_hashing(release.wait))
+        while hashing_stats.running == 0:
+            await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(hash_password('Password123!'))
+        while hashing_stats.queued == 0:
+            await asyncio.sleep(0)
+        with pytest.raises(PasswordHashingBusyError):
+            await hash_password('Password123!')
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert hashing_stats.queued == 0
+
+        release.set()
+        await busy
+        assert (await verify_and_update_password('x', await hash_password('x')))[0]
+        assert hashing_stats.snapshot()['queued'] == 0
+    finally:
+        release.set()
+        shutdown_hash_executor()
+
+
+@pytest.mark.asyncio
+async def test_requests_report_query_stats_in_server_timing(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'server_timing_enabled', True)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Omicron Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@omicron.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@omicron.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        listed = await client.get('/api/v1/calls', headers=headers)
+        assert 'desc="2 queries"' in listed.headers['Server-Timing']
+
+        rejected = await client.get(
+            '/api/v1/calls', headers={'Authorization': 'Bearer not-a-token'}
+        )
+        assert rejected.status_code == 401
+        assert 'desc="0 queries"' in rejected.headers['Server-Timing']
+        assert 'desc="0 checkouts"' in rejected.headers['Server-Timing']
+
+        monkeypatch.setattr(get_settings(), 'server_timing_enabled', False)
+        hidden = await client.get('/api/v1/calls', headers=headers)
+        assert hidden.status_code == 200
+        assert 'Server-Timing' not in hidden.headers
+
+
+@pytest.mark.asyncio
+async def test_metrics_expose_route_and_stage_histograms(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'profile_slow_request_ms', 0.001)
+    monkeypatch.setattr(get_settings(), 'profile_path', str(tmp_path))
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Pi Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@pi.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@pi.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        for index in range(3):
+            await client.post(
+                '/api/v1/calls/upload',
+                headers=headers,
+                files={'file': (f'call{index}.txt', io.BytesIO(b'budget %d' % index), 'text/plain')},
+            )
+
+        assert (await client.get('/metrics')).status_code == 403
+        monkeypatch.setattr(get_settings(), 'metrics_token', 'scrape-secret')
+        assert (await client.get('/metrics', headers=headers)).status_code == 401
+        metrics = await client.get(
+            '/metrics', headers={'Authorization': 'Bearer scrape-secret'}
+        )
+        assert metrics.status_code == 200
+        body = metrics.text
+        assert (
+            'salesops_http_request_duration_seconds_count'
+            '{method="POST",route="/api/v1/calls/upload",status="200"}'
+        ) in body
+        for stage in ('file_write', 'transcription', 'analysis', 'db_commit'):
+            assert f'route="/api/v1/calls/upload",stage="{stage}"' in body
+
+    assert list(tmp_path.glob('*_POST_api_v1_calls_upload_*.folded'))
+
+
+@pytest.mark.asyncio
+async def test_large_uploads_are_analyzed_from_a_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'analysis_stream_threshold_mb', 0)
+    monkeypatch.setattr(get_settings(), 'analysis_stream_chunk_kb', 1)
+    monkeypatch.setattr(get_settings(), 'search_index_max_kb', 4)
+    content = '. '.join(f'We will send the budget proposal {i} next week' for i in range(300))
+    # Straddles the first chunk boundary, so neither chunk alone contains the term.
+    content = content[:1020] + ' procurement ' + content[1020:] + ' Zanzibar.'
+
+    async def read_whole_file(*_args, **_kwargs):
+        raise AssertionError('large transcripts must not be read whole')
+
+    monkeypatch.setattr(TranscriptionService, 'transcribe', read_whole_file)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Rho Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@rho.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@rho.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        await client.put(
+            '/api/v1/settings/templates',
+            headers=headers,
+            json={
+                'crm_field_mapping': {},
+                'call_analysis_template': {'objection_terms': ['Procurement']},
+            },
+        )
+        upload = await client.post(
+            '/api/v1/calls/upload',
+            headers=headers,
+            files={'file': ('large.txt', io.BytesIO(content.encode()), 'text/plain')},
+        )
+        found = await client.get(
+            '/api/v1/calls/search', params={'q': 'procurement'}, headers=headers
+        )
+        # Past SEARCH_INDEX_MAX_KB: stored and analyzed, but not indexed.
+        unindexed = await client.get(
+            '/api/v1/calls/search', params={'q': 'zanzibar'}, headers=headers
+        )
+
+    assert upload.status_code == 200
+    body = upload.json()
+    assert body['transcript'] == content
+    expected = AnalysisService.analyze(content)
+    assert body['analysis']['scores'] == expected['scores']
+    assert body['analysis']['next_steps'] == expected['next_steps']
+    assert body['analysis']['objections'] == ['procurement']
+    assert [hit['id'] for hit in found.json()] == [body['id']]
+    assert unindexed.json() == []
+
+
+def test_transcript_indexer_keeps_only_the_indexed_prefix(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), 'search_index_max_kb', 1)
+    indexer = TranscriptIndexer(1)
+    for _ in range(100):
+        indexer.feed('budget proposal ' * 64)
+    assert sum(len(piece) for piece in indexer._pieces) == 1025
+
+    assert search_index._prefix(''.join(indexer._pieces), 1024) == 'budget proposal ' * 64
+    # Cut at a word boundary: no half word reaches the index.
+    assert search_index._prefix('budget proposal next week', 12) == 'budget '
+    assert search_index._prefix('budget proposal', 15) == 'budget proposal'
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_call_events_stream_processing_progress(tmp_path) -> None:
+    await _reset_db()
+    transcript_path = tmp_path / 'discovery.txt'
+    transcript_path.write_text('Budget is approved. I will send the proposal next week.')
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Sigma Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@sigma.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@sigma.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(select(User))).scalar_one()
+            call = Call(
+                organization_id=user.organization_id,
+                user_id=user.id,
+                file_name='discovery.txt',
+                file_path=str(transcript_path),
+                file_size=transcript_path.stat().st_size,
+            )
+            db.add(call)
+            await db.commit()
+
+            stream = asyncio.create_task(
+                client.get(f'/api/v1/calls/{call.id}/events', headers=headers)
+            )
+            while not get_event_broker().subscriber_count(call_channel(call.id)):
+                await asyncio.sleep(0.01)
+            await CallProcessingService.process(db, call)
+            response = await asyncio.wait_for(stream, timeout=5)
+
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/event-stream')
+        events = _parse_sse(response.text)
+        statuses = [data['status'] for name, data in events if name == 'status']
+        assert statuses == ['uploaded', 'transcribed', 'analyzed']
+        assert [data['stage'] for name, data in events if name == 'stage'] == [
+            'transcription',
+            'analysis',
+        ]
+        sections = {data['section']: data['value'] for name, data in events if name == 'analysis'}
+        assert sections['scores'] == call.analysis['scores']
+        assert events[-1] == ('status', {'status': 'analyzed'})
+
+        settled = await client.get(f'/api/v1/calls/{call.id}/events', headers=headers)
+        assert _parse_sse(settled.text) == [('status', {'status': 'analyzed'})]
+        missing = await client.get('/api/v1/calls/9999/events', headers=headers)
+        assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_partial_transcripts_are_appended_then_compressed_and_indexed_once(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await _reset_db()
+    transport = ASGITransport(app=create_fake_transcriber(FakeTranscriberState()))
+    monkeypatch.setattr(transcription_providers, 'client_transport', transport)
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'transcription_provider', 'fake')
+    monkeypatch.setattr(settings, 'fake_transcriber_url', 'http://fake-transcriber')
+    monkeypatch.setattr(settings, 'transcription_backoff_seconds', 0)
+    monkeypatch.setattr(settings, 'transcription_chunk_seconds', 3)
+    monkeypatch.setattr(settings, 'transcription_chunk_overlap_seconds', 1)
+    monkeypatch.setattr(settings, 'transcription_silence_search_seconds', 0.5)
+    monkeypatch.setattr(settings, 'transcription_max_concurrency', 1)
+    words = [VOCABULARY[index % len(VOCABULARY)] for index in range(60)]
+    path = tmp_path / 'long.wav'
+    path.write_bytes(synthesize_speech(words))
+
+    compressed = []
+    monkeypatch.setattr(
+        entities, 'compress_text', lambda text: compressed.append(text) or compress_text(text)
+    )
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', record)
+    try:
+        async with AsyncSessionLocal() as db:
+            org = Organization(name='Phi Inc')
+            db.add(org)
+            await db.flush()
+            user = User(
+                organization_id=org.id,
+                email='rep@phi.com',
+                full_name='Rep',
+                hashed_password='x',
+            )
+            db.add(user)
+            await db.flush()
+            call = Call(
+                organization_id=org.id,
+                user_id=user.id,
+                file_name='long.wav',
+                file_path=str(path),
+                file_size=path.stat().st_size,
+            )
+            db.add(call)
+            await db.commit()
+            await CallProcessingService.process(db, call)
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', record)
+
+    appends = [sql for sql in statements if '|| ?' in sql and 'call_transcripts' in sql]
+    assert len(appends) >= 2
+    assert compressed == [' '.join(words)]
+    assert sum('INSERT INTO calls_fts' in sql for sql in statements) == 1
+    async with AsyncSessionLocal() as db:
+        stored = await db.get(CallTranscript, call.id)
+        assert stored.codec == 'zlib'
+        assert stored.text == ' '.join(words)
+        assert stored.text_bytes == len(' '.join(words))
+
+
+class _DroppedPubSub:
+    async def subscribe(self, channel: str) -> None:
+        pass
+
+    async def listen(self):
+        yield {'data': json.dumps({'event': 'stage', 'data': {'stage': 'transcription'}})}
+        raise RedisConnectionError('Connection closed by server.')
+
+    async def unsubscribe(self, channel: str) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_call_events_stream_ends_when_the_redis_relay_dies(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await _reset_db()
+    broker = RedisEventBroker('redis://unused', 8)
+    redis = SimpleNamespace(pubsub=lambda **_: _DroppedPubSub())
+    monkeypatch.setattr(broker, '_client', lambda: redis)
+    monkeypatch.setattr(event_service, 'get_event_broker', lambda: broker)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Upsilon Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@upsilon.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@upsilon.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(select(User))).scalar_one()
+            call = Call(
+                organization_id=user.organization_id,
+                user_id=user.id,
+                file_name='pending.txt',
+                file_path=str(tmp_path / 'pending.txt'),
+            )
+            db.add(call)
+            await db.commit()
+
+        # The response task group re-raises the relay's error instead of keeping it open.
+        with pytest.raises(ExceptionGroup) as raised:
+            await asyncio.wait_for(
+                client.get(f'/api/v1/calls/{call.id}/events', headers=headers), timeout=5
+            )
+        assert raised.group_contains(RedisConnectionError)
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_transcripts_with_snippets_and_org_scope() -> None:
+    await _reset_db()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        headers = {}
+        for org in ('tau', 'upsilon'):
+            await client.post(
+                '/api/v1/auth/register',
+                json={
+                    'organization_name': f'{org.title()} Inc',
+                    'full_name': 'Admin User',
+                    'email': f'admin@{org}.com',
+                    'password': 'Password123!',
+                },
+            )
+            login = await client.post(
+                '/api/v1/auth/login', json={'email': f'admin@{org}.com', 'password': 'Password123!'}
+            )
+            headers[org] = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        uploads = {
+            'mention.txt': 'They are evaluating a competitor. Pricing came up briefly.',
+            'focus.txt': 'The competitor is cheaper. Our competitor comparison wins on support.',
+            'other.txt': 'Budget is approved and the demo is next week.',
+        }
+        ids = {}
+        for name, content in uploads.items():
+            upload = await client.post(
+                '/api/v1/calls/upload',
+                headers=headers['tau'],
+                files={'file': (name, io.BytesIO(content.encode()), 'text/plain')},
+            )
+            ids[name] = upload.json()['id']
+        await client.post(
+            '/api/v1/calls/upload',
+            headers=headers['upsilon'],
+            files={'file': ('rival.txt', io.BytesIO(b'A competitor called.'), 'text/plain')},
+        )
+
+        search = await client.get(
+            '/api/v1/calls/search', params={'q': 'competitors'}, headers=headers['tau']
+        )
+        assert search.status_code == 200
+        results = search.json()
+        assert [item['id'] for item in results] == [ids['focus.txt'], ids['mention.txt']]
+        assert results[0]['rank'] > results[1]['rank']
+        assert '<mark>competitor</mark>' in results[0]['snippet']
+
+        phrase = await client.get(
+            '/api/v1/calls/search',
+            params={'q': '"demo is next" OR'},
+            headers=headers['tau'],
+        )
+        assert [item['id'] for item in phrase.json()] == []
+        phrase = await client.get(
+            '/api/v1/calls/search', params={'q': '"demo is next"'}, headers=headers['tau']
+        )
+        assert [item['id'] for item in phrase.json()] == [ids['other.txt']]
+
+        async with AsyncSessionLocal() as db:
+            call = await db.get(Call, ids['other.txt'], options=CALL_CONTENT)
+            call.transcript = 'Competitor pricing is the main objection.'
+            await db.commit()
+        updated = await client.get(
+            '/api/v1/calls/search', params={'q': 'competitor', 'limit': 1}, headers=headers['tau']
+        )
+        assert len(updated.json()) == 1
+        reindexed = await client.get(
+            '/api/v1/calls/search', params={'q': 'objection'}, headers=headers['tau']
+        )
+        assert [item['id'] for item in reindexed.json()] == [ids['other.txt']]
+
+
+
+@pytest.mark.asyncio
+async def test_search_index_backfill_runs_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    await _reset_db()
+    async with AsyncSessionLocal() as db:
+        org = Organization(name='Backfill Inc')
+        db.add(org)
+        await db.flush()
+        user = User(
+            organization_id=org.id, email='rep@backfill.com', full_name='Rep', hashed_password='x'
+        )
+        db.add(user)
+        await db.flush()
+        for index in range(5):
+            call = Call(
+                organization_id=org.id,
+                user_id=user.id,
+                file_name=f'{index}.txt',
+                file_path=f'{index}.txt',
+            )
+            call.transcript = f'Call {index}: the budget is approved.'
+            db.add(call)
+        await db.commit()
+
+    monkeypatch.setattr(search_index, 'BACKFILL_BATCH_SIZE', 2)
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    async with engine.begin() as conn:
+        await conn.execute(text('DROP TABLE calls_fts'))
+        event.listen(engine.sync_engine, 'before_cursor_execute', record)
+        try:
+            await conn.run_sync(search_index.install_search_index)
+        finally:
+            event.remove(engine.sync_engine, 'before_cursor_execute', record)
+        matched = await conn.execute(
+            text("SELECT rowid FROM calls_fts WHERE calls_fts MATCH 'budget'")
+        )
+        assert len(matched.all()) == 5
+    assert sum('INSERT INTO calls_fts' in sql for sql in statements) == 3
+
+
+def test_search_snippets_escape_transcript_html() -> None:
+    transcript = 'Rep said <script>alert("x")</script> & the competitor <b>lost</b>.'
+
+    assert snippet(transcript, highlight_terms('competitor')) == (
+        '…script&gt; &amp; the <mark>competitor</mark> &lt;b&gt;lost&lt;/b'
+    )
+    assert snippet(transcript, highlight_terms('said'), words=4) == (
+        '…<mark>said</mark> &lt;script&gt;alert(&quot;x…'
+    )
+
+
+def test_search_snippets_mark_the_words_the_porter_index_matched() -> None:
+    transcript = 'Their happiness was relational, so they generalized the agreed pricing.'
+    words = re.findall(r'\w+', transcript.lower()) + ['ies', 'eed', 'sses', 'yyy', 'agree']
+    connection = sqlite3.connect(':memory:')
+    connection.execute("CREATE VIRTUAL TABLE words USING fts5(word, tokenize='porter unicode61')")
+    connection.execute("CREATE VIRTUAL TABLE terms USING fts5vocab(words, 'instance')")
+    connection.executemany('INSERT INTO words (rowid, word) VALUES (?, ?)', enumerate(words))
+    indexed = dict(connection.execute('SELECT doc, term FROM terms').fetchall())
+
+    assert [porter_stem(word) for word in words] == [indexed[row] for row in range(len(words))]
+    assert snippet(transcript, highlight_terms('happy relate "general" agree')) == (
+        '…<mark>happiness</mark> was <mark>relational</mark>, so they '
+        '<mark>generalized</mark> the <mark>agreed</mark> pricing'
+    )
+
+
+@pytest.mark.asyncio
+async def test_call_content_is_stored_compressed_outside_the_calls_row() -> None:
+    await _reset_db()
+    transcript = ''.join(
+        f'Rep: line {index}, the budget is approved and the demo is next week.\n'
+        for index in range(200)
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Psi Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@psi.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@psi.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        upload = await client.post(
+            '/api/v1/calls/upload',
+            headers=headers,
+            files={'file': ('long.txt', io.BytesIO(transcript.encode()), 'text/plain')},
+        )
+        call_id = upload.json()['id']
+
+        async with engine.begin() as conn:
+            record = (
+                await conn.execute(
+                    select(CallTranscript.codec, CallTranscript.content, CallTranscript.text_bytes)
+                )
+            ).one()
+            sections = (await conn.execute(select(CallAnalysisSection.section))).scalars().all()
+        assert record.codec == 'zlib'
+        assert record.text_bytes == len(transcript)
+        assert len(record.content) * 5 < record.text_bytes
+        assert {'scores', 'bant', 'structured_payload'} <= set(sections)
+
+        statements: list[str] = []
+
+        def record_statement(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, 'before_cursor_execute', record_statement)
+        try:
+            projected = await client.get(
+                '/api/v1/calls', headers=headers, params={'fields': 'id,status'}
+            )
+        finally:
+            event.remove(engine.sync_engine, 'before_cursor_execute', record_statement)
+        assert projected.json() == [{'id': call_id, 'status': 'analyzed'}]
+        assert not any(
+            'call_transcripts' in sql or 'call_analysis_sections' in sql for sql in statements
+        )
+
+        listed = await client.get('/api/v1/calls', headers=headers)
+        fetched = await client.get(f'/api/v1/calls/{call_id}', headers=headers)
+        assert listed.json()[0]['transcript'] == fetched.json()['transcript'] == transcript
+        assert listed.json()[0]['analysis'] == fetched.json()['analysis']
+        assert list(fetched.json()['analysis'])[:2] == ['executive_summary', 'scores']
+
+        # Rows migrated uncompressed are compressed in place by the compaction command.
+        async with engine.begin() as conn:
+            await conn.execute(
+                update(CallTranscript).values(codec='identity', content=transcript.encode())
+            )
+        assert (await compact(batch_size=10))[0] == 1
+        refetched = await client.get(f'/api/v1/calls/{call_id}', headers=headers)
+        assert refetched.json()['transcript'] == transcript
+
+
+def test_postgres_analysis_documents_order_sections_inside_the_aggregate() -> None:
+    db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=postgresql.dialect()))
+    query = CallContentService._documents(db, [1, 2], ['scores', 'bant'])
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert (
+        'json_object_agg(call_analysis_sections.section, call_analysis_sections.payload '
+        'ORDER BY call_analysis_sections.position)'
+    ) in sql
+    assert 'FROM call_analysis_sections' in sql and '(SELECT' not in sql
+
+
+@pytest.mark.asyncio
+async def test_list_calls_filters_on_analysis_fields() -> None:
+    await _reset_db()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Phi Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@phi.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@phi.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+        uploads = {
+            'pricey.txt': 'This looks expensive and there is real risk. Who is the decision maker?',
+            'funded.txt': 'Budget is approved, but it is expensive. Timeline is this quarter.',
+            'calm.txt': 'Great call, the team is excited about the demo.',
+        }
+        ids = {}
+        for name, content in uploads.items():
+            upload = await client.post(
+                '/api/v1/calls/upload',
+                headers=headers,
+                files={'file': (name, io.BytesIO(content.encode()), 'text/plain')},
+            )
+            ids[name] = upload.json()['id']
+
+        async def matching(params: dict) -> set[int]:
+            response = await client.get(
+                '/api/v1/calls', headers=headers, params={**params, 'fields': 'id'}
+            )
+            assert response.status_code == 200
+            return {item['id'] for item in response.json()}
+
+        assert await matching({'objection': 'expensive'}) == {ids['pricey.txt'], ids['funded.txt']}
+        assert await matching({'objection': ['expensive', 'risk']}) == {ids['pricey.txt']}
+        assert await matching({'bant_budget': 'missing', 'objection': 'expensive'}) == {
+            ids['pricey.txt']
+        }
+        assert await matching({'key_moment': 'decision_maker'}) == {ids['pricey.txt']}
+        assert await matching({'bant_timeline': 'covered', 'pain_point': 'expensive'}) == {
+            ids['funded.txt']
+        }
+        calm = await client.get(f"/api/v1/calls/{ids['calm.txt']}", headers=headers)
+        state = calm.json()['analysis']['structured_payload']['conversation_state']
+        assert ids['calm.txt'] in await matching({'conversation_state': state})
+
+        invalid = await client.get('/api/v1/calls', headers=headers, params={'bant_need': 'maybe'})
+        assert invalid.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_crm_sync_drains_outbox_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    await _reset_db()
+    fake = FakeCrmState(max_batch_size=2, fail_batches=0)
+    monkeypatch.setattr(crm, 'client_transport', ASGITransport(app=create_fake_crm(fake)))
+    monkeypatch.setattr(get_settings(), 'crm_batch_size', 2)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.post(
+            '/api/v1/auth/register',
+            json={
+                'organization_name': 'Chi Inc',
+                'full_name': 'Admin User',
+                'email': 'admin@chi.com',
+                'password': 'Password123!',
+            },
+        )
+        login = await client.post(
+            '/api/v1/auth/login', json={'email': 'admin@chi.com', 'password': 'Password123!'}
+        )
+        headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        call_ids = []
+        for index in range(5):
+            upload = await client.post(
+                '/api/v1/calls/upload',
+                headers=headers,
+                files={
+                    'file': (
+                        f'call{index}.txt',
+                        io.BytesIO(f'Budget is approved for phase {index}.'.encode()),
+                        'text/plain',
+                    )
+                },
+            )
+            call_ids.append(upload.json()['id'])
+
+        async with AsyncSessionLocal() as db:
+            org = (await db.execute(select(Organization))).scalar_one()
+            org.settings = {
+                'crm_field_mapping': {
+                    'closing_probability': 'Opportunity.Close_Probability__c',
+                    'bant.budget': 'Opportunity.Budget_Status__c',
+                    'rep_email': 'Owner.Email',
+                }
+            }
+            await db.commit()
+
+        sync = await client.post('/api/v1/calls/sync-crm', headers=headers, json={})
+        assert sync.status_code == 202
+        assert sync.json()['queued'] == 5
+
+        assert fake.batch_sizes == [2, 2, 1]
+        record = fake.records[str(call_ids[0])]
+        assert record['Opportunity.Budget_Status__c'] == 'covered'
+        assert record['Owner.Email'] == 'admin@chi.com'
+        assert 'Opportunity.Close_Probability__c' in record
+        status = await client.get('/api/v1/calls/sync-crm/status', headers=headers)
+        assert status.json() == {'pending': 0, 'sent': 5, 'failed': 0}
+        fetched = await client.get(f'/api/v1/calls/{call_ids[0]}', headers=headers)
+        assert fetched.json()['crm_synced_at'] is not None
+
+        # A CRM outage leaves the batch pending for the next drain; rejected records fail.
+        fake.fail_batches = fake.batches + 1
+        fake.reject_refs = {str(call_ids[1])}
+        retry = await client.post(
+            '/api/v1/calls/sync-crm', headers=headers, json={'call_ids': call_ids[:2]}
+        )
+        assert retry.json()['queued'] == 2
+        status = await client.get('/api/v1/calls/sync-crm/status', headers=headers)
+        assert status.json()['pending'] == 2
+
+        totals = await run_crm_drain()
+        assert totals['sent'] == 1 and totals['failed'] == 1
+        async with AsyncSessionLocal() as db:
+            failed = (
+                await db.execute(
+                    select(CrmOutboxEntry).where(CrmOutboxEntry.status == CrmSyncStatus.FAILED)
+                )
+            ).scalar_one()
+        assert failed.call_id == call_ids[1]
+        assert failed.attempts == 2
+        assert failed.last_error == 'validation failed'
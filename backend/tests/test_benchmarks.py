@@ -0,0 +1,23 @@
+from app.services.analysis import AnalysisService
+from benchmarks.data import sales_call_transcript
+from benchmarks.suite import compare
+
+
+def test_sales_call_transcript_hits_engine_vocabulary() -> None:
+    transcript = sales_call_transcript(8 * 1024, seed=3)
+
+    assert len(transcript) == 8 * 1024
+    assert transcript == sales_call_transcript(8 * 1024, seed=3)
+    analysis = AnalysisService.analyze(transcript)
+    assert analysis['pain_points']
+    assert len(analysis['key_moments']) == 6
+    assert analysis['next_steps']
+
+
+def test_compare_flags_only_results_beyond_tolerance() -> None:
+    baseline = {'fast': {'seconds': 1.0}, 'slow': {'seconds': 1.0}, 'gone': {'seconds': 1.0}}
+    results = {'fast': {'seconds': 1.2}, 'slow': {'seconds': 1.5}, 'new': {'seconds': 9.0}}
+
+    assert compare(results, baseline, tolerance=0.25) == [
+        {'name': 'slow', 'baseline_seconds': 1.0, 'seconds': 1.5, 'ratio': 1.5}
+    ]
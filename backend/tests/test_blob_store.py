@@ -0,0 +1,217 @@
+import gzip
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select, update
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.session import AsyncSessionLocal, engine
+from app.main import app
+from app.models.entities import Blob, BlobTier, Call, Organization
+from app.services import blob_store
+from app.services.blob_store import BlobRetentionService, BlobStore, object_name
+from app.services.call_content import CallContentService
+from app.services.content_cache import ContentCacheService
+from app.services.resource_versions import ResourceVersionCache
+from app.services.user_cache import UserCacheService
+from fakes.s3 import FakeS3State, create_app
+
+TRANSCRIPT = 'We discussed budget and timeline. I will send the proposal next week. ' * 40
+
+
+async def _reset_db() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    ContentCacheService.clear()
+    CallContentService.clear()
+    ResourceVersionCache.clear()
+    UserCacheService.clear()
+
+
+async def _register(client: AsyncClient, name: str) -> dict[str, str]:
+    email = f'admin@{name.lower()}.com'
+    await client.post(
+        '/api/v1/auth/register',
+        json={
+            'organization_name': f'{name} Inc',
+            'full_name': 'Admin User',
+            'email': email,
+            'password': 'Password123!',
+        },
+    )
+    login = await client.post(
+        '/api/v1/auth/login', json={'email': email, 'password': 'Password123!'}
+    )
+    return {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+
+async def _upload(client: AsyncClient, headers: dict[str, str], name: str, body: bytes) -> dict:
+    response = await client.post(
+        '/api/v1/calls/upload', headers=headers, files={'file': (name, io.BytesIO(body))}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_uploads_are_stored_once_compressed_and_sharded(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'storage_path', str(tmp_path))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        headers = await _register(client, 'Blob')
+        other = await _register(client, 'Other')
+        first = await _upload(client, headers, 'call.txt', TRANSCRIPT.encode())
+        second = await _upload(client, headers, 'Copy Of Call.TXT', TRANSCRIPT.encode())
+        media = await _upload(client, headers, 'call.mp3', b'\x00\x01' * 512)
+        foreign = await _upload(client, other, 'call.txt', TRANSCRIPT.encode())
+
+    assert first['transcript'] == second['transcript'] == foreign['transcript'] == TRANSCRIPT
+    assert media['status'] == 'analyzed'
+
+    async with AsyncSessionLocal() as db:
+        blobs = (await db.execute(select(Blob).order_by(Blob.created_at))).scalars().all()
+        calls = (await db.execute(select(Call).order_by(Call.id))).scalars().all()
+
+    # Deduplicated within the organization only.
+    by_key = {blob.key: blob for blob in blobs}
+    text_blob, media_blob, foreign_blob = (by_key[call.blob_key] for call in calls[1:])
+    assert [call.blob_key for call in calls] == [
+        text_blob.key, text_blob.key, media_blob.key, foreign_blob.key
+    ]
+    assert foreign_blob.key != text_blob.key
+    assert text_blob.ref_count == 2 and media_blob.ref_count == foreign_blob.ref_count == 1
+    assert text_blob.codec == foreign_blob.codec == 'gzip' and media_blob.codec == 'identity'
+    assert text_blob.stored_size < text_blob.size // 10
+
+    stored = sorted(path for path in tmp_path.rglob('*') if path.is_file())
+    expected = [
+        tmp_path / 'blobs' / object_name(blob.key, blob.codec)
+        for blob in (text_blob, media_blob, foreign_blob)
+    ]
+    assert stored == sorted(expected)
+    assert stored[0].parent.parent.parent == tmp_path / 'blobs'
+    assert gzip.decompress(expected[0].read_bytes()).decode() == TRANSCRIPT
+    assert expected[1].read_bytes() == b'\x00\x01' * 512
+
+
+@pytest.mark.asyncio
+async def test_retention_tiers_and_releases_blobs_per_subscription_tier(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    await _reset_db()
+    state = FakeS3State()
+    monkeypatch.setattr(blob_store, 'client_transport', ASGITransport(app=create_app(state)))
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'storage_path', str(tmp_path))
+    monkeypatch.setattr(settings, 'blob_cold_backend', 's3')
+    monkeypatch.setattr(settings, 's3_endpoint_url', 'http://fake-s3')
+    monkeypatch.setattr(settings, 'blob_gc_grace_hours', 24)
+    monkeypatch.setattr(
+        settings,
+        'blob_retention_policy',
+        {
+            'starter': {'cold_after_days': 30, 'delete_after_days': 60},
+            'professional': {'cold_after_days': 90, 'delete_after_days': 0},
+        },
+    )
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        starter = await _register(client, 'Starter')
+        professional = await _register(client, 'Pro')
+        await _upload(client, starter, 'starter.txt', TRANSCRIPT.encode())
+        await _upload(client, professional, 'pro.txt', f'{TRANSCRIPT} Pricing.'.encode())
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Organization)
+            .where(Organization.name == 'Starter Inc')
+            .values(subscription_tier='starter')
+        )
+        await db.commit()
+
+        now = datetime.now(timezone.utc)
+        assert await BlobRetentionService.run(db, now) == {
+            'released': 0, 'moved_to_cold': 0, 'deleted': 0
+        }
+
+        # Past the starter tier's cold_after_days only.
+        now += timedelta(days=40)
+        assert await BlobRetentionService.run(db, now) == {
+            'released': 0, 'moved_to_cold': 1, 'deleted': 0
+        }
+        starter_call = (
+            await db.execute(
+                select(Call).join(Organization).where(Organization.name == 'Starter Inc')
+            )
+        ).scalar_one()
+        cold = await db.get(Blob, starter_call.blob_key)
+        name = object_name(cold.key, cold.codec)
+        assert cold.tier == BlobTier.COLD
+        assert not (tmp_path / 'blobs' / name).exists()
+        assert state.storage_classes[('salesops-uploads', name)] == 'STANDARD_IA'
+
+        async with BlobStore.local_file(db, starter_call) as file_path:
+            with gzip.open(file_path, 'rt', encoding='utf-8') as handle:
+                assert handle.read() == TRANSCRIPT
+
+        # Past delete_after_days: the reference goes, the object stays for the grace period.
+        now += timedelta(days=30)
+        assert await BlobRetentionService.run(db, now) == {
+            'released': 1, 'moved_to_cold': 0, 'deleted': 0
+        }
+        await db.refresh(starter_call, ['blob_key', 'transcript_record'])
+        await db.refresh(cold)
+        assert starter_call.blob_key is None and starter_call.transcript_record is not None
+        assert cold.ref_count == 0 and ('salesops-uploads', name) in state.objects
+
+        now += timedelta(hours=25)
+        assert await BlobRetentionService.run(db, now) == {
+            'released': 0, 'moved_to_cold': 0, 'deleted': 1
+        }
+        assert state.objects.keys() == set()
+        blobs = (await db.execute(select(Blob))).scalars().all()
+        assert [(blob.tier, blob.ref_count) for blob in blobs] == [(BlobTier.HOT, 1)]
+        assert len([path for path in (tmp_path / 'blobs').rglob('*') if path.is_file()]) == 1
+
+
+@pytest.mark.asyncio
+async def test_objects_of_rolled_back_uploads_are_collected_after_the_grace_period(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    await _reset_db()
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'storage_path', str(tmp_path))
+    monkeypatch.setattr(settings, 'blob_gc_grace_hours', 24)
+    async with AsyncSessionLocal() as db:
+        org = Organization(name='Rollback Inc')
+        db.add(org)
+        await db.commit()
+
+        kept, dropped = tmp_path / 'kept.txt', tmp_path / 'dropped.txt'
+        kept.write_text(TRANSCRIPT)
+        dropped.write_text(f'{TRANSCRIPT} Pricing.')
+        kept_blob = await BlobStore.ingest(db, kept, org.id, 'a' * 64, '.txt')
+        await db.commit()
+        kept_key = kept_blob.key
+        kept_name = tmp_path / 'blobs' / object_name(kept_key, kept_blob.codec)
+        await BlobStore.ingest(db, dropped, org.id, 'b' * 64, '.txt')
+        await db.rollback()
+
+        orphan = (await db.execute(select(Blob).where(Blob.key != kept_key))).scalar_one()
+        assert orphan.ref_count == 0 and orphan.released_at is not None
+        assert (tmp_path / 'blobs' / object_name(orphan.key, orphan.codec)).is_file()
+
+        now = datetime.now(timezone.utc)
+        assert (await BlobRetentionService.run(db, now))['deleted'] == 0
+        assert (await BlobRetentionService.run(db, now + timedelta(hours=25)))['deleted'] == 1
+        stored = [path for path in (tmp_path / 'blobs').rglob('*') if path.is_file()]
+        assert stored == [kept_name]
+        blobs = (await db.execute(select(Blob))).scalars().all()
+        assert [(blob.key, blob.ref_count) for blob in blobs] == [(kept_key, 1)]
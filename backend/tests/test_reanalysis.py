@@ -0,0 +1,146 @@
+import io
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.session import AsyncSessionLocal, engine
+from app.main import app
+from app.models.entities import AnalysisTemplate, Call, Organization
+from app.services.call_content import CallContentService
+from app.services.content_cache import ContentCacheService
+from app.services.resource_versions import ResourceVersionCache
+from app.services.user_cache import UserCacheService
+
+
+async def _reset_db() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    ContentCacheService.clear()
+    CallContentService.clear()
+    ResourceVersionCache.clear()
+    UserCacheService.clear()
+
+
+async def _auth_headers(client: AsyncClient, email: str) -> dict[str, str]:
+    await client.post(
+        '/api/v1/auth/register',
+        json={
+            'organization_name': f'{email} org',
+            'full_name': 'Manager User',
+            'email': email,
+            'password': 'Password123!',
+        },
+    )
+    login = await client.post('/api/v1/auth/login', json={'email': email, 'password': 'Password123!'})
+    return {'Authorization': f"Bearer {login.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_template_change_reanalyzes_only_affected_sections(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await _reset_db()
+    monkeypatch.setattr(get_settings(), 'reanalysis_batch_size', 1)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        headers = await _auth_headers(client, 'manager@iota.com')
+        call_ids = []
+        for index, text in enumerate(
+            [b'The competitor is expensive.', b'Budget approved, next week demo.']
+        ):
+            upload = await client.post(
+                '/api/v1/calls/upload',
+                headers=headers,
+                files={'file': (f'call{index}.txt', io.BytesIO(text), 'text/plain')},
+            )
+            call_ids.append(upload.json()['id'])
+
+        saved = await client.put(
+            '/api/v1/settings/templates',
+            headers=headers,
+            json={
+                'crm_field_mapping': {},
+                'call_analysis_template': {
+                    'follow_up_subject': 'Recap',
+                    'objection_terms': ['competitor'],
+                },
+            },
+        )
+        assert saved.json()['call_analysis_template_version'] == 1
+        job = await client.get(
+            f"/api/v1/settings/reanalysis-jobs/{saved.json()['reanalysis_job_id']}",
+            headers=headers,
+        )
+        assert job.json()['status'] == 'completed'
+        assert job.json()['recomputed_calls'] == 2
+        assert job.json()['last_call_id'] == max(call_ids)
+        assert job.json()['pending_calls'] == 0
+
+        first = await client.get(f'/api/v1/calls/{call_ids[0]}', headers=headers)
+        assert first.json()['analysis']['objections'] == ['expensive', 'competitor']
+        assert first.json()['analysis']['follow_up']['subject'] == 'Recap'
+
+        unrelated = await client.put(
+            '/api/v1/settings/templates',
+            headers=headers,
+            json={
+                'crm_field_mapping': {},
+                'call_analysis_template': {
+                    'follow_up_subject': 'Recap',
+                    'objection_terms': ['competitor'],
+                    'notes': 'layout only',
+                },
+            },
+        )
+        job = await client.get(
+            f"/api/v1/settings/reanalysis-jobs/{unrelated.json()['reanalysis_job_id']}",
+            headers=headers,
+        )
+        assert job.json()['recomputed_calls'] == 0
+        assert job.json()['bumped_calls'] == 2
+
+    async with engine.begin() as conn:
+        result = await conn.execute(select(Call.analysis_template_version))
+        assert set(result.scalars().all()) == {2}
+
+
+@pytest.mark.asyncio
+async def test_template_saved_before_versioning_is_kept_as_version_zero() -> None:
+    await _reset_db()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        headers = await _auth_headers(client, 'manager@kappa.com')
+        legacy = {'follow_up_subject': 'Recap', 'objection_terms': ['competitor']}
+        async with AsyncSessionLocal() as db:
+            org = (await db.execute(select(Organization))).scalar_one()
+            org.settings = {'call_analysis_template': legacy}
+            await db.commit()
+        upload = await client.post(
+            '/api/v1/calls/upload',
+            headers=headers,
+            files={'file': ('call.txt', io.BytesIO(b'The competitor is expensive.'), 'text/plain')},
+        )
+        assert upload.json()['analysis']['follow_up']['subject'] == 'Recap'
+
+        saved = await client.put(
+            '/api/v1/settings/templates',
+            headers=headers,
+            json={'crm_field_mapping': {}, 'call_analysis_template': {**legacy, 'notes': 'x'}},
+        )
+        job = await client.get(
+            f"/api/v1/settings/reanalysis-jobs/{saved.json()['reanalysis_job_id']}",
+            headers=headers,
+        )
+        # Diffed against the legacy template, not an empty one: nothing to recompute.
+        assert job.json()['recomputed_calls'] == 0
+        assert job.json()['bumped_calls'] == 1
+
+    async with AsyncSessionLocal() as db:
+        snapshot = await db.get(AnalysisTemplate, (org.id, 0))
+        assert snapshot.template == legacy
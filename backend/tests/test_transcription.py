@@ -0,0 +1,194 @@
+import asyncio
+import random
+import time
+import wave
+from array import array
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.services import audio_chunking, transcription_providers
+from app.services.audio_chunking import merge_overlap, plan_cuts, split_wav, stitch
+from app.services.transcription import TranscriptionService
+from app.services.transcription_providers import TranscriptionProviderError, get_http_client
+from fakes.transcriber import (
+    VOCABULARY,
+    FakeTranscriberState,
+    create_app,
+    fake_transcript,
+    synthesize_speech,
+)
+
+
+@pytest.fixture
+def fake_provider(monkeypatch: pytest.MonkeyPatch) -> FakeTranscriberState:
+    state = FakeTranscriberState()
+    transport = httpx.ASGITransport(app=create_app(state))
+    monkeypatch.setattr(transcription_providers, 'client_transport', transport)
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'transcription_provider', 'fake')
+    monkeypatch.setattr(settings, 'fake_transcriber_url', 'http://fake-transcriber')
+    monkeypatch.setattr(settings, 'transcription_backoff_seconds', 0)
+    return state
+
+
+def _audio(tmp_path, name: str, payload: bytes):
+    path = tmp_path / name
+    path.write_bytes(payload)
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_media_is_transcribed_through_the_provider(fake_provider, tmp_path) -> None:
+    audio = bytes(range(256)) * 64
+    transcript = await TranscriptionService.transcribe(_audio(tmp_path, 'call.wav', audio))
+
+    assert transcript == fake_transcript(audio)
+    assert fake_provider.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried(fake_provider, tmp_path) -> None:
+    fake_provider.fail_requests = 2
+    path = _audio(tmp_path, 'call.mp3', b'we will send the proposal')
+
+    assert await TranscriptionService.transcribe(path) == 'we will send the proposal'
+    assert fake_provider.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_retries_give_up_after_the_configured_attempts(
+    fake_provider, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), 'transcription_max_retries', 1)
+    fake_provider.fail_requests = 5
+
+    with pytest.raises(TranscriptionProviderError):
+        await TranscriptionService.transcribe(_audio(tmp_path, 'call.wav', b'audio'))
+    assert fake_provider.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_and_the_pool_is_shared(
+    fake_provider, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), 'transcription_max_concurrency', 2)
+    fake_provider.latency_seconds = 0.02
+    paths = [_audio(tmp_path, f'call{index}.wav', b'audio %d' % index) for index in range(6)]
+
+    client = get_http_client()
+    transcripts = await asyncio.gather(*(TranscriptionService.transcribe(path) for path in paths))
+
+    assert transcripts == [f'audio {index}' for index in range(6)]
+    assert fake_provider.max_in_flight == 2
+    assert get_http_client() is client
+
+
+@pytest.mark.asyncio
+async def test_slow_requests_are_hedged(
+    fake_provider, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), 'transcription_hedge_after_seconds', 0.05)
+    fake_provider.slow_requests = 1
+    fake_provider.slow_latency_seconds = 2.0
+
+    started = time.perf_counter()
+    transcript = await TranscriptionService.transcribe(_audio(tmp_path, 'call.wav', b'hedged'))
+
+    assert transcript == 'hedged'
+    assert time.perf_counter() - started < 1.0
+    assert fake_provider.requests == 2
+
+
+def _spoken_words(count: int) -> list[str]:
+    rng = random.Random(7)
+    return [rng.choice(VOCABULARY) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_assemblyai_polling_gives_up_after_the_timeout(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    polls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/v2/upload':
+            return httpx.Response(200, json={'upload_url': 'https://cdn.example/audio'})
+        if request.method == 'POST':
+            return httpx.Response(200, json={'id': 'job-1', 'status': 'queued'})
+        polls.append(request.url.path)
+        return httpx.Response(200, json={'id': 'job-1', 'status': 'processing'})
+
+    monkeypatch.setattr(transcription_providers, 'client_transport', httpx.MockTransport(handler))
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'transcription_provider', 'assemblyai')
+    monkeypatch.setattr(settings, 'transcription_poll_interval_seconds', 0.01)
+    monkeypatch.setattr(settings, 'transcription_poll_timeout_seconds', 0.05)
+
+    with pytest.raises(TranscriptionProviderError, match='did not finish'):
+        await TranscriptionService.transcribe(_audio(tmp_path, 'call.wav', b'audio'))
+    assert 2 <= len(polls) < 20
+    assert set(polls) == {'/v2/transcript/job-1'}
+
+
+def test_stitch_drops_the_overlapping_words() -> None:
+    assert merge_overlap(['send', 'the', 'proposal'], ['The', 'proposal.', 'next']) == [
+        'send',
+        'the',
+        'proposal',
+        'next',
+    ]
+    assert stitch(['we will send', 'send the', 'pricing']) == 'we will send the pricing'
+
+
+def test_cuts_land_in_silence(tmp_path) -> None:
+    path = _audio(tmp_path, 'call.wav', synthesize_speech(_spoken_words(40)))
+
+    with wave.open(path, 'rb') as audio:
+        cuts = plan_cuts(audio, chunk_seconds=2.5, search_seconds=0.5)
+        samples = array('h', (audio.setpos(0), audio.readframes(audio.getnframes()))[1])
+
+    assert len(cuts) >= 5
+    assert cuts == sorted(cuts)
+    assert all(samples[cut] == 0 for cut in cuts[:-1])
+
+
+def test_segments_keep_every_frame_when_reads_come_up_short(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = _audio(tmp_path, 'call.wav', synthesize_speech(_spoken_words(10)))
+    monkeypatch.setattr(audio_chunking, 'COPY_BLOCK_FRAMES', 1000)
+    read = wave.Wave_read.readframes
+    monkeypatch.setattr(wave.Wave_read, 'readframes', lambda audio, n: read(audio, min(n, 300)))
+
+    [segment] = split_wav(path, str(tmp_path), 3600, 0, 0)
+
+    with wave.open(path, 'rb') as source, wave.open(segment.path, 'rb') as copy:
+        assert copy.getnframes() == source.getnframes()
+
+
+@pytest.mark.asyncio
+async def test_long_recordings_are_transcribed_in_parallel_segments(
+    fake_provider, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'transcription_chunk_seconds', 3)
+    monkeypatch.setattr(settings, 'transcription_chunk_overlap_seconds', 1)
+    monkeypatch.setattr(settings, 'transcription_silence_search_seconds', 0.5)
+    monkeypatch.setattr(settings, 'transcription_max_concurrency', 2)
+    fake_provider.latency_seconds = 0.05
+    words = _spoken_words(60)
+    partials: list[str] = []
+
+    async def on_partial(transcript: str) -> None:
+        partials.append(transcript)
+
+    path = _audio(tmp_path, 'call.wav', synthesize_speech(words))
+    transcript = await TranscriptionService.transcribe(path, on_partial=on_partial)
+
+    assert transcript == ' '.join(words)
+    assert fake_provider.requests >= 6
+    assert fake_provider.max_in_flight == 2
+    assert partials and partials == sorted(partials, key=len)
+    assert all(transcript.startswith(partial) for partial in partials)
@@ -0,0 +1,4 @@
+BEGIN;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS file_size BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+COMMIT;
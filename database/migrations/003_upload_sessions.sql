@@ -0,0 +1,12 @@
+BEGIN;
+CREATE TABLE IF NOT EXISTS upload_sessions (
+  id VARCHAR(32) PRIMARY KEY,
+  organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  file_name VARCHAR(255) NOT NULL,
+  part_path VARCHAR(1024) NOT NULL,
+  total_size BIGINT NOT NULL,
+  received_bytes BIGINT NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+COMMIT;
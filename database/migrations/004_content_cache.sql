@@ -0,0 +1,9 @@
+BEGIN;
+CREATE TABLE IF NOT EXISTS content_cache (
+  kind VARCHAR(16) NOT NULL,
+  cache_key VARCHAR(80) NOT NULL,
+  payload JSONB NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (kind, cache_key)
+);
+COMMIT;
@@ -0,0 +1,24 @@
+BEGIN;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS analysis_template_version INTEGER NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_calls_org_template_version
+  ON calls(organization_id, analysis_template_version);
+
+CREATE TABLE IF NOT EXISTS analysis_templates (
+  organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+  version INTEGER NOT NULL,
+  template JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (organization_id, version)
+);
+
+CREATE TABLE IF NOT EXISTS reanalysis_jobs (
+  id SERIAL PRIMARY KEY,
+  organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+  template_version INTEGER NOT NULL,
+  status VARCHAR(20) NOT NULL,
+  last_call_id INTEGER NOT NULL DEFAULT 0,
+  recomputed_calls INTEGER NOT NULL DEFAULT 0,
+  bumped_calls INTEGER NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+COMMIT;
@@ -0,0 +1,5 @@
+BEGIN;
+-- Include id so (created_at, id) keyset predicates resolve to a single index range.
+DROP INDEX IF EXISTS idx_calls_org_created;
+CREATE INDEX idx_calls_org_created ON calls(organization_id, created_at DESC, id DESC);
+COMMIT;
@@ -0,0 +1,20 @@
+BEGIN;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS sentiment_score INTEGER;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS buying_intent_score INTEGER;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS closing_probability INTEGER;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS engagement_score INTEGER;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS conversation_state VARCHAR(20);
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS call_type VARCHAR(30);
+
+-- Backfill from the stored analysis; new writes are materialized by the application.
+UPDATE calls SET
+  sentiment_score = (analysis->'scores'->>'sentiment_score')::int,
+  buying_intent_score = (analysis->'scores'->>'buying_intent_score')::int,
+  closing_probability = (analysis->'scores'->>'closing_probability')::int,
+  engagement_score = (analysis->'scores'->>'engagement_score')::int,
+  conversation_state = analysis->'structured_payload'->>'conversation_state',
+  call_type = analysis->'executive_summary'->>'call_type'
+WHERE analysis ? 'scores';
+
+CREATE INDEX IF NOT EXISTS idx_calls_org_state ON calls(organization_id, conversation_state);
+COMMIT;
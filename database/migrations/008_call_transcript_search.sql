@@ -0,0 +1,8 @@
+BEGIN;
+-- Generated, so every insert and transcript update keeps the index current. Adding it
+-- rewrites the table once; run during a quiet window on large installations.
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS transcript_tsv TSVECTOR
+  GENERATED ALWAYS AS (to_tsvector('english', coalesce(transcript, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_calls_transcript_tsv ON calls USING GIN (transcript_tsv);
+COMMIT;
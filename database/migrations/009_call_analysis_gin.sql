@@ -0,0 +1,6 @@
+BEGIN;
+-- jsonb_path_ops indexes every path/value pair in the analysis, so one containment test
+-- (analysis @> '{"bant": {"budget": "missing"}, "objections": ["expensive"]}') covers the
+-- BANT, objection, pain point and key moment filters on GET /calls.
+CREATE INDEX IF NOT EXISTS idx_calls_analysis ON calls USING GIN (analysis jsonb_path_ops);
+COMMIT;
@@ -0,0 +1,19 @@
+BEGIN;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS crm_synced_at TIMESTAMPTZ;
+
+CREATE TABLE IF NOT EXISTS crm_outbox (
+  id SERIAL PRIMARY KEY,
+  organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+  call_id INTEGER NOT NULL REFERENCES calls(id) ON DELETE CASCADE,
+  requested_by_user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  status VARCHAR(20) NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  external_id VARCHAR(128),
+  last_error VARCHAR(500),
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  sent_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_crm_outbox_status_id ON crm_outbox(status, id);
+CREATE INDEX IF NOT EXISTS idx_crm_outbox_org_call ON crm_outbox(organization_id, call_id);
+COMMIT;
@@ -0,0 +1,57 @@
+BEGIN;
+-- Moves the transcript and the analysis out of the calls row. Transcripts are copied
+-- uncompressed (codec 'identity'); run `python -m app.db.compact_transcripts` from
+-- backend/ afterwards to compress them in batches. Dropped columns keep their space
+-- until the table is rewritten, e.g. with VACUUM FULL calls or pg_repack.
+CREATE TABLE IF NOT EXISTS call_transcripts (
+  call_id INTEGER PRIMARY KEY REFERENCES calls(id) ON DELETE CASCADE,
+  codec VARCHAR(16) NOT NULL,
+  content BYTEA NOT NULL,
+  text_bytes BIGINT NOT NULL DEFAULT 0,
+  search_vector TSVECTOR
+);
+
+INSERT INTO call_transcripts (call_id, codec, content, text_bytes, search_vector)
+SELECT id, 'identity', convert_to(transcript, 'UTF8'), octet_length(transcript), transcript_tsv
+FROM calls
+WHERE transcript <> ''
+ON CONFLICT (call_id) DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS idx_call_transcripts_search ON call_transcripts USING GIN (search_vector);
+
+CREATE TABLE IF NOT EXISTS call_analysis_sections (
+  call_id INTEGER NOT NULL REFERENCES calls(id) ON DELETE CASCADE,
+  section VARCHAR(64) NOT NULL,
+  position INTEGER NOT NULL DEFAULT 0,
+  payload JSONB,
+  PRIMARY KEY (call_id, section)
+);
+
+-- jsonb_each returns keys in JSONB's storage order (shorter keys first), not the order
+-- they were written in, so positions follow the section order of AnalysisService.analyze;
+-- sections outside that list go after it, by name.
+INSERT INTO call_analysis_sections (call_id, section, position, payload)
+SELECT calls.id, sections.key,
+  row_number() OVER (
+    PARTITION BY calls.id
+    ORDER BY array_position(
+      ARRAY[
+        'executive_summary', 'scores', 'bant', 'pain_points', 'objections', 'key_moments',
+        'methodology_insights', 'next_steps', 'follow_up', 'structured_payload'
+      ]::TEXT[],
+      sections.key
+    ) NULLS LAST, sections.key
+  ) - 1,
+  sections.value
+FROM calls, jsonb_each(calls.analysis) AS sections(key, value)
+ON CONFLICT (call_id, section) DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS idx_call_analysis_sections_payload
+  ON call_analysis_sections USING GIN (payload jsonb_path_ops);
+
+DROP INDEX IF EXISTS idx_calls_transcript_tsv;
+DROP INDEX IF EXISTS idx_calls_analysis;
+ALTER TABLE calls DROP COLUMN IF EXISTS transcript_tsv;
+ALTER TABLE calls DROP COLUMN IF EXISTS transcript;
+ALTER TABLE calls DROP COLUMN IF EXISTS analysis;
+COMMIT;
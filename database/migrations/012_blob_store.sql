@@ -0,0 +1,21 @@
+BEGIN;
+-- New uploads go to the content-addressed blob store; calls uploaded before keep their
+-- file_path and blob_key stays NULL for them, so retention never touches those files.
+CREATE TABLE IF NOT EXISTS blobs (
+  key VARCHAR(96) PRIMARY KEY,
+  codec VARCHAR(16) NOT NULL,
+  tier VARCHAR(8) NOT NULL,
+  size BIGINT NOT NULL,
+  stored_size BIGINT NOT NULL DEFAULT 0,
+  ref_count INTEGER NOT NULL DEFAULT 0,
+  last_referenced_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  released_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_blobs_tier_referenced ON blobs(tier, last_referenced_at);
+CREATE INDEX IF NOT EXISTS idx_blobs_released ON blobs(released_at) WHERE ref_count <= 0;
+
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS blob_key VARCHAR(96) REFERENCES blobs(key);
+CREATE INDEX IF NOT EXISTS idx_calls_blob_key ON calls(blob_key);
+COMMIT;
@@ -0,0 +1,5 @@
+BEGIN;
+-- Bumped by the application whenever a call's analysis sections are written; API
+-- processes cache serialized analyses per (call id, revision).
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS analysis_revision INTEGER NOT NULL DEFAULT 0;
+COMMIT;
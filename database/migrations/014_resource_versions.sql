@@ -0,0 +1,7 @@
+BEGIN;
+-- Bumped by the application on every write to a call or to an organization's settings;
+-- GET /calls/{id} and GET /settings/templates send them as ETags and answer
+-- If-None-Match with 304.
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE organizations ADD COLUMN IF NOT EXISTS settings_version INTEGER NOT NULL DEFAULT 1;
+COMMIT;
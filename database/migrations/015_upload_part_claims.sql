@@ -0,0 +1,6 @@
+BEGIN;
+-- A resumable upload PUT claims the session before writing its part; the claim expires
+-- so a crashed writer does not block the upload forever.
+ALTER TABLE upload_sessions ADD COLUMN IF NOT EXISTS writer_id VARCHAR(32);
+ALTER TABLE upload_sessions ADD COLUMN IF NOT EXISTS writer_expires_at TIMESTAMPTZ;
+COMMIT;
@@ -0,0 +1,10 @@
+BEGIN;
+-- The persistent dedup cache is trimmed to CONTENT_CACHE_PERSISTENT_MAX_MB by evicting
+-- the least recently hit rows; existing rows are sized from their JSON text.
+ALTER TABLE content_cache ADD COLUMN IF NOT EXISTS size_bytes BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE content_cache ADD COLUMN IF NOT EXISTS last_hit_at TIMESTAMPTZ;
+UPDATE content_cache
+  SET size_bytes = octet_length(payload::text), last_hit_at = created_at
+  WHERE last_hit_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_content_cache_last_hit ON content_cache (last_hit_at, created_at);
+COMMIT;
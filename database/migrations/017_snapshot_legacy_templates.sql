@@ -0,0 +1,10 @@
+BEGIN;
+-- Templates saved before versioning live only in organizations.settings; record them as
+-- version 0 so re-analysis diffs old calls against the template they were analyzed with.
+INSERT INTO analysis_templates (organization_id, version, template)
+SELECT id, 0, settings -> 'call_analysis_template'
+FROM organizations
+WHERE settings ? 'call_analysis_template'
+  AND NOT settings ? 'call_analysis_template_version'
+ON CONFLICT (organization_id, version) DO NOTHING;
+COMMIT;
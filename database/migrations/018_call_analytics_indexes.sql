@@ -0,0 +1,11 @@
+BEGIN;
+-- GET /calls/analytics filters on organization, status and creation time and aggregates
+-- the score columns; including them lets the query run as an index-only scan.
+CREATE INDEX IF NOT EXISTS idx_calls_org_analytics ON calls(organization_id, status, created_at)
+  INCLUDE (
+    user_id, call_type, conversation_state,
+    sentiment_score, buying_intent_score, closing_probability, engagement_score
+  );
+-- Grouping by call type reads each organization's calls in call_type order.
+CREATE INDEX IF NOT EXISTS idx_calls_org_call_type ON calls(organization_id, call_type);
+COMMIT;
@@ -3,6 +3,7 @@ CREATE TABLE IF NOT EXISTS organizations (
   name VARCHAR(255) UNIQUE NOT NULL,
   subscription_tier VARCHAR(50) NOT NULL DEFAULT 'professional',
   settings JSONB NOT NULL DEFAULT '{}'::jsonb,
+  settings_version INTEGER NOT NULL DEFAULT 1,
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
@@ -17,16 +18,132 @@ CREATE TABLE IF NOT EXISTS users (
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Uploads, stored once per content and suffix (key = sha256.suffix) by the application
+-- in a sharded object layout; ref_count counts the calls whose blob_key points here.
+CREATE TABLE IF NOT EXISTS blobs (
+  key VARCHAR(96) PRIMARY KEY,
+  codec VARCHAR(16) NOT NULL,
+  tier VARCHAR(8) NOT NULL,
+  size BIGINT NOT NULL,
+  stored_size BIGINT NOT NULL DEFAULT 0,
+  ref_count INTEGER NOT NULL DEFAULT 0,
+  last_referenced_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  released_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_blobs_tier_referenced ON blobs(tier, last_referenced_at);
+CREATE INDEX IF NOT EXISTS idx_blobs_released ON blobs(released_at) WHERE ref_count <= 0;
+
 CREATE TABLE IF NOT EXISTS calls (
   id SERIAL PRIMARY KEY,
   organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
   user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
   file_name VARCHAR(255) NOT NULL,
   file_path VARCHAR(1024) NOT NULL,
-  transcript TEXT NOT NULL DEFAULT '',
+  file_size BIGINT NOT NULL DEFAULT 0,
+  content_hash VARCHAR(64),
+  blob_key VARCHAR(96) REFERENCES blobs(key),
+  status VARCHAR(20) NOT NULL,
+  analysis_template_version INTEGER NOT NULL DEFAULT 0,
+  analysis_revision INTEGER NOT NULL DEFAULT 0,
+  version INTEGER NOT NULL DEFAULT 1,
+  sentiment_score INTEGER,
+  buying_intent_score INTEGER,
+  closing_probability INTEGER,
+  engagement_score INTEGER,
+  conversation_state VARCHAR(20),
+  call_type VARCHAR(30),
+  crm_synced_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_calls_org_created ON calls(organization_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_calls_org_template_version
+  ON calls(organization_id, analysis_template_version);
+CREATE INDEX IF NOT EXISTS idx_calls_org_state ON calls(organization_id, conversation_state);
+CREATE INDEX IF NOT EXISTS idx_calls_blob_key ON calls(blob_key);
+
+-- Transcripts are compressed by the application (codec 'zlib', or 'identity' for short
+-- ones); it also writes search_vector, since the database cannot read the content.
+CREATE TABLE IF NOT EXISTS call_transcripts (
+  call_id INTEGER PRIMARY KEY REFERENCES calls(id) ON DELETE CASCADE,
+  codec VARCHAR(16) NOT NULL,
+  content BYTEA NOT NULL,
+  text_bytes BIGINT NOT NULL DEFAULT 0,
+  search_vector TSVECTOR
+);
+
+CREATE INDEX IF NOT EXISTS idx_call_transcripts_search ON call_transcripts USING GIN (search_vector);
+
+-- One row per top-level analysis key, so handlers read and rewrite single sections.
+CREATE TABLE IF NOT EXISTS call_analysis_sections (
+  call_id INTEGER NOT NULL REFERENCES calls(id) ON DELETE CASCADE,
+  section VARCHAR(64) NOT NULL,
+  position INTEGER NOT NULL DEFAULT 0,
+  payload JSONB,
+  PRIMARY KEY (call_id, section)
+);
+
+CREATE INDEX IF NOT EXISTS idx_call_analysis_sections_payload
+  ON call_analysis_sections USING GIN (payload jsonb_path_ops);
+
+CREATE TABLE IF NOT EXISTS upload_sessions (
+  id VARCHAR(32) PRIMARY KEY,
+  organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  file_name VARCHAR(255) NOT NULL,
+  part_path VARCHAR(1024) NOT NULL,
+  total_size BIGINT NOT NULL,
+  received_bytes BIGINT NOT NULL DEFAULT 0,
+  writer_id VARCHAR(32),
+  writer_expires_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS content_cache (
+  kind VARCHAR(16) NOT NULL,
+  cache_key VARCHAR(80) NOT NULL,
+  payload JSONB NOT NULL,
+  size_bytes BIGINT NOT NULL DEFAULT 0,
+  last_hit_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (kind, cache_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_content_cache_last_hit ON content_cache (last_hit_at, created_at);
+
+CREATE TABLE IF NOT EXISTS analysis_templates (
+  organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+  version INTEGER NOT NULL,
+  template JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (organization_id, version)
+);
+
+CREATE TABLE IF NOT EXISTS reanalysis_jobs (
+  id SERIAL PRIMARY KEY,
+  organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+  template_version INTEGER NOT NULL,
   status VARCHAR(20) NOT NULL,
-  analysis JSONB NOT NULL DEFAULT '{}'::jsonb,
+  last_call_id INTEGER NOT NULL DEFAULT 0,
+  recomputed_calls INTEGER NOT NULL DEFAULT 0,
+  bumped_calls INTEGER NOT NULL DEFAULT 0,
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_calls_org_created ON calls(organization_id, created_at DESC);
+CREATE TABLE IF NOT EXISTS crm_outbox (
+  id SERIAL PRIMARY KEY,
+  organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+  call_id INTEGER NOT NULL REFERENCES calls(id) ON DELETE CASCADE,
+  requested_by_user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  status VARCHAR(20) NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  external_id VARCHAR(128),
+  last_error VARCHAR(500),
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  sent_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_crm_outbox_status_id ON crm_outbox(status, id);
+CREATE INDEX IF NOT EXISTS idx_crm_outbox_org_call ON crm_outbox(organization_id, call_id);
@@ -3,12 +3,13 @@
 import Link from 'next/link';
 import { useCallback, useEffect, useState } from 'react';
 import { useParams } from 'next/navigation';
-import { apiRequest } from '@/lib/api';
+import { apiRequest, streamEvents } from '@/lib/api';
 
 type CallPayload = {
   id: number;
   file_name: string;
   status: string;
+  crm_synced_at?: string | null;
   analysis: {
     executive_summary?: { overview?: string; call_type?: string; outcome?: string };
     scores?: { sentiment_score?: number; buying_intent_score?: number; closing_probability?: number };
@@ -48,6 +49,36 @@ export default function CallDetailsPage() {
     load();
   }, [load]);
 
+  const pending = call !== null && call.status !== 'analyzed' && call.status !== 'failed';
+
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    if (!pending || !token) return;
+
+    // Follow processing live instead of polling; reload once the call settles.
+    const controller = new AbortController();
+    streamEvents(
+      `/api/v1/calls/${id}/events`,
+      token,
+      ({ event, data }) => {
+        if (event === 'analysis') {
+          const { section, value } = data as { section: string; value: unknown };
+          setCall((current) =>
+            current ? { ...current, analysis: { ...current.analysis, [section]: value } } : current
+          );
+        } else if (event === 'status') {
+          const { status } = data as { status: string };
+          setCall((current) => (current ? { ...current, status } : current));
+          if (status === 'analyzed' || status === 'failed') load();
+        }
+      },
+      controller.signal
+    ).catch((err: Error) => {
+      if (err.name !== 'AbortError') setError(err.message);
+    });
+    return () => controller.abort();
+  }, [id, load, pending]);
+
   const syncToCrm = async () => {
     const token = localStorage.getItem('token');
     if (!token) return;
@@ -113,6 +144,9 @@ export default function CallDetailsPage() {
             {' · '}
             Provider: {call.analysis.structured_payload?.crm_sync?.provider ?? 'not connected'}
           </p>
+          {call.crm_synced_at && (
+            <p className="muted">Last bulk sync: {new Date(call.crm_synced_at).toLocaleString()}</p>
+          )}
           <button onClick={syncToCrm} disabled={syncing}>
             {syncing ? 'Syncing…' : 'Sync call to CRM'}
           </button>
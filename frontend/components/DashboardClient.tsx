@@ -15,8 +15,15 @@ type CallItem = {
   };
 };
 
+type AnalyticsTotals = {
+  calls: number;
+  avg_sentiment: number | null;
+  avg_closing_probability: number | null;
+};
+
 export function DashboardClient() {
   const [calls, setCalls] = useState<CallItem[]>([]);
+  const [totals, setTotals] = useState<AnalyticsTotals | null>(null);
   const [error, setError] = useState('');
 
   useEffect(() => {
@@ -26,27 +33,23 @@ export function DashboardClient() {
       return;
     }
 
-    apiRequest('/api/v1/calls', { token })
+    apiRequest('/api/v1/calls?fields=id,file_name,status,analysis', { token })
       .then((data) => setCalls(data as CallItem[]))
       .catch((err: Error) => setError(err.message));
+    apiRequest('/api/v1/calls/analytics', { token })
+      .then((data) => setTotals((data as { totals: AnalyticsTotals }).totals))
+      .catch((err: Error) => setError(err.message));
   }, []);
 
-  const metrics = useMemo(() => {
-    const analyzed = calls.filter((call) => call.status === 'analyzed');
-    const avgSentiment =
-      analyzed.reduce((total, call) => total + (call.analysis.scores?.sentiment_score ?? 0), 0) /
-      (analyzed.length || 1);
-    const avgClose =
-      analyzed.reduce((total, call) => total + (call.analysis.scores?.closing_probability ?? 0), 0) /
-      (analyzed.length || 1);
-
-    return {
+  const metrics = useMemo(
+    () => ({
       total: calls.length,
-      analyzed: analyzed.length,
-      avgSentiment: avgSentiment.toFixed(1),
-      avgClose: `${avgClose.toFixed(0)}%`,
-    };
-  }, [calls]);
+      analyzed: totals?.calls ?? 0,
+      avgSentiment: (totals?.avg_sentiment ?? 0).toFixed(1),
+      avgClose: `${(totals?.avg_closing_probability ?? 0).toFixed(0)}%`,
+    }),
+    [calls, totals],
+  );
 
   return (
     <div>
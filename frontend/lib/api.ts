@@ -38,4 +38,45 @@ export async function apiRequest(path: string, options: ApiRequestOptions = {})
   return payload;
 }
 
+export type ServerEvent = { event: string; data: unknown };
+
+// EventSource cannot send an Authorization header, so event streams are read with fetch.
+export async function streamEvents(
+  path: string,
+  token: string,
+  onEvent: (event: ServerEvent) => void,
+  signal?: AbortSignal
+) {
+  const res = await fetch(`${API_BASE}${path}`, {
+    headers: { Authorization: `Bearer ${token}`, Accept: 'text/event-stream' },
+    cache: 'no-store',
+    signal
+  });
+  if (!res.ok || !res.body) {
+    throw new Error(`Event stream failed (${res.status})`);
+  }
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += value;
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let event = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      if (data) onEvent({ event, data: JSON.parse(data) });
+    }
+  }
+}
+
 export { API_BASE };